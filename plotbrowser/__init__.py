@@ -1,4 +1,36 @@
 from __future__ import nested_scopes, generators, division, absolute_import,\
     with_statement, print_function, unicode_literals
 
-from . import plotbrowser
\ No newline at end of file
+import sys
+
+
+def run():
+    """Opens the plot browser, the same as plotbrowser.plotbrowser.run()
+
+    Qt, pyplot and IPython are imported here, so import plotbrowser itself is quick.
+    """
+    from .plotbrowser import run
+    run()
+
+
+def batchexport(*args, **kwargs):
+    """Saves figures in several formats and dpis in parallel, the same as plotbrowser.export.batchexport()
+
+    Doesn't import Qt, e.g. plotbrowser.batchexport(formats=['png'], dpis=[100, 300], directory='plots')
+    """
+    from .export import batchexport
+    return batchexport(*args, **kwargs)
+
+
+if sys.version_info < (3, 7):  # no module __getattr__, the GUI module is imported right away
+    from . import plotbrowser
+else:
+    def __getattr__(name):
+        """Imports the GUI module, and with it Qt, on first use of plotbrowser.plotbrowser
+
+        The Qt-free modules, e.g. plotbrowser.engine, can be imported without a display.
+        """
+        if name == 'plotbrowser':
+            import importlib
+            return importlib.import_module('.plotbrowser', __name__)
+        raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
@@ -0,0 +1,265 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks of plotbrowser, run with
+
+    python -m plotbrowser.benchmark startup operations import --figures 40 --axes 4 --lines 5 --points 10000
+
+Synthetic figures are made with pyplot before the browser opens. Times are in
+seconds and printed as JSON. Set QT_QPA_PLATFORM=offscreen to run without a
+display. The exit status is 1 if a benchmark with a budget went over it.
+
+startup() measures, from the start of PlotBrowser():
+    setupui      building the widgets of the generated Ui_PlotBrowser alone
+    constructed  PlotBrowser() returned
+    firstpaint   the window got its first paint event
+    interactive  the figure lists are filled and the browser emitted ready
+
+operations() scripts the slots of a PlotBrowser for each of OPERATIONS, e.g.
+selecting a figure or applying fonts, repeat times, and returns per operation
+    seconds      median wall time, until the redraws and exports it started finished
+    min          fastest wall time
+    draws        full canvas draws per run, counted by draw_event
+    blits        partial redraws per run, of only the edited artists
+    peakmemory   most bytes allocated at once during one more run, by tracemalloc
+
+importtime() runs import plotbrowser in fresh interpreters. It should take
+under IMPORTBUDGET seconds and load none of HEAVYMODULES, which are only
+imported by plotbrowser.run() and plotbrowser.plotbrowser.
+"""
+
+from __future__ import nested_scopes, generators, division, absolute_import,\
+    with_statement, print_function, unicode_literals
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+TIMEOUT = 60  # seconds to wait for the browser to become interactive
+IMPORTBUDGET = 0.05  # seconds
+HEAVYMODULES = ('sip', 'PyQt4', 'PySide', 'matplotlib.pyplot', 'IPython')
+OPERATIONS = ('selectfigure', 'selectaxes', 'selectline', 'linewidth', 'linecolor', 'fonts', 'savefigure')
+
+
+def makefigures(nfigures=10, naxes=4, nlines=5, npoints=10000, seed=0):
+    """Returns nfigures new pyplot figures, each with naxes axes of nlines random lines of npoints points"""
+    import matplotlib.pyplot as plt
+    random = np.random.RandomState(seed)
+    figures = []
+    for i in range(nfigures):
+        fig = plt.figure()
+        columns = int(np.ceil(np.sqrt(naxes)))
+        for j in range(naxes):
+            ax = fig.add_subplot(int(np.ceil(naxes / columns)), columns, j + 1)
+            for k in range(nlines):
+                ax.plot(np.cumsum(random.randn(npoints)), label='line {}'.format(k))
+        figures.append(fig)
+    return figures
+
+
+def gui():
+    """Returns the GUI module plotbrowser.plotbrowser, importing Qt"""
+    try:
+        from . import plotbrowser
+    except (ImportError, ValueError):
+        import plotbrowser
+    return plotbrowser
+
+
+def application():
+    return gui().QtGui.QApplication.instance() or gui().QtGui.QApplication(sys.argv[:1])
+
+
+def startup(timeout=TIMEOUT):
+    """Opens a PlotBrowser on the existing figures, returns the times from the module docstring"""
+    (browser, times) = openbrowser(timeout)
+    browser.close()
+    application().processEvents()
+    return times
+
+
+def openbrowser(timeout=TIMEOUT):
+    """Returns a shown PlotBrowser that is ready for input, and the startup times"""
+    (QtCore, QtGui) = (gui().QtCore, gui().QtGui)
+    app = application()
+    start = time.time()
+    gui().Ui_PlotBrowser().setupUi(QtGui.QMainWindow())
+    times = {'setupui': time.time() - start}
+
+    class PaintFilter(QtCore.QObject):
+        def eventFilter(self, obj, event):
+            if event.type() == QtCore.QEvent.Paint and 'firstpaint' not in times:
+                times['firstpaint'] = time.time() - start
+            return False
+
+    start = time.time()
+    browser = gui().PlotBrowser()
+    times['constructed'] = time.time() - start
+    paintfilter = PaintFilter()
+    for widget in (browser, browser.centralwidget):
+        widget.installEventFilter(paintfilter)
+    browser.ready.connect(lambda: times.setdefault('interactive', time.time() - start))
+    browser.show()
+    while not ('firstpaint' in times and 'interactive' in times) and time.time() - start < timeout:
+        app.processEvents()
+    for widget in (browser, browser.centralwidget):
+        widget.removeEventFilter(paintfilter)
+    return (browser, times)
+
+
+def scriptedoperations(browser, directory):
+    """Returns {operation: function(i)}, each doing the operation the ith time through the slots of browser"""
+    def clickrow(listview, row):
+        index = listview.model().index(row % max(1, listview.model().rowCount()), 0)
+        listview.setCurrentIndex(index)
+        return index
+
+    def linecolor(i):
+        browser.lineEdit_linecolor.setText(('red', 'blue')[i % 2])
+        browser.on_lineEdit_linecolor_editingFinished()
+
+    def savefigure(i):
+        filename = os.path.join(directory, 'figure{}.png'.format(i))
+        QFileDialog = gui().QtGui.QFileDialog
+        getsavefilename = QFileDialog.getSaveFileName
+        QFileDialog.getSaveFileName = staticmethod(lambda *args: (filename, ''))
+        try:
+            browser.on_pushButton_savefigure_clicked()
+        finally:
+            QFileDialog.getSaveFileName = getsavefilename
+
+    return {'selectfigure': lambda i: browser.on_listView_figures_clicked(clickrow(browser.listView_figures, i)),
+            'selectaxes': lambda i: browser.on_listView_axes_clicked(clickrow(browser.listView_axes, i)),
+            'selectline': lambda i: browser.on_listView_lines_clicked(clickrow(browser.listView_lines, i)),
+            'linewidth': lambda i: browser.doubleSpinBox_linewidth.setValue((2.5, 1.0)[i % 2]),
+            'linecolor': linecolor,
+            'fonts': lambda i: browser.on_pushButton_fontapply_clicked(),
+            'savefigure': savefigure}
+
+
+def settle(browser, timeout=TIMEOUT):
+    """Runs the event loop until the redraws and exports started by an operation are done"""
+    app = application()
+    start = time.time()
+    app.processEvents()
+    while (browser.redraw.stats()['pending'] or browser.exportthreads) and time.time() - start < timeout:
+        for thread in list(browser.exportthreads):
+            thread.wait(int(1000 * timeout))  # blocks rather than spinning processEvents while the thread renders
+        app.processEvents()
+
+
+def operations(names=OPERATIONS, repeat=5, timeout=TIMEOUT):
+    """Opens a PlotBrowser on the existing figures and times each operation in names, see the module docstring"""
+    import matplotlib.pyplot as plt
+    (browser, times) = openbrowser(timeout)
+    browser.redraw.interval = 0  # times the work, not the throttling of repeated redraws
+    draws = [0]
+    for fig in [plt.figure(number) for number in plt.get_fignums()]:
+        fig.canvas.mpl_connect('draw_event', lambda event: draws.__setitem__(0, draws[0] + 1))
+    directory = tempfile.mkdtemp()
+    functions = scriptedoperations(browser, directory)
+    results = {}
+    try:
+        for name in names:
+            seconds = []
+            (drawn, blitted) = (draws[0], browser.redraw.blitted)
+            for i in range(repeat):
+                start = time.time()
+                functions[name](i)
+                settle(browser, timeout)
+                seconds.append(time.time() - start)
+            results[name] = {'seconds': float(np.median(seconds)), 'min': min(seconds),
+                             'draws': (draws[0] - drawn) / repeat, 'blits': (browser.redraw.blitted - blitted) / repeat,
+                             'peakmemory': peakmemory(functions[name], browser, timeout)}
+            browser.redraw.release()  # the full draw after blits isn't counted toward the next operation
+    finally:
+        browser.close()
+        application().processEvents()
+        shutil.rmtree(directory, ignore_errors=True)
+    return results
+
+
+def peakmemory(function, browser, timeout=TIMEOUT):
+    """Returns the most bytes allocated at once by one more run of function, None without tracemalloc (Python 2)"""
+    try:
+        import tracemalloc
+    except ImportError:
+        return None
+    tracemalloc.start()
+    try:
+        function(0)
+        settle(browser, timeout)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def environment():
+    """Versions to tell apart results of different releases and machines"""
+    import matplotlib
+    binding = 'PyQt4' if 'PyQt4' in sys.modules else 'PySide'
+    return {'python': sys.version.split()[0], 'numpy': np.__version__, 'matplotlib': matplotlib.__version__,
+            'backend': matplotlib.get_backend(), 'binding': binding, 'platform': sys.platform}
+
+
+def importtime(module='plotbrowser', repeat=5, budget=IMPORTBUDGET):
+    """Returns the fastest of repeat imports of module, each in a new interpreter, and the HEAVYMODULES it loaded"""
+    code = ('import sys, time\n'
+            'start = time.time()\n'
+            'import {0}\n'
+            'print(time.time() - start)\n'
+            'print(" ".join(name for name in {1!r} if name in sys.modules))').format(module, HEAVYMODULES)
+    if repeat < 1:
+        raise ValueError('repeat must be at least 1, got {}'.format(repeat))
+    directory = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # imports this copy of plotbrowser
+    times = []
+    for i in range(repeat):
+        output = subprocess.check_output([sys.executable, '-c', code], cwd=directory).decode().splitlines()
+        times.append(float(output[0]))
+        loaded = output[1].split() if len(output) > 1 else []
+    seconds = min(times)
+    return {'module': module, 'seconds': seconds, 'loaded': loaded, 'budget': budget,
+            'passed': seconds <= budget and not loaded}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmarks of plotbrowser, times in seconds as JSON')
+    parser.add_argument('benchmarks', nargs='*', choices=['startup', 'operations', 'import'], default=['startup'])
+    parser.add_argument('--figures', type=int, default=10)
+    parser.add_argument('--axes', type=int, default=4)
+    parser.add_argument('--lines', type=int, default=5)
+    parser.add_argument('--points', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5, help='runs of each operation')
+    parser.add_argument('--output', help='also write the results to this JSON file')
+    parser.add_argument('--importbudget', type=float, default=IMPORTBUDGET, help='seconds import plotbrowser may take')
+    args = parser.parse_args(argv)
+    if args.repeat < 1:
+        parser.error('--repeat must be at least 1')
+    results = {}
+    if 'import' in args.benchmarks:  # first, before this process has imported Qt
+        results['import'] = importtime(budget=args.importbudget)
+    if 'startup' in args.benchmarks or 'operations' in args.benchmarks:
+        application()  # before pyplot makes the figures, so a Qt backend uses this QApplication
+        makefigures(args.figures, args.axes, args.lines, args.points)
+        results['size'] = {'figures': args.figures, 'axes': args.axes, 'lines': args.lines, 'points': args.points}
+        results['environment'] = environment()
+    if 'startup' in args.benchmarks:
+        results['startup'] = startup()
+    if 'operations' in args.benchmarks:
+        results['operations'] = operations(repeat=args.repeat)
+    text = json.dumps(results, indent=1, sort_keys=True)
+    print(text)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text)
+    return 0 if all(result.get('passed', True) for result in results.values()) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
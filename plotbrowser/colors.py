@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""
+Color conversion for the color fields of plotbrowser.
+
+Colors are shown by name when matplotlib has one for them, otherwise as hex
+codes. The hex -> name index is built once per process from a copy of
+matplotlib's named colors, which are left untouched, and conversions of single
+color specs are memoized in a bounded LRU cache. Nothing here imports Qt.
+"""
+
+from __future__ import nested_scopes, generators, division, absolute_import,\
+    with_statement, print_function, unicode_literals
+
+import collections
+
+import numpy as np
+import matplotlib as mpl
+import matplotlib.colors
+try:
+    from types import MappingProxyType
+except ImportError:  # Python 2
+    MappingProxyType = dict
+try:
+    stringtypes = (str, unicode)
+except NameError:  # Python 3
+    stringtypes = (str,)
+
+MAXCACHE = 1024  # number of color specs whose names are remembered
+
+_hexnames = None
+_cache = collections.OrderedDict()  # cache key -> name, least recently used first
+
+
+def hexnames():
+    """Returns a read-only {hex color: name} of the named matplotlib colors, using the 'gray' spellings"""
+    global _hexnames
+    if _hexnames is None:
+        names = {}
+        for (name, hexcolor) in mpl.colors.cnames.items():
+            if name.find('grey') < 0:
+                names[hexcolor.lower()] = name
+        _hexnames = MappingProxyType(names)
+    return _hexnames
+
+
+def colorname(color):
+    """Returns the name of color if it has one, else its hex color, or None if color isn't a valid color
+
+    color is anything matplotlib accepts: a name, hex color, color letter, gray
+    level string, or RGB(A) tuple. Alpha is ignored.
+    """
+    key = cachekey(color)
+    if key is None:
+        return convert(color)
+    if key in _cache:
+        _cache[key] = _cache.pop(key)  # most recently used goes last, OrderedDict.move_to_end is not on Python 2
+        return _cache[key]
+    name = _cache[key] = convert(color)
+    if len(_cache) > MAXCACHE:
+        _cache.popitem(last=False)
+    return name
+
+
+def colornames(colors):
+    """Returns [colorname(color) for color in colors], converting sequences of RGB(A) tuples in one pass"""
+    try:
+        rgb = np.asarray(colors, dtype=float)
+    except (TypeError, ValueError):  # names, hex colors, or a mix
+        return [colorname(color) for color in colors]
+    if rgb.ndim != 2 or rgb.shape[1] not in (3, 4) or not np.all((rgb >= 0) & (rgb <= 1)):
+        return [colorname(color) for color in colors]
+    packed = np.dot(np.round(rgb[:, :3] * 255).astype(int), [65536, 256, 1])
+    (unique, inverse) = np.unique(packed, return_inverse=True)
+    index = hexnames()
+    names = [index.get(hexcolor, hexcolor) for hexcolor in ('#{:06x}'.format(value) for value in unique)]
+    return [names[i] for i in np.ravel(inverse)]
+
+
+def commonname(colors):
+    """Returns the color name shared by all colors, '' if they differ"""
+    names = set(colornames(colors))
+    if len(names) == 1:
+        return names.pop()
+    return ''
+
+
+def convert(color):
+    if isinstance(color, stringtypes):
+        color = color.replace('grey', 'gray')
+    try:
+        hexcolor = mpl.colors.rgb2hex(mpl.colors.colorConverter.to_rgb(color))
+    except ValueError:
+        return None
+    return hexnames().get(hexcolor, hexcolor)
+
+
+def cachekey(color):
+    """Returns a hashable key for color, None if it can't be cached"""
+    if isinstance(color, stringtypes):
+        return color
+    try:
+        return tuple(float(value) for value in color)
+    except (TypeError, ValueError):
+        return None
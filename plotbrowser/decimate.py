@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""
+Display-side decimation of lines with many points.
+
+A decimated line keeps, for every pixel column of its axes, only the first,
+last, minimum and maximum points that fall in that column, which draws the
+same picture as the full line. The full data is kept here and the decimated
+data is recomputed whenever the x limits or the canvas size change. Exports
+through plotbrowser.export restore the full data first; use fullresolution()
+around anything else that needs it, such as fig.savefig from the shell.
+Nothing here imports Qt.
+"""
+
+from __future__ import nested_scopes, generators, division, absolute_import,\
+    with_statement, print_function, unicode_literals
+
+import contextlib
+import weakref
+
+import numpy as np
+
+MINPOINTS = 10000  # lines with fewer points are drawn as they are
+
+fulldata = weakref.WeakKeyDictionary()  # line -> (xdata, ydata) of decimated lines
+connections = weakref.WeakKeyDictionary()  # figure -> [(callbackregistry, cid)]
+
+
+def enable(fig, minpoints=MINPOINTS):
+    """Decimates every line of fig with at least minpoints points and sorted numeric x, returns reductionratio(fig)"""
+    if fig in connections:
+        return reductionratio(fig)
+    cids = [(fig.canvas.callbacks, fig.canvas.mpl_connect('resize_event', lambda event: update(fig)))]
+    for ax in fig.axes:
+        for line in ax.lines:
+            (x, y) = (np.asarray(line.get_xdata(orig=True)), np.asarray(line.get_ydata(orig=True)))
+            if len(x) >= minpoints and len(x) == len(y) and x.dtype.kind in 'fiu' and y.dtype.kind in 'fiu' \
+                    and np.all(np.diff(x) >= 0):
+                fulldata[line] = (x, y)
+        cids.append((ax.callbacks, ax.callbacks.connect('xlim_changed', updateaxes)))
+    connections[fig] = cids
+    update(fig)
+    return reductionratio(fig)
+
+
+def disable(fig):
+    """Puts the full data back into the decimated lines of fig"""
+    for (registry, cid) in connections.pop(fig, []):
+        registry.disconnect(cid)
+    for line in decimatedlines(fig):
+        line.set_data(*fulldata.pop(line))
+
+
+def isenabled(fig):
+    return fig in connections
+
+
+def decimatedlines(fig):
+    return [line for ax in fig.axes for line in ax.lines if line in fulldata]
+
+
+def update(fig):
+    for ax in fig.axes:
+        updateaxes(ax)
+
+
+def updateaxes(ax):
+    """Recomputes the decimated data of the lines in ax for its current x limits and width in pixels"""
+    (xmin, xmax) = sorted(ax.get_xlim())
+    columns = max(int(ax.bbox.width), 1)
+    transform = ax.xaxis.get_transform()  # column edges are evenly spaced on screen, also for log axes
+    (tmin, tmax) = transform.transform(np.array([xmin, xmax]))
+    edges = transform.inverted().transform(np.linspace(tmin, tmax, columns + 1))
+    for line in ax.lines:
+        if line in fulldata:
+            (x, y) = fulldata[line]
+            keep = minmaxindices(x, y, edges)
+            line.set_data(x[keep], y[keep])
+
+
+def minmaxindices(x, y, edges):
+    """Returns sorted indices of the first, last, min and max points of y in each column between edges
+
+    x must be sorted. Only points between the edges count toward a column, and
+    the point just outside each outer edge is kept too, so lines run off the
+    axes correctly. The extreme points of the whole line are kept so autoscaling
+    still sees the full data range.
+    """
+    first = np.searchsorted(x, edges[0], 'left')
+    last = np.searchsorted(x, edges[-1], 'right')  # the points from first to last - 1 are in the columns
+    neighbours = [i for i in (first - 1, last) if 0 <= i < len(x)]
+    extremes = [0, len(x) - 1, np.nanargmin(y), np.nanargmax(y)] if np.any(np.isfinite(y)) else [0, len(x) - 1]
+    if last - first <= 4 * (len(edges) - 1):
+        return np.union1d(np.arange(first, last), extremes + neighbours)
+    starts = np.searchsorted(x, edges[:-1], 'left')
+    ends = np.append(starts[1:], last)
+    nonempty = ends > starts
+    (starts, ends) = (starts[nonempty], ends[nonempty])
+    keep = [starts, ends - 1, extremes, neighbours]
+    visible = y[first:last]  # the columns are contiguous, so reduceat over them covers exactly this slice
+    for reduction in (np.fmin, np.fmax):
+        values = reduction.reduceat(visible, starts - first)
+        matches = np.flatnonzero(visible == np.repeat(values, ends - starts)) + first
+        if len(matches) == 0:
+            continue
+        earliest = matches[np.minimum(np.searchsorted(matches, starts), len(matches) - 1)]
+        keep.append(np.where((earliest >= starts) & (earliest < ends), earliest, starts))  # all-nan columns keep their start
+    return np.unique(np.concatenate(keep))
+
+
+def reductionratio(fig):
+    """Returns full points / displayed points over the decimated lines of fig, 1.0 if none are decimated"""
+    lines = decimatedlines(fig)
+    full = sum(len(fulldata[line][0]) for line in lines)
+    shown = sum(len(line.get_xdata(orig=True)) for line in lines)
+    if shown == 0:
+        return 1.0
+    return full / shown
+
+
+@contextlib.contextmanager
+def fullresolution(fig):
+    """Temporarily puts the full data back into the decimated lines of fig, e.g. while saving"""
+    lines = decimatedlines(fig)
+    shown = [(line.get_xdata(orig=True), line.get_ydata(orig=True)) for line in lines]
+    for line in lines:
+        line.set_data(*fulldata[line])
+    try:
+        yield
+    finally:
+        for (line, data) in zip(lines, shown):
+            line.set_data(*data)
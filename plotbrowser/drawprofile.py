@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""
+Per-artist draw times of one figure, to find the artist that makes it slow.
+
+    from plotbrowser import drawprofile
+    for timing in drawprofile.profile(fig)[:drawprofile.TOPN]:
+        print(timing.seconds, drawprofile.describe(timing.artist))
+
+profile(fig) draws fig once with the draw method of every matplotlib artist
+class wrapped, and returns an ArtistTime per drawn artist. seconds is the
+artist's own time, its inclusive time minus that of the artists it drew, so
+a slow axes or axis stands out only for what it does itself: an XAxis for
+generating and laying out its ticks, a Line2D for its markers, a Text for its
+mathtext. owner(timing) gives the axes and line to select in the browser.
+Nothing here imports Qt.
+"""
+
+from __future__ import nested_scopes, generators, division, absolute_import,\
+    with_statement, print_function, unicode_literals
+
+import collections
+import functools
+import threading
+import time
+
+import numpy as np
+from matplotlib.axes import Axes
+
+try:
+    from .engine import stringtypes
+    from .instrument import patchdraws, unpatchdraws
+except (ImportError, ValueError):  # imported as a top-level module when plotbrowser.py is run as a script
+    from engine import stringtypes
+    from instrument import patchdraws, unpatchdraws
+
+TOPN = 20  # artists listed by the browser
+
+ArtistTime = collections.namedtuple('ArtistTime', 'artist seconds inclusive axes')  # axes it was drawn in, or None
+
+
+def profile(fig):
+    """Draws fig once, returns [ArtistTime] of the artists drawn, slowest own time first"""
+    timings = collections.OrderedDict()  # id(artist) -> [artist, inclusive, children's inclusive, axes]
+    stack = []  # artists being drawn, innermost last
+    axesstack = [None]  # axes being drawn, innermost last
+    thread = threading.current_thread()
+
+    def timeddraw(function):
+        @functools.wraps(function)
+        def draw(self, *args, **kwargs):
+            if threading.current_thread() is not thread or (stack and stack[-1] is self):  # other threads' draws,
+                return function(self, *args, **kwargs)  # and a draw calling its base class's draw, aren't timed again
+            stack.append(self)
+            axesstack.append(self if isinstance(self, Axes) else axesstack[-1])
+            start = time.time()
+            try:
+                return function(self, *args, **kwargs)
+            finally:
+                elapsed = time.time() - start
+                stack.pop()
+                ax = axesstack.pop()
+                timings.setdefault(id(self), [self, 0.0, 0.0, ax])[1] += elapsed
+                if stack:
+                    timings.setdefault(id(stack[-1]), [stack[-1], 0.0, 0.0, axesstack[-1]])[2] += elapsed
+        return draw
+
+    patched = patchdraws(timeddraw)
+    try:
+        fig.canvas.draw()
+    finally:
+        unpatchdraws(patched)
+    results = [ArtistTime(artist, max(0.0, inclusive - children), inclusive, ax)
+               for (artist, inclusive, children, ax) in timings.values()]
+    return sorted(results, key=lambda timing: -timing.seconds)
+
+
+def owner(timing):
+    """Returns (axes, line) of the artist of timing, the axes it was drawn in and the line if it is one, or None"""
+    ax = timing.axes
+    line = timing.artist if ax is not None and timing.artist in ax.lines else None
+    return (ax, line)
+
+
+def describe(artist):
+    """Returns a short text telling which artist it is and what could make it slow"""
+    name = type(artist).__name__
+    details = []
+    label = artist.get_label()  # a Text for axes and axis
+    if isinstance(label, stringtypes) and label and not label.startswith('_'):
+        details.append(repr(label))
+    if hasattr(artist, 'get_xydata'):  # lines
+        details.append('{} points'.format(len(artist.get_xydata())))
+        if artist.get_marker() not in (None, 'None', 'none', '', ' '):
+            details.append('marker {!r}'.format(artist.get_marker()))
+    elif hasattr(artist, 'get_text'):
+        text = artist.get_text()
+        details.append(repr(text if len(text) <= 30 else text[:27] + '...'))
+        if artist.get_text().count('$') >= 2:
+            details.append('mathtext')
+    elif hasattr(artist, 'get_ticklocs'):  # axis
+        details.append('{} major, {} minor ticks'.format(len(artist.get_majorticklocs()), len(artist.get_minorticklocs())))
+    elif hasattr(artist, 'get_offsets'):  # collections, e.g. scatter
+        details.append('{} items'.format(len(np.atleast_2d(artist.get_offsets()))))
+    return ' '.join([name] + details)
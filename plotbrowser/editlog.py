@@ -0,0 +1,308 @@
+# -*- coding: utf-8 -*-
+"""
+The edits made with plotbrowser as a script of matplotlib calls.
+
+EditLog.record(function, targets, *args, **kwargs) takes the same arguments as
+the plotbrowser.engine functions and writes down the object-oriented
+matplotlib calls that make the same change, e.g. ax.tick_params(which='major',
+length=6) or ax.spines['top'].set_visible(False). script() returns them as a
+Python script in which only the last edit of each property is left, so the
+steps of a spin box collapse into the final value. Figures are found by their
+pyplot number, axes and lines by their position in fig.axes and ax.lines when
+the edit was made; making and deleting axes and lines isn't recorded. Nothing
+here imports Qt.
+"""
+
+from __future__ import nested_scopes, generators, division, absolute_import,\
+    with_statement, print_function, unicode_literals
+
+import collections
+
+import numpy as np
+import matplotlib as mpl
+import matplotlib.ticker
+from matplotlib.figure import Figure
+try:
+    from . import engine
+    from .engine import SPINES, TICKSDRAW, tickflag
+except (ImportError, ValueError):  # imported as a top-level module when plotbrowser.py is run as a script
+    import engine
+    from engine import SPINES, TICKSDRAW, tickflag
+
+HEADER = '''# matplotlib calls of the edits made in plotbrowser
+import matplotlib as mpl
+import matplotlib.ticker
+import matplotlib.pyplot as plt
+'''
+FONTTEXTS = {'title': '{0}.title', 'xlabel': '{0}.xaxis.label', 'ylabel': '{0}.yaxis.label',
+             'xmajorticklabels': '{0}.xaxis.get_majorticklabels()', 'ymajorticklabels': '{0}.yaxis.get_majorticklabels()',
+             'xminorticklabels': '{0}.xaxis.get_minorticklabels()', 'yminorticklabels': '{0}.yaxis.get_minorticklabels()',
+             'legend': '{0}.get_legend().get_texts()'}  # engine font target -> its texts, {0} is the axes
+MINORFORMATTER = "mpl.ticker.FuncFormatter(lambda number, pos: format(abs(number), 'e')[0])"  # engine.myminortickformatter
+
+Record = collections.namedtuple('Record', 'key ref template props tag')
+
+
+class EditLog(object):
+    """The matplotlib calls of the edits made so far, in order"""
+    def __init__(self):
+        self.records = []
+        self.undone = {}  # tag -> records taken out by undo, put back by redo
+
+    def record(self, function, targets, *args, **kwargs):
+        """Writes down engine function(targets, *args, **kwargs), call it before or after the edit
+
+        tag, if given as a keyword, marks the records so undo(tag) can take them out again.
+        """
+        tag = kwargs.pop('tag', None)
+        self.undone = {}  # like a redo stack, new edits clear it
+        for target in targets:
+            ref = reference(target)
+            for (key, template, props) in STATEMENTS[function.__name__](target, *args, **kwargs):
+                self.records.append(Record(ref + (key,), ref, template, props, tag))
+
+    def undo(self, tag):
+        self.undone[tag] = [record for record in self.records if record.tag == tag]
+        self.records = [record for record in self.records if record.tag != tag]
+
+    def redo(self, tag):
+        self.records += self.undone.pop(tag, [])
+
+    def clear(self):
+        self.records = []
+        self.undone = {}
+
+    def statements(self):
+        """Returns [(ref, template, props)] with the last record of each property, in the order of those records
+
+        Keyword arguments of records of the same property that set props are merged.
+        """
+        last = {}
+        props = {}
+        for (index, record) in enumerate(self.records):
+            last[record.key] = index
+            if record.props is not None:
+                props[record.key] = dict(props.get(record.key, {}), **record.props)
+        return [(record.ref, record.template, props.get(record.key)) for (index, record) in enumerate(self.records)
+                if last[record.key] == index]
+
+    def script(self):
+        """Returns the statements as a script, grouped by figure in the order the figures were first edited"""
+        statements = self.statements()
+        figures = []
+        for (ref, template, props) in statements:
+            if ref[0] not in figures:
+                figures.append(ref[0])
+        statements.sort(key=lambda statement: figures.index(statement[0][0]))  # stable, keeps the order within a figure
+        lines = [HEADER]
+        current = {}  # variable -> ref it holds
+        for (ref, template, props) in statements:
+            for (depth, variable) in enumerate(('fig', 'ax', 'line')[:len(ref)]):
+                if current.get(variable) != ref[:depth + 1]:
+                    lines.append(assignment(variable, ref[depth]))
+                    current[variable] = ref[:depth + 1]
+                    for deeper in ('ax', 'line')[depth:]:
+                        current.pop(deeper, None)
+            variable = ('fig', 'ax', 'line')[len(ref) - 1]
+            lines.append(template.format(variable, keywords(props) if props is not None else ''))
+        return '\n'.join(lines) + '\n'
+
+    def write(self, filename):
+        with open(filename, 'w') as f:
+            f.write(self.script())
+
+
+def reference(artist):
+    """Returns (figure number,), (figure number, axes index) or (figure number, axes index, line index)"""
+    if isinstance(artist, Figure):
+        return (getattr(artist, 'number', None),)
+    if hasattr(artist, 'lines'):  # axes
+        return reference(artist.figure) + (artist.figure.axes.index(artist),)
+    return reference(artist.axes) + (artist.axes.lines.index(artist),)
+
+
+def assignment(variable, index):
+    if variable == 'fig':
+        return '\nfig = plt.figure({})'.format(index) if index is not None else '\nfig = plt.gcf()'
+    return '{} = {}[{}]'.format(variable, 'fig.axes' if variable == 'ax' else 'ax.lines', index)
+
+
+def literal(value):
+    """Returns the source code of value, with numpy types as plain Python values"""
+    if isinstance(value, np.generic):
+        value = value.item()
+    elif isinstance(value, np.ndarray):
+        value = value.tolist()
+    if isinstance(value, (list, tuple)):
+        items = ', '.join(literal(item) for item in value)
+        return '(' + items + (',)' if len(value) == 1 else ')') if isinstance(value, tuple) else '[' + items + ']'
+    text = repr(value)
+    return text[1:] if text.startswith("u'") else text  # Python 2 unicode
+
+
+def keywords(props):
+    return ', '.join('{}={}'.format(name, literal(value)) for (name, value) in sorted(props.items()))
+
+
+def call(template, *args):
+    """Fills the literals of args into template, keeping {0} for the variable"""
+    return template.format('{0}', *[literal(arg).replace('{', '{{').replace('}', '}}') for arg in args])
+
+
+# statements(target, *args, **kwargs) -> [(key, template, props)] for each engine function,
+# template has {0} for the variable of target and {1} for the merged props
+def facecolor(artist, color):
+    return [('facecolor', call('{0}.patch.set_facecolor({1})', color), None)]
+
+
+def facealpha(artist, alpha):
+    return [('facealpha', call('{0}.patch.set_alpha({1})', alpha), None)]
+
+
+def label(ax, name, text):
+    return [(name + 'label', call('{0}.set_' + name + 'label({1})', text), None)]
+
+
+def labelposition(ax, name, position):
+    return [(name + 'labelposition', call('{0}.' + name + 'axis.set_label_position({1})', position), None)]
+
+
+def scale(ax, name, value):
+    return [(name + 'scale', call('{0}.set_' + name + 'scale({1})', value), None)]
+
+
+def limits(ax, value):
+    return [('axismode' if isinstance(value, engine.stringtypes) else 'limits', call('{0}.axis({1})', value), None)]
+
+
+def tickparams(ax, which='both', **params):
+    return [(('tick_params', which), '{0}.tick_params(which=' + literal(which) + ', {1})', params)]
+
+
+def ticksdraw(ax, loc, value):
+    (ticks, labels) = TICKSDRAW.get(value, (False, False))
+    return tickparams(ax, **{loc: ticks, 'label' + loc: labels})
+
+
+def tickdirection(ax, direction):
+    return tickparams(ax, direction=direction)
+
+
+def ticklength(ax, which, length):
+    return tickparams(ax, which, length=length)
+
+
+def tickwidth(ax, which, width):
+    return tickparams(ax, which, width=width)
+
+
+def numticks(ax, name, which, value):
+    axis = '{0}.' + name + 'axis'
+    if which == 'major':
+        locator = engine.axisof(ax, name).get_major_locator()
+        if hasattr(locator, 'numticks'):
+            template = call(axis + '.get_major_locator().numticks = {1}', value)
+        elif hasattr(locator, '_nbins'):
+            template = call(axis + '.get_major_locator().set_params(nbins={1})', value)
+        else:
+            return []
+    elif isinstance(engine.axisof(ax, name).get_minor_locator(), mpl.ticker.LogLocator):
+        subs = list(range(2, 10)) if value >= 8 else np.floor(1 + np.arange(1, value + 1) * 9 / (value + 1))
+        template = call(axis + '.set_minor_locator(mpl.ticker.LogLocator(numticks=99, subs={1}))', subs)
+    else:
+        template = call(axis + '.set_minor_locator(mpl.ticker.AutoMinorLocator({1}))', value + 1)
+    return [((name + which + 'locator'), template, None)]
+
+
+def minorticklabels(ax, name, value):
+    if not value:
+        formatter = 'mpl.ticker.NullFormatter()'
+    elif getattr(ax, 'get_' + name + 'scale')() == 'linear':
+        formatter = 'mpl.ticker.ScalarFormatter()'
+    else:
+        formatter = MINORFORMATTER
+    return [(name + 'minorformatter', '{0}.' + name + 'axis.set_minor_formatter(' + formatter + ')', None)]
+
+
+def spine(ax, loc, position):
+    spine = '{0}.spines[' + literal(loc) + ']'
+    statements = [(('spinevisible', loc), spine + '.set_visible(' + literal(position != 'off') + ')', None)]
+    if position == 'outward':
+        statements.append((('spineposition', loc), spine + ".set_position(('outward', 0))", None))
+    elif position != 'off':
+        statements.append((('spineposition', loc), call(spine + '.set_position({1})', position), None))
+    return statements
+
+
+def spinewidth(ax, width, locs=SPINES):
+    return [(('spinewidth', loc), call('{0}.spines[' + literal(loc) + '].set_linewidth({1})', width), None)
+            for loc in locs]
+
+
+def grid(ax, x=None, y=None, linestyle=None, linewidth=None, color=None):
+    statements = []
+    for (name, value) in (('x', x), ('y', y)):
+        if value is not None:
+            statements.append((name + 'grid', call('{0}.' + name + 'axis.grid({1})\n{0}.set_axisbelow(True)', value), None))
+    props = dict((key, value) for (key, value) in (('linestyle', linestyle), ('linewidth', linewidth), ('color', color))
+                 if value is not None)
+    if props:  # ax.grid turns on both grids, the current ones are turned back on or off
+        xgrid = tickflag(ax.xaxis.majorTicks[0], 'gridOn') if x is None else x
+        ygrid = tickflag(ax.yaxis.majorTicks[0], 'gridOn') if y is None else y
+        statements.append(('gridlines', call('{0}.grid({{1}})\n{0}.xaxis.grid({1})\n{0}.yaxis.grid({2})', xgrid, ygrid),
+                           props))
+    return statements
+
+
+def legend(ax, visible=True, frameon=True, fancybox=True, shadow=False, framealpha=None, ncol=1, title=None,
+           facecolor=None, draggable=False):
+    """Dragging is left out, it only matters in the GUI"""
+    if not visible:
+        return [('legend', '{0}.get_legend().set_visible(False)', None)]
+    template = call("{0}.legend(frameon={1}, fancybox={2}, shadow={3}, framealpha={4}, ncol={5}, title={6}, loc='best')",
+                    frameon, fancybox, shadow, framealpha, ncol, title or None)
+    if facecolor is not None:
+        template += call('\n{0}.get_legend().get_frame().set_facecolor({1})', facecolor)
+    return [('legend', template, None)]
+
+
+def font(ax, targets, family=None, size=None, weight=None, style=None, color=None):
+    props = dict((key, value) for (key, value) in (('family', family), ('size', size), ('weight', weight),
+                                                    ('style', style), ('color', color)) if value is not None)
+    return [(('font', target), 'plt.setp(' + FONTTEXTS[target] + ', {1})', props) for target in targets if props]
+
+
+def lineproperty(name):
+    def statements(line, value):
+        return [(name, call('{0}.set_' + name + '({1})', value), None)]
+    return statements
+
+
+def markercolor(line, color):
+    return lineproperty('markerfacecolor')(line, color) + lineproperty('markeredgecolor')(line, color)
+
+
+STATEMENTS = {'setfacecolor': facecolor,
+              'setfacealpha': facealpha,
+              'setlabel': label,
+              'setlabelposition': labelposition,
+              'setscale': scale,
+              'setlimits': limits,
+              'settickparams': tickparams,
+              'setticksdraw': ticksdraw,
+              'settickdirection': tickdirection,
+              'setticklength': ticklength,
+              'settickwidth': tickwidth,
+              'setnumticks': numticks,
+              'setminorticklabels': minorticklabels,
+              'setspine': spine,
+              'setspinewidth': spinewidth,
+              'setgrid': grid,
+              'setlegend': legend,
+              'setfont': font,
+              'setlinestyle': lineproperty('linestyle'),
+              'setlinewidth': lineproperty('linewidth'),
+              'setlinecolor': lineproperty('color'),
+              'setmarker': lineproperty('marker'),
+              'setmarkersize': lineproperty('markersize'),
+              'setmarkercolor': markercolor}
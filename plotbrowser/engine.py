@@ -0,0 +1,333 @@
+# -*- coding: utf-8 -*-
+"""
+The style operations of plotbrowser, without the GUI.
+
+Each function changes a list of figures, axes or lines the way the matching
+control of the browser does, and returns the artists it changed so the caller
+knows what to redraw. Nothing is drawn, so they work on Agg figures in batch
+scripts, e.g.
+
+    from plotbrowser import engine
+    axes = [ax for fig in figures for ax in fig.axes]
+    for loc in ('bottom', 'left'):
+        engine.setspine(axes, loc, 'outward')
+    engine.setnumticks(axes, 'x', 'minor', 3)
+    engine.setfont(axes, engine.FONTTARGETS, family='Arial', size=10)
+
+Axes are named 'x' or 'y', spines and tick sides 'bottom', 'top', 'left' or
+'right'. Colors are anything matplotlib accepts. Nothing here imports Qt.
+"""
+
+from __future__ import nested_scopes, generators, division, absolute_import,\
+    with_statement, print_function, unicode_literals
+
+import numpy as np
+import matplotlib as mpl
+import matplotlib.ticker
+from matplotlib.figure import Figure
+try:
+    stringtypes = (str, unicode)
+except NameError:  # Python 3
+    stringtypes = (str,)
+
+SPINES = ('bottom', 'top', 'left', 'right')
+TICKFLAGS = {'tick1On': 'tick1line', 'tick2On': 'tick2line', 'label1On': 'label1', 'label2On': 'label2',
+             'gridOn': 'gridline'}  # Tick attributes of matplotlib < 3.1 -> artists whose visibility replaced them
+TICKSDRAW = {'ticks only': (True, False), 'tick labels only': (False, True), 'both': (True, True),
+             'none': (False, False)}  # choice of the tick combo boxes -> (draw ticks, draw tick labels)
+FONTTARGETS = ('title', 'xlabel', 'ylabel', 'xmajorticklabels', 'ymajorticklabels', 'xminorticklabels',
+               'yminorticklabels', 'legend')
+
+
+def axisof(ax, name):
+    """Returns ax.xaxis or ax.yaxis"""
+    return getattr(ax, name + 'axis')
+
+
+def figureof(artist):
+    """Returns the figure of artist, artist itself if it is a figure, or None"""
+    return artist if isinstance(artist, Figure) else artist.figure
+
+
+# figures and axes
+def setfacecolor(artists, color):
+    """Sets the background color of figures or axes"""
+    for artist in artists:
+        artist.patch.set_facecolor(color)
+    return artists
+
+
+def setfacealpha(artists, alpha):
+    for artist in artists:
+        artist.patch.set_alpha(alpha)
+    return artists
+
+
+def setlabel(axes, name, text):
+    for ax in axes:
+        getattr(ax, 'set_' + name + 'label')(text)
+    return axes
+
+
+def setlabelposition(axes, name, position):
+    """Puts the x label at the 'top' or 'bottom', the y label at the 'left' or 'right'"""
+    for ax in axes:
+        axisof(ax, name).set_label_position(position)
+    return axes
+
+
+def setscale(axes, name, scale):
+    for ax in axes:
+        getattr(ax, 'set_' + name + 'scale')(scale)
+    return axes
+
+
+def setlimits(axes, limits):
+    """Sets [xmin, xmax, ymin, ymax], or an autoscaling mode of Axes.axis like 'tight' or 'equal'"""
+    for ax in axes:
+        ax.axis(limits)
+    return axes
+
+
+# ticks
+def settickparams(axes, which='both', **params):
+    """Calls tick_params once per axes, which updates every tick"""
+    for ax in axes:
+        ax.tick_params(which=which, **params)
+    return axes
+
+
+def setticksdraw(axes, loc, value):
+    """Draws the ticks and/or tick labels on side loc, value is one of TICKSDRAW"""
+    (ticks, labels) = TICKSDRAW.get(value, (False, False))
+    return settickparams(axes, **{loc: ticks, 'label' + loc: labels})
+
+
+def settickdirection(axes, direction):
+    """direction is 'in', 'out' or 'inout'"""
+    return settickparams(axes, direction=direction)
+
+
+def setticklength(axes, which, length):
+    return settickparams(axes, which, length=length)
+
+
+def settickwidth(axes, which, width):
+    return settickparams(axes, which, width=width)
+
+
+def setnumticks(axes, name, which, value):
+    """Sets the number of 'major' ticks, or of 'minor' ticks between major ticks"""
+    setter = setnummajorticks if which == 'major' else setnumminorticks
+    for ax in axes:
+        setter(axisof(ax, name), value)
+    return axes
+
+
+def setnummajorticks(axis, value):
+    locator = axis.get_major_locator()
+    if hasattr(locator, 'numticks'):
+        locator.numticks = value
+    elif hasattr(locator, '_nbins'):
+        locator._nbins = value
+
+
+def setnumminorticks(axis, value):
+    """Sets value minor ticks between major ticks, evenly spread over the decade for log axes"""
+    if isinstance(axis.get_minor_locator(), mpl.ticker.LogLocator):
+        if value >= 8:
+            subs = list(range(2, 10))
+        else:
+            subs = np.floor(1 + np.arange(1, value + 1) * 9 / (value + 1))
+        axis.set_minor_locator(mpl.ticker.LogLocator(numticks=99, subs=subs))
+    else:
+        axis.set_minor_locator(mpl.ticker.AutoMinorLocator(value + 1))
+
+
+def setminorticklabels(axes, name, value):
+    for ax in axes:
+        setminorlabels(axisof(ax, name), value, getattr(ax, 'get_' + name + 'scale')())
+    return axes
+
+
+def setminorlabels(axis, value, scale):
+    """Shows minor tick labels, labelled with their first digit on non-linear axes, or hides them"""
+    if not value:
+        axis.set_minor_formatter(mpl.ticker.NullFormatter())
+    elif scale == 'linear':
+        axis.set_minor_formatter(mpl.ticker.ScalarFormatter())
+    else:
+        axis.set_minor_formatter(mpl.ticker.FuncFormatter(myminortickformatter))
+
+
+def myminortickformatter(number, pos):
+    """Labels the minor ticks with their first digit"""
+    numstr = str(format(number, 'e'))
+    if numstr[0] == '-':
+        return str(numstr)[1]
+    else:
+        return str(numstr)[0]
+
+
+def tickflag(tick, name):
+    """Returns Tick.tick1On etc., which newer matplotlib replaced by the visibility of the tick's artists"""
+    if hasattr(tick, name):
+        return bool(getattr(tick, name))
+    return getattr(tick, TICKFLAGS[name]).get_visible()
+
+
+# spines
+def setspine(axes, loc, position):
+    """Moves spine loc of each axes 'outward', to the 'center' or 'zero', or hides it with 'off', returns the spines
+
+    position can also be any spine position matplotlib accepts, like ['axes', 0.5].
+    """
+    spines = [ax.spines[loc] for ax in axes]
+    for spine in spines:
+        spine.set_visible(position != 'off')
+        if position == 'outward':
+            spine.set_position(('outward', 0))
+        elif isinstance(position, stringtypes) and position != 'off':
+            spine.set_position(position)
+        elif isinstance(position, (list, tuple)):
+            spine.set_position(tuple(position))
+    return spines
+
+
+def setspinewidth(axes, width, locs=SPINES):
+    """Returns the spines"""
+    spines = [ax.spines[loc] for ax in axes for loc in locs]
+    for spine in spines:
+        spine.set_linewidth(width)
+    return spines
+
+
+# grid
+def setgrid(axes, x=None, y=None, linestyle=None, linewidth=None, color=None):
+    """Turns the x and y grids on or off and sets the grid lines, None leaves a setting as it is"""
+    kwargs = dict((key, value) for (key, value) in (('linestyle', linestyle), ('linewidth', linewidth), ('color', color))
+                  if value is not None)
+    for ax in axes:
+        xgrid = tickflag(ax.xaxis.majorTicks[0], 'gridOn') if x is None else x
+        ygrid = tickflag(ax.yaxis.majorTicks[0], 'gridOn') if y is None else y
+        if kwargs:
+            ax.grid(**kwargs)  # side effect of turning on x and y grids
+        ax.xaxis.grid(xgrid)
+        ax.yaxis.grid(ygrid)
+        if x is not None or y is not None:
+            ax.set_axisbelow(True)
+    return axes
+
+
+# legend
+def setlegend(axes, visible=True, frameon=True, fancybox=True, shadow=False, framealpha=None, ncol=1, title=None,
+              facecolor=None, draggable=False):
+    """Remakes the legend of each axes with these settings, or hides it"""
+    for ax in axes:
+        if not visible:
+            if ax.legend_ is not None:
+                ax.legend_.set_visible(False)
+            continue
+        if ax.legend_ is not None:  # the replaced legend stops listening for mouse drags
+            setdraggable(ax.legend_, False)
+        ax.legend(frameon=frameon, fancybox=fancybox, shadow=shadow, framealpha=framealpha, ncol=ncol,
+                  title=title or None, loc='best')
+        if ax.legend_ is None:  # nothing to label
+            continue
+        if draggable:
+            setdraggable(ax.legend_, True)
+        if facecolor is not None:
+            ax.legend_.get_frame().set_facecolor(facecolor)
+    return axes
+
+
+def isdraggable(legend):
+    if hasattr(legend, 'get_draggable'):
+        return legend.get_draggable()
+    return getattr(legend, '_draggable', None) is not None  # matplotlib < 3.0
+
+
+def setdraggable(legend, value):
+    if hasattr(legend, 'set_draggable'):
+        legend.set_draggable(value)
+    else:  # matplotlib < 3.0
+        legend.draggable(value)
+
+
+# fonts
+def setfont(axes, targets, family=None, size=None, weight=None, style=None, color=None):
+    """Sets the font of the texts in targets, a list of FONTTARGETS, None leaves a setting as it is"""
+    texts = [text for ax in axes for target in targets for text in fonttexts(ax, target)]
+    for text in texts:
+        if family is not None:
+            text.set_family(family)
+        if size is not None:
+            text.set_size(size)
+        if weight is not None:
+            text.set_weight(weight)
+        if style is not None:
+            text.set_style(style)
+        if color is not None:
+            text.set_color(color)
+    return axes
+
+
+def fonttexts(ax, target):
+    """Returns the Text artists of ax for one of FONTTARGETS"""
+    if target == 'title':
+        return [ax.title]
+    if target in ('xlabel', 'ylabel'):
+        return [axisof(ax, target[0]).label]
+    if target.endswith('ticklabels'):
+        return ticklabels(axisof(ax, target[0]), target[1:6])
+    if target == 'legend':
+        return [] if ax.legend_ is None else ax.legend_.get_texts()
+    raise ValueError('unknown font target ' + repr(target))
+
+
+def ticklabels(axis, which='major'):
+    """Returns the labels of the existing ticks, without computing tick positions like get_majorticklabels
+
+    Ticks created later copy their label properties from the first tick.
+    """
+    ticks = axis.majorTicks if which == 'major' else axis.minorTicks
+    return [label for tick in ticks for label in (tick.label1, tick.label2)]
+
+
+# lines
+def setlinestyle(lines, linestyle):
+    for line in lines:
+        line.set_linestyle(linestyle)
+    return lines
+
+
+def setlinewidth(lines, width):
+    for line in lines:
+        line.set_linewidth(width)
+    return lines
+
+
+def setlinecolor(lines, color):
+    for line in lines:
+        line.set_color(color)
+    return lines
+
+
+def setmarker(lines, marker):
+    for line in lines:
+        line.set_marker(marker)
+    return lines
+
+
+def setmarkersize(lines, size):
+    for line in lines:
+        line.set_markersize(size)
+    return lines
+
+
+def setmarkercolor(lines, color):
+    """Sets the face and edge color of the markers"""
+    for line in lines:
+        line.set_markerfacecolor(color)
+        line.set_markeredgecolor(color)
+    return lines
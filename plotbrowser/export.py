@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+"""
+Figure export helpers for plotbrowser.
+
+A figure is copied with pickle on the thread that owns it, and the copy is
+rendered elsewhere with a non-interactive canvas, so slow exports don't block
+the GUI. batchexport() renders many figures in parallel in a process pool.
+Nothing here imports Qt.
+"""
+
+from __future__ import nested_scopes, generators, division, absolute_import,\
+    with_statement, print_function, unicode_literals
+
+import multiprocessing
+import os
+import pickle
+import re
+import tempfile
+
+import matplotlib as mpl
+try:
+    from .decimate import fullresolution
+except (ImportError, ValueError):  # imported as a top-level module when plotbrowser.py is run as a script
+    from decimate import fullresolution
+
+
+def dumpfigure(fig):
+    """Returns a pickled copy of fig that won't be added to pyplot's figure list when loaded
+
+    Decimated lines are pickled with their full data.
+    """
+    manager = getattr(fig.canvas, 'manager', None)
+    fig.canvas.manager = None  # figures with a manager reopen a pyplot window when unpickled
+    try:
+        with fullresolution(fig):
+            return pickle.dumps(fig, pickle.HIGHEST_PROTOCOL)
+    finally:
+        fig.canvas.manager = manager
+
+
+def savefigure(fig, filename, dpi=None, cancelled=None):
+    """Saves fig to filename via a temporary file, returns the filename written
+
+    The format is taken from the extension of filename, or savefig.format if
+    there is none (in which case the extension is appended, like savefig does).
+    cancelled is an optional callable; if it returns True once rendering is
+    done, the temporary file is deleted and None is returned. Decimated lines
+    are saved with their full data.
+    """
+    (root, ext) = os.path.splitext(filename)
+    if ext:
+        fmt = ext[1:].lower()
+    else:
+        fmt = mpl.rcParams['savefig.format']
+        filename = filename + '.' + fmt
+    (fd, tempname) = tempfile.mkstemp(suffix='.' + fmt, dir=os.path.dirname(os.path.abspath(filename)))
+    os.close(fd)
+    try:
+        with fullresolution(fig):
+            fig.savefig(tempname, dpi=dpi, format=fmt)
+        if cancelled is not None and cancelled():
+            return None
+        replacefile(tempname, filename)
+        return filename
+    finally:
+        if os.path.exists(tempname):
+            os.remove(tempname)
+
+
+def savepickledfigure(data, filename, dpi=None, cancelled=None):
+    """Loads a figure pickled by dumpfigure and saves it, safe to call off the GUI thread"""
+    if cancelled is not None and cancelled():
+        return None
+    return savefigure(pickle.loads(data), filename, dpi=dpi, cancelled=cancelled)
+
+
+def replacefile(source, destination):
+    """Moves source over destination, os.replace is not available on Python 2"""
+    if hasattr(os, 'replace'):
+        os.replace(source, destination)
+    else:
+        if os.path.exists(destination):
+            os.remove(destination)
+        os.rename(source, destination)
+
+
+def pyplotfigures():
+    """Returns the pyplot figures in order of plt.get_fignums(), without making any of them current"""
+    from matplotlib._pylab_helpers import Gcf
+    return [Gcf.figs[num].canvas.figure for num in sorted(Gcf.figs)]
+
+
+def windowtitle(fig):
+    """Returns the window title of fig, or '' for figures without a window"""
+    manager = getattr(fig.canvas, 'manager', None)
+    if manager is not None and hasattr(manager, 'get_window_title'):
+        return manager.get_window_title()
+    elif hasattr(fig.canvas, 'get_window_title'):
+        return fig.canvas.get_window_title()
+    return ''
+
+
+def setwindowtitle(fig, title):
+    manager = getattr(fig.canvas, 'manager', None)
+    if manager is not None and hasattr(manager, 'set_window_title'):
+        manager.set_window_title(title)
+    else:
+        fig.canvas.set_window_title(title)
+
+
+def exportfilenames(fig, index, formats, dpis, directory, template):
+    """Returns [(filename, dpi)] for one figure, see batchexport for the template fields"""
+    title = re.sub(r'[^\w\-. ]+', '_', windowtitle(fig)).strip() or 'figure'
+    fields = {'num': getattr(fig, 'number', index + 1), 'index': index, 'title': title}
+    outputs = []
+    for fmt in formats:
+        for dpi in dpis:
+            namedpi = dpi
+            if namedpi is None:
+                namedpi = mpl.rcParams['savefig.dpi']
+            if namedpi == 'figure':
+                namedpi = fig.dpi
+            fields.update(ext=fmt, dpi=int(namedpi) if namedpi == int(namedpi) else namedpi)
+            outputs.append((os.path.join(directory, template.format(**fields)), dpi))
+    return outputs
+
+
+def exporttasks(figures=None, formats=('png', 'pdf'), dpis=(None,), directory='.',
+                template='{num}_{title}_{dpi}dpi.{ext}'):
+    """Pickles the figures and names their outputs, call on the thread that owns the figures
+
+    Returns one task per figure for runtasks. figures defaults to all pyplot
+    figures, in order of plt.get_fignums(). template is formatted with num
+    (figure number), index (position in figures), title (window title made
+    filename safe), dpi and ext, and must give a different name for every output.
+    """
+    if figures is None:
+        figures = pyplotfigures()
+    tasks = []
+    filenames = set()
+    for (index, fig) in enumerate(figures):
+        outputs = exportfilenames(fig, index, formats, dpis, directory, template)
+        for (filename, dpi) in outputs:
+            if filename in filenames:
+                raise ValueError('template {!r} gives {} more than once'.format(template, filename))
+            filenames.add(filename)
+        tasks.append((dumpfigure(fig), outputs))
+    return tasks
+
+
+def runtasks(tasks, processes=None, cancelled=None, progress=None):
+    """Saves the outputs of tasks from exporttasks in a process pool, returns the filenames written
+
+    processes is the size of the pool, the number of cores by default; 1 saves
+    serially. progress is called with (tasks done, number of tasks) after each
+    figure. If cancelled returns True between figures the pool is terminated.
+    """
+    filenames = []
+    if processes == 1 or len(tasks) <= 1:
+        results = (savetask(task) for task in tasks)
+        pool = None
+    else:
+        pool = multiprocessing.Pool(processes)
+        results = pool.imap(savetask, tasks)
+    try:
+        for (done, result) in enumerate(results):
+            filenames.extend(result)
+            if progress is not None:
+                progress(done + 1, len(tasks))
+            if cancelled is not None and cancelled():
+                break
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+    return filenames
+
+
+def batchexport(figures=None, formats=('png', 'pdf'), dpis=(None,), directory='.',
+                template='{num}_{title}_{dpi}dpi.{ext}', processes=None):
+    """Saves every figure in every format at every dpi, in parallel, returns the filenames written
+
+    See exporttasks and runtasks for the arguments, e.g. to save all pyplot
+    figures as png at two resolutions into a directory:
+    batchexport(formats=['png'], dpis=[100, 300], directory='plots')
+    """
+    return runtasks(exporttasks(figures, formats, dpis, directory, template), processes)
+
+
+def savetask(task):
+    """Loads a pickled figure once and saves all its outputs, runs in the worker processes"""
+    (data, outputs) = task
+    fig = pickle.loads(data)
+    return [savefigure(fig, filename, dpi=dpi) for (filename, dpi) in outputs]
@@ -0,0 +1,295 @@
+# -*- coding: utf-8 -*-
+"""
+Evaluation of the NumPy expressions typed in the lines tab of plotbrowser.
+
+evaluate(expression, *namespaces) parses the expression and walks its syntax
+tree, so only numbers, arithmetic and comparison operators, indexing, the
+numpy functions in FUNCTIONS, numpy ufuncs and constants, and names of arrays
+and numbers in namespaces can appear; anything else, like attribute access on
+other objects, imports or calls of other functions, raises ExpressionError.
+Functions can be written as np.sin, numpy.sin or sin. Names are looked up in
+namespaces in order, e.g. the IPython namespace from usernamespace(), and the
+arrays found are used as they are, without copying. Every value computed along
+the way may have at most MAXSIZE elements; calls, operators and integer powers
+that would go over it are refused before they run. Nothing here imports Qt.
+"""
+
+from __future__ import nested_scopes, generators, division, absolute_import,\
+    with_statement, print_function, unicode_literals
+
+import ast
+import math
+import numbers
+import operator
+import sys
+import time
+
+import numpy as np
+try:
+    stringtypes = (str, unicode)
+    integertypes = (int, long)
+except NameError:  # Python 3
+    stringtypes = (str,)
+    integertypes = (int,)
+
+FUNCTIONS = set(['linspace', 'logspace', 'geomspace', 'arange', 'zeros', 'ones', 'full', 'zeros_like', 'ones_like',
+                 'full_like', 'array', 'asarray', 'concatenate', 'repeat', 'tile', 'where', 'clip', 'interp',
+                 'diff', 'cumsum', 'cumprod', 'gradient', 'convolve', 'sum', 'prod', 'mean', 'median', 'std', 'var',
+                 'min', 'max', 'amin', 'amax', 'round', 'around', 'sinc', 'real', 'imag', 'angle', 'unwrap',
+                 'flip', 'sort', 'abs', 'heaviside'])
+RANDOM = set(['rand', 'randn', 'random', 'normal', 'uniform', 'poisson', 'exponential'])  # np.random functions
+CONSTANTS = set(['pi', 'e', 'inf', 'nan', 'newaxis'])
+MODULES = ('np', 'numpy')
+MAXSIZE = 10 ** 8  # most elements of any array, or characters of any string, made by an expression
+MAXBITS = 1024  # largest Python integer an expression may make, bigger ones don't fit a float anyway
+SIZES = {'linspace': lambda start, stop, num=50, *args, **kwargs: broadcastsize(start, stop) * num,
+         'logspace': lambda start, stop, num=50, endpoint=True, base=10.0, *args, **kwargs:
+             broadcastsize(start, stop, base) * num,
+         'geomspace': lambda start, stop, num=50, *args, **kwargs: broadcastsize(start, stop) * num,
+         'arange': lambda *args, **kwargs: arangesize(*args, **kwargs),
+         'zeros': lambda shape, *args, **kwargs: np.prod(shape),
+         'ones': lambda shape, *args, **kwargs: np.prod(shape),
+         'full': lambda shape, *args, **kwargs: np.prod(shape),
+         'zeros_like': lambda a, dtype=None, order='K', subok=True, shape=None, **kwargs: likesize(a, shape),
+         'ones_like': lambda a, dtype=None, order='K', subok=True, shape=None, **kwargs: likesize(a, shape),
+         'full_like': lambda a, fill_value, dtype=None, order='K', subok=True, shape=None, **kwargs: likesize(a, shape),
+         'concatenate': lambda arrays, *args, **kwargs: sum(np.size(array) for array in arrays),
+         'repeat': lambda a, repeats, *args, **kwargs: np.size(a) * np.max(repeats),
+         'tile': lambda A, reps: np.size(A) * np.prod(reps),
+         'rand': lambda *shape: np.prod(shape),
+         'randn': lambda *shape: np.prod(shape),
+         'random': lambda size=None: randomsize(size),
+         'normal': lambda loc=0.0, scale=1.0, size=None: randomsize(size, loc, scale),
+         'uniform': lambda low=0.0, high=1.0, size=None: randomsize(size, low, high),
+         'poisson': lambda lam=1.0, size=None: randomsize(size, lam),
+         'exponential': lambda scale=1.0, size=None: randomsize(size, scale)}  # function -> most elements it would make
+BROADCASTING = set(['where', 'clip'])  # functions besides ufuncs whose result has the broadcast shape of the arguments
+OPERATORS = {ast.Add: operator.add, ast.Sub: operator.sub, ast.Mult: operator.mul, ast.Div: operator.truediv,
+             ast.FloorDiv: operator.floordiv, ast.Mod: operator.mod, ast.Pow: operator.pow,
+             ast.USub: operator.neg, ast.UAdd: operator.pos, ast.Invert: operator.invert,
+             ast.BitAnd: operator.and_, ast.BitOr: operator.or_, ast.BitXor: operator.xor,
+             ast.Eq: operator.eq, ast.NotEq: operator.ne, ast.Lt: operator.lt, ast.LtE: operator.le,
+             ast.Gt: operator.gt, ast.GtE: operator.ge}
+
+
+class ExpressionError(ValueError):
+    """Raised for expressions that aren't allowed or can't be evaluated"""
+
+
+def evaluate(expression, *namespaces):
+    """Returns the value of expression, using the names in namespaces"""
+    try:
+        tree = ast.parse(expression.strip(), mode='eval')
+    except SyntaxError:
+        raise ExpressionError('invalid syntax in {!r}'.format(expression))
+    try:
+        return Evaluator(namespaces).visit(tree.body)
+    except ExpressionError:
+        raise
+    except Exception as error:  # from numpy, e.g. shapes that don't broadcast
+        raise ExpressionError('{}: {}'.format(type(error).__name__, error))
+
+
+def timed(expression, *namespaces):
+    """Returns (value of expression, seconds it took to evaluate)"""
+    start = time.time()
+    value = evaluate(expression, *namespaces)
+    return (value, time.time() - start)
+
+
+def usernamespace():
+    """Returns the namespace of the running IPython shell, {} outside IPython"""
+    ipython = sys.modules.get('IPython')  # not imported here, a running shell has imported it already
+    if ipython is None:
+        return {}
+    shell = ipython.get_ipython()
+    return shell.user_ns if shell is not None else {}
+
+
+def arangesize(start, stop=None, step=1, *args, **kwargs):
+    if stop is None:
+        (start, stop) = (0, start)
+    return max(0, np.ceil((stop - start) / step))
+
+
+def randomsize(size, *parameters):
+    """Elements drawn by a np.random function, without size one per broadcast element of its parameters"""
+    if size is not None:
+        return np.prod(size)
+    return broadcastsize(*parameters) if parameters else 1
+
+
+def likesize(a, shape=None):
+    return np.size(a) if shape is None else np.prod(shape)
+
+
+def broadcastsize(*values):
+    """Elements of the result of an elementwise operation on values, 0 if they don't broadcast"""
+    try:
+        return np.broadcast(*values).size
+    except ValueError:
+        return 0  # numpy reports the shapes
+
+
+def binopsize(op, left, right):
+    """Elements of left op right, without computing it"""
+    sequences = (list, tuple) + stringtypes
+    if isinstance(op, ast.Mult) and isinstance(left, sequences) and isinstance(right, numbers.Integral):
+        return len(left) * right
+    if isinstance(op, ast.Mult) and isinstance(right, sequences) and isinstance(left, numbers.Integral):
+        return len(right) * left
+    if isinstance(op, ast.Add) and isinstance(left, sequences) and isinstance(right, sequences):
+        return len(left) + len(right)
+    if isinstance(left, stringtypes) or isinstance(right, stringtypes):
+        return 0  # not arithmetic, numpy or Python reports it
+    return broadcastsize(left, right)
+
+
+def intbits(op, left, right):
+    """Bits of the Python integer left op right would make, 0 if it isn't a power of Python integers"""
+    if not isinstance(op, ast.Pow) or not isinstance(left, integertypes) or not isinstance(right, integertypes):
+        return 0
+    if right <= 0 or abs(left) <= 1:
+        return 0
+    return right * math.log(abs(left), 2)
+
+
+def size(value):
+    """Elements of an array, characters of a string, items of a list or tuple, 1 for anything else"""
+    if isinstance(value, (list, tuple) + stringtypes):
+        return len(value)
+    return np.size(value) if isinstance(value, np.ndarray) else 1
+
+
+def checksize(elements, what):
+    if elements > MAXSIZE:
+        raise ExpressionError('{} would make {:.0f} elements, more than {}'.format(what, elements, MAXSIZE))
+
+
+def isdata(value):
+    """Only arrays, numbers and array-likes such as pandas Series can be looked up by name"""
+    return isinstance(value, (np.ndarray, np.generic, numbers.Number)) or hasattr(value, '__array__')
+
+
+class Evaluator(ast.NodeVisitor):
+    """Evaluates the allowed nodes of an expression's syntax tree, refuses all others"""
+    def __init__(self, namespaces):
+        self.namespaces = namespaces
+
+    def visit(self, node):
+        """Returns the value of node, refusing values with more than MAXSIZE elements"""
+        value = super(Evaluator, self).visit(node)
+        if not isinstance(node, (ast.Name, ast.Attribute)):  # arrays from the namespaces are only looked up
+            checksize(size(value), 'the expression')
+        return value
+
+    def generic_visit(self, node):
+        raise ExpressionError('{} is not allowed'.format(type(node).__name__))
+
+    def visit_Constant(self, node):
+        """Numbers, True, False, None, and strings for arguments like dtype='float32'"""
+        if isinstance(node.value, (numbers.Number, type(None), str, type(''))):
+            return node.value
+        raise ExpressionError('{!r} is not allowed'.format(node.value))
+
+    def visit_Num(self, node):  # Python < 3.8
+        return node.n
+
+    def visit_Str(self, node):  # Python < 3.8
+        return node.s
+
+    def visit_NameConstant(self, node):
+        return node.value
+
+    def visit_Name(self, node):
+        if node.id in ('True', 'False', 'None'):  # Python 2
+            return {'True': True, 'False': False, 'None': None}[node.id]
+        for namespace in self.namespaces:
+            if node.id in namespace:
+                value = namespace[node.id]
+                if not isdata(value):
+                    raise ExpressionError('{} is not an array or number'.format(node.id))
+                return value
+        return self.numpyname(node.id, node.id)
+
+    def visit_Attribute(self, node):
+        """Only np.name, numpy.name and np.random.name"""
+        path = []
+        while isinstance(node, ast.Attribute):
+            path.insert(0, node.attr)
+            node = node.value
+        if not isinstance(node, ast.Name) or node.id not in MODULES:
+            raise ExpressionError('attributes are only allowed on np')
+        if len(path) == 2 and path[0] == 'random' and path[1] in RANDOM:
+            return getattr(np.random, path[1])
+        if len(path) != 1:
+            raise ExpressionError('{} is not allowed'.format('.'.join([node.id] + path)))
+        return self.numpyname(path[0], node.id + '.' + path[0])
+
+    def numpyname(self, name, text):
+        value = getattr(np, name, None)
+        if name in FUNCTIONS or name in CONSTANTS or isinstance(value, np.ufunc):
+            return value
+        raise ExpressionError('{} is not allowed'.format(text))
+
+    def visit_Call(self, node):
+        function = self.visit(node.func)
+        if not callable(function) or isdata(function):
+            raise ExpressionError('only numpy functions can be called')
+        args = [self.visit(arg) for arg in node.args]
+        kwargs = dict((keyword.arg, self.visit(keyword.value)) for keyword in node.keywords if keyword.arg is not None)
+        if len(kwargs) != len(node.keywords) or any(isinstance(arg, getattr(ast, 'Starred', ())) for arg in node.args):
+            raise ExpressionError('* and ** arguments are not allowed')
+        name = getattr(function, '__name__', '')
+        if name in SIZES and function in (getattr(np, name, None), getattr(np.random, name, None)):
+            try:
+                elements = SIZES[name](*args, **kwargs)
+            except (TypeError, ValueError):
+                elements = 0  # numpy reports the bad arguments
+            checksize(elements, name)
+        elif isinstance(function, np.ufunc) or (name in BROADCASTING and function is getattr(np, name)):
+            checksize(broadcastsize(*args), name)
+        return function(*args, **kwargs)
+
+    def visit_BinOp(self, node):
+        (left, right) = (self.visit(node.left), self.visit(node.right))
+        if intbits(node.op, left, right) > MAXBITS:
+            raise ExpressionError('{} ** {} is more than {} bits'.format(left, right, MAXBITS))
+        checksize(binopsize(node.op, left, right), type(node.op).__name__)
+        return self.operator(node.op)(left, right)
+
+    def visit_UnaryOp(self, node):
+        return self.operator(node.op)(self.visit(node.operand))
+
+    def visit_Compare(self, node):
+        left = self.visit(node.left)
+        result = True
+        for (op, comparator) in zip(node.ops, node.comparators):
+            right = self.visit(comparator)
+            checksize(broadcastsize(result, left, right), type(op).__name__)
+            result = result & self.operator(op)(left, right)
+            left = right
+        return result
+
+    def operator(self, op):
+        if type(op) not in OPERATORS:
+            raise ExpressionError('{} is not allowed'.format(type(op).__name__))
+        return OPERATORS[type(op)]
+
+    def visit_Subscript(self, node):
+        return self.visit(node.value)[self.visit(node.slice)]
+
+    def visit_Index(self, node):  # Python < 3.9
+        return self.visit(node.value)
+
+    def visit_Slice(self, node):
+        return slice(*[None if part is None else self.visit(part) for part in (node.lower, node.upper, node.step)])
+
+    def visit_ExtSlice(self, node):  # Python < 3.9
+        return tuple(self.visit(dim) for dim in node.dims)
+
+    def visit_Tuple(self, node):
+        return tuple(self.visit(item) for item in node.elts)
+
+    def visit_List(self, node):
+        return [self.visit(item) for item in node.elts]
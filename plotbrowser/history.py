@@ -0,0 +1,418 @@
+# -*- coding: utf-8 -*-
+"""
+Undo and redo of the edits made with plotbrowser.
+
+Each edit is a Command that remembers only the previous values of the
+properties it changes, read from the artists just before the edit, so undoing
+restores those properties and nothing else. Data is never re-plotted and
+figures are never copied; deleted axes and lines are kept by reference and put
+back. History keeps at most maxlength commands, and consecutive edits of the
+same property of the same artists (e.g. the steps of a spin box) merge into
+one. Nothing here imports Qt.
+"""
+
+from __future__ import nested_scopes, generators, division, absolute_import,\
+    with_statement, print_function, unicode_literals
+
+import collections
+import time
+
+try:
+    from . import engine
+    from .snapshot import figurestyle, applystyle, stylediff, tickstyle, applyticks
+except (ImportError, ValueError):  # imported as a top-level module when plotbrowser.py is run as a script
+    import engine
+    from snapshot import figurestyle, applystyle, stylediff, tickstyle, applyticks
+
+MAXLENGTH = 100  # number of commands that can be undone
+MERGETIME = 1.0  # seconds within which repeated edits of the same property merge into one command
+
+
+class Command(object):
+    """An edit that can be undone and redone
+
+    redo and undo are called without arguments. artists are what they change,
+    for redrawing; partial is True if redrawing just those artists is enough.
+    """
+    def __init__(self, description, redo, undo, artists, partial=False, key=None):
+        self.description = description
+        self.redo = redo
+        self.undo = undo
+        self.artists = list(artists)
+        self.partial = partial
+        self.key = key  # commands with the same key change the same properties of the same artists
+        self.time = time.time()
+
+    def figures(self):
+        figures = []
+        for artist in self.artists:
+            fig = engine.figureof(artist)
+            if fig is not None and fig not in figures:
+                figures.append(fig)
+        return figures
+
+    def merge(self, command):
+        """Takes over the redo of a later command that changes the same properties, returns True if it did"""
+        if self.key is None or command.key != self.key or command.time - self.time > MERGETIME:
+            return False
+        self.redo = command.redo
+        self.time = command.time
+        return True
+
+
+class History(object):
+    """Bounded undo and redo stacks of Commands"""
+    def __init__(self, maxlength=MAXLENGTH):
+        self.undostack = collections.deque(maxlen=maxlength)
+        self.redostack = []
+
+    def push(self, command):
+        """Adds a command that was just done, which clears the redo stack
+
+        Returns the command on top of the undo stack, which is the previous one if command merged into it.
+        """
+        self.redostack = []
+        if self.undostack and self.undostack[-1].merge(command):
+            return self.undostack[-1]
+        self.undostack.append(command)
+        return command
+
+    def undo(self):
+        """Undoes the last command and returns it, None if there is nothing to undo"""
+        if not self.undostack:
+            return None
+        command = self.undostack.pop()
+        command.undo()
+        self.redostack.append(command)
+        return command
+
+    def redo(self):
+        if not self.redostack:
+            return None
+        command = self.redostack.pop()
+        command.redo()
+        command.key = None  # a redone command doesn't merge with new edits
+        self.undostack.append(command)
+        return command
+
+    def discard(self, fig):
+        """Drops the commands that change fig, e.g. when it is closed"""
+        self.undostack = collections.deque((command for command in self.undostack if fig not in command.figures()),
+                                           maxlen=self.undostack.maxlen)
+        self.redostack = [command for command in self.redostack if fig not in command.figures()]
+
+    def clear(self):
+        self.undostack.clear()
+        self.redostack = []
+
+    def undotext(self):
+        return self.undostack[-1].description if self.undostack else ''
+
+    def redotext(self):
+        return self.redostack[-1].description if self.redostack else ''
+
+
+def edit(function, targets, *args, **kwargs):
+    """Calls engine function(targets, *args, **kwargs), returns the Command that redoes and undoes it
+
+    The previous values are read with the (read, restore) pair in STATES for
+    function, read(target, *args, **kwargs) for each target before the edit.
+    The command's artists are those function returns.
+    """
+    targets = list(targets)
+    (read, restore) = STATES[function.__name__]
+    previous = [read(target, *args, **kwargs) for target in targets]
+    artists = function(targets, *args, **kwargs)
+
+    def undo():
+        for (target, state) in zip(targets, previous):
+            restore(target, state, *args, **kwargs)
+
+    # the new value is the last positional argument, or in kwargs
+    key = (function.__name__, [id(target) for target in targets], args if kwargs else args[:-1], sorted(kwargs))
+    description = ' '.join([function.__name__[3:]] + [str(arg) for arg in args] +
+                           ['{}={}'.format(name, value) for (name, value) in sorted(kwargs.items())])
+    return Command(description, lambda: function(targets, *args, **kwargs), undo, artists,
+                   partial=function.__name__ in PARTIAL, key=key)
+
+
+def restyle(style, figures):
+    """Applies a snapshot or diff from plotbrowser.snapshot, returns the Command that puts back what it changed
+
+    Legends are put back as objects by restorelegend, also where there was none
+    before, rather than remade from the diff.
+    """
+    figures = list(figures)
+    before = [figurestyle(fig) for fig in figures]
+    legends = [(ax, readlegend(ax)) for fig in figures for ax in fig.axes]
+    applystyle(style, figures)
+    previous = [stylediff(figurestyle(fig), old) for (fig, old) in zip(figures, before)]
+    for diff in previous:
+        for axesdiff in diff.get('axes', []):
+            axesdiff.pop('legend', None)
+
+    def undo():
+        for (fig, diff) in zip(figures, previous):
+            applystyle(diff, [fig])
+        for (ax, state) in legends:
+            restorelegend(ax, state)
+    return Command('paste style', lambda: applystyle(style, figures), undo, figures)
+
+
+def removeaxes(ax):
+    """Deletes ax from its figure, returns the Command that puts it back at the same index in fig.axes"""
+    fig = ax.figure
+    index = fig.axes.index(ax)
+    fig.delaxes(ax)
+    return Command('delete axes', lambda: fig.delaxes(ax), lambda: addaxes(fig, ax, index), [fig])
+
+
+def addaxes(fig, ax, index):
+    """Puts removed axes back at index in fig.axes, which the editlog, sessions and snapshots count on
+
+    Axes can't be reordered through the public API (delaxes would unshare them),
+    so this goes through the figure's axes stack.
+    """
+    fig.add_axes(ax)
+    stack = fig._axstack
+    if isinstance(getattr(stack, '_axes', None), dict):  # matplotlib >= 3.6, fig.axes is in insertion order
+        order = [other for other in stack._axes if other is not ax]
+        order.insert(index, ax)
+        stack._axes = dict((other, stack._axes[other]) for other in order)
+    elif hasattr(stack, '_elements'):  # fig.axes sorted by position in (position, ax) or (key, (position, ax))
+        def axesof(element):
+            return element[1][1] if isinstance(element[1], tuple) else element[1]
+
+        def moved(element, position):
+            return (element[0], (position, element[1][1])) if isinstance(element[1], tuple) else (position, element[1])
+        order = sorted(stack._elements, key=lambda element: element[1][0] if isinstance(element[1], tuple) else element[0])
+        order = [element for element in order if axesof(element) is not ax]
+        order.insert(index, [element for element in stack._elements if axesof(element) is ax][0])
+        positions = dict((id(axesof(element)), position) for (position, element) in enumerate(order))
+        stack._elements = [moved(element, positions[id(axesof(element))]) for element in stack._elements]
+    localaxes = getattr(fig, '_localaxes', None)  # drawing order, matplotlib >= 3.4
+    localaxes = getattr(localaxes, '_elements', localaxes)  # a cbook.Stack before 3.6
+    if isinstance(localaxes, list) and ax in localaxes:
+        localaxes.remove(ax)
+        localaxes.insert(index, ax)
+
+
+def addedaxes(ax):
+    """Returns the Command for axes that were just made"""
+    fig = ax.figure
+    return Command('make axes', lambda: fig.add_axes(ax), lambda: fig.delaxes(ax), [fig])
+
+
+def removeline(line):
+    ax = line.axes
+    index = ax.lines.index(line)
+    line.remove()
+    return Command('delete line', line.remove, lambda: addline(ax, line, index), [ax])
+
+
+def addline(ax, line, index):
+    """Puts a removed line back at index in ax.lines"""
+    ax.add_line(line)
+    if isinstance(ax.lines, list):  # matplotlib < 3.5
+        ax.lines.insert(index, ax.lines.pop())
+    elif index < len(ax.lines) - 1:  # ax.lines is a view of ax._children, reordered through it
+        following = ax.lines[index]  # the line now at index, which was after line
+        ax._children.remove(line)
+        ax._children.insert(ax._children.index(following), line)
+
+
+def addedline(line):
+    ax = line.axes
+    return Command('make line', lambda: ax.add_line(line), line.remove, [ax])
+
+
+# (read, restore) of the properties each engine function changes
+def readpatch(artist, *args):
+    return (artist.patch.get_facecolor(), artist.patch.get_alpha())
+
+
+def restorepatch(artist, state, *args):
+    artist.patch.set_facecolor(state[0])
+    artist.patch.set_alpha(state[1])
+
+
+def readlabel(ax, name, *args):
+    return getattr(ax, 'get_' + name + 'label')()
+
+
+def restorelabel(ax, state, name, *args):
+    engine.setlabel([ax], name, state)
+
+
+def readlabelposition(ax, name, *args):
+    return engine.axisof(ax, name).get_label_position()
+
+
+def restorelabelposition(ax, state, name, *args):
+    engine.setlabelposition([ax], name, state)
+
+
+def readscale(ax, name, *args):
+    """Setting the scale replaces the locators and formatters, and may change the limits"""
+    axis = engine.axisof(ax, name)
+    return (getattr(ax, 'get_' + name + 'scale')(), axis.get_major_locator(), axis.get_minor_locator(),
+            axis.get_major_formatter(), axis.get_minor_formatter(), getattr(ax, 'get_' + name + 'lim')())
+
+
+def restorescale(ax, state, name, *args):
+    axis = engine.axisof(ax, name)
+    (scale, majorlocator, minorlocator, majorformatter, minorformatter, limits) = state
+    getattr(ax, 'set_' + name + 'scale')(scale)
+    axis.set_major_locator(majorlocator)
+    axis.set_minor_locator(minorlocator)
+    axis.set_major_formatter(majorformatter)
+    axis.set_minor_formatter(minorformatter)
+    getattr(ax, 'set_' + name + 'lim')(limits)
+
+
+def readlimits(ax, *args):
+    return (ax.get_xlim(), ax.get_ylim(), ax.get_autoscalex_on(), ax.get_autoscaley_on(), ax.get_aspect(),
+            ax.get_adjustable())
+
+
+def restorelimits(ax, state, *args):
+    (xlim, ylim, autoscalex, autoscaley, aspect, adjustable) = state
+    ax.set_aspect(aspect, adjustable=adjustable)
+    ax.set_xlim(xlim)
+    ax.set_ylim(ylim)
+    ax.set_autoscalex_on(autoscalex)
+    ax.set_autoscaley_on(autoscaley)
+
+
+def readticks(ax, *args, **kwargs):
+    return tickstyle(ax)
+
+
+def restoreticks(ax, state, *args, **kwargs):
+    applyticks(state, ax)
+
+
+def readnumticks(ax, name, which, *args):
+    """The major locator is changed in place, the minor locator is replaced"""
+    locator = getattr(engine.axisof(ax, name), 'get_' + which + '_locator')()
+    return (locator, dict((key, getattr(locator, key)) for key in ('numticks', '_nbins') if hasattr(locator, key)))
+
+
+def restorenumticks(ax, state, name, which, *args):
+    (locator, values) = state
+    for (key, value) in values.items():
+        setattr(locator, key, value)
+    getattr(engine.axisof(ax, name), 'set_' + which + '_locator')(locator)
+
+
+def readminorlabels(ax, name, *args):
+    return engine.axisof(ax, name).get_minor_formatter()
+
+
+def restoreminorlabels(ax, state, name, *args):
+    engine.axisof(ax, name).set_minor_formatter(state)
+
+
+def readspine(ax, loc, *args):
+    spine = ax.spines[loc]
+    return (spine.get_visible(), spine.get_position())
+
+
+def restorespine(ax, state, loc, *args):
+    ax.spines[loc].set_visible(state[0])
+    ax.spines[loc].set_position(state[1])
+
+
+def readspinewidth(ax, width, locs=engine.SPINES):
+    return [ax.spines[loc].get_linewidth() for loc in locs]
+
+
+def restorespinewidth(ax, state, width, locs=engine.SPINES):
+    for (loc, linewidth) in zip(locs, state):
+        ax.spines[loc].set_linewidth(linewidth)
+
+
+def readgrid(ax, *args, **kwargs):
+    gridline = ax.xaxis.majorTicks[0].gridline
+    return (dict(x=engine.tickflag(ax.xaxis.majorTicks[0], 'gridOn'), y=engine.tickflag(ax.yaxis.majorTicks[0], 'gridOn'),
+                 linestyle=gridline.get_linestyle(), linewidth=gridline.get_linewidth(), color=gridline.get_color()),
+            ax.get_axisbelow())
+
+
+def restoregrid(ax, state, *args, **kwargs):
+    engine.setgrid([ax], **state[0])
+    ax.set_axisbelow(state[1])
+
+
+def readlegend(ax, *args, **kwargs):
+    """The legend is remade, so the old one is put back as it was"""
+    legend = ax.legend_
+    return (legend, legend is not None and legend.get_visible(), legend is not None and engine.isdraggable(legend))
+
+
+def restorelegend(ax, state, *args, **kwargs):
+    """Removes the legend made since, if any, and puts back the old one, or none if there was none"""
+    (legend, visible, draggable) = state
+    if ax.legend_ is not None and ax.legend_ is not legend:
+        engine.setdraggable(ax.legend_, False)  # disconnects its mouse callbacks
+        try:
+            ax.legend_.remove()
+        except NotImplementedError:  # matplotlib versions that can't remove legends
+            pass
+    ax.legend_ = legend
+    if legend is not None:
+        legend.set_visible(visible)
+        if engine.isdraggable(legend) != draggable:
+            engine.setdraggable(legend, draggable)
+
+
+def readfont(ax, targets, *args, **kwargs):
+    return [(text, text.get_family(), text.get_size(), text.get_weight(), text.get_style(), text.get_color())
+            for target in targets for text in engine.fonttexts(ax, target)]
+
+
+def restorefont(ax, state, *args, **kwargs):
+    for (text, family, size, weight, style, color) in state:
+        text.set_family(family)
+        text.set_size(size)
+        text.set_weight(weight)
+        text.set_style(style)
+        text.set_color(color)
+
+
+def lineproperty(*names):
+    """(read, restore) of line properties, by the names of their get_/set_ methods"""
+    def read(line, *args):
+        return [getattr(line, 'get_' + name)() for name in names]
+
+    def restore(line, state, *args):
+        for (name, value) in zip(names, state):
+            getattr(line, 'set_' + name)(value)
+    return (read, restore)
+
+
+STATES = {'setfacecolor': (readpatch, restorepatch),
+          'setfacealpha': (readpatch, restorepatch),
+          'setlabel': (readlabel, restorelabel),
+          'setlabelposition': (readlabelposition, restorelabelposition),
+          'setscale': (readscale, restorescale),
+          'setlimits': (readlimits, restorelimits),
+          'settickparams': (readticks, restoreticks),
+          'setticksdraw': (readticks, restoreticks),
+          'settickdirection': (readticks, restoreticks),
+          'setticklength': (readticks, restoreticks),
+          'settickwidth': (readticks, restoreticks),
+          'setnumticks': (readnumticks, restorenumticks),
+          'setminorticklabels': (readminorlabels, restoreminorlabels),
+          'setspine': (readspine, restorespine),
+          'setspinewidth': (readspinewidth, restorespinewidth),
+          'setgrid': (readgrid, restoregrid),
+          'setlegend': (readlegend, restorelegend),
+          'setfont': (readfont, restorefont),
+          'setlinestyle': lineproperty('linestyle'),
+          'setlinewidth': lineproperty('linewidth'),
+          'setlinecolor': lineproperty('color'),
+          'setmarker': lineproperty('marker'),
+          'setmarkersize': lineproperty('markersize'),
+          'setmarkercolor': lineproperty('markerfacecolor', 'markeredgecolor')}
+PARTIAL = {'setlinestyle', 'setlinewidth', 'setlinecolor', 'setmarker', 'setmarkersize', 'setmarkercolor'}  # lines only
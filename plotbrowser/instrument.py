@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+"""
+Opt-in timing of the slots of plotbrowser and of matplotlib draws.
+
+    from plotbrowser import instrument
+    instrument.enable()
+    ...  # use the browser, or click "time slots and draws" in the figures tab
+    print(instrument.report())
+
+While enabled, every call of a slot wrapped by timeslots() (all on_* methods
+of PlotBrowser) and every draw of an artist is added to a rolling Histogram,
+one per slot and one per artist type. Artist times are inclusive: an Axes
+includes its lines and axis, an XAxis its tick generation and tick labels, a
+Text its layout. enable() wraps the draw methods of the matplotlib artist
+classes and disable() puts the originals back, so nothing is patched while
+disabled and a wrapped slot only checks `enabled`. Nothing here imports Qt.
+"""
+
+from __future__ import nested_scopes, generators, division, absolute_import,\
+    with_statement, print_function, unicode_literals
+
+import bisect
+import collections
+import functools
+import json
+import time
+
+import matplotlib.artist
+
+EDGES = (0.001, 0.003, 0.01, 0.03, 0.1, 0.3, 1.0)  # seconds, bins are <1 ms, 1-3 ms, ..., 300-1000 ms, >1 s
+BINNAMES = ('<1ms', '1-3', '3-10', '10-30', '30-100', '100-300', '300-1000', '>1s')
+WINDOW = 1000  # most recent durations kept per histogram
+
+enabled = False
+slots = {}  # slot name -> Histogram
+artists = {}  # artist type name -> Histogram
+patched = []  # [(artist class, original draw)] while enabled
+drawing = set()  # ids of artists being drawn, so a draw calling its base class's draw counts once
+
+
+class Histogram(object):
+    """Durations of the last window calls, and the number of calls ever"""
+    def __init__(self, window=WINDOW):
+        self.durations = collections.deque(maxlen=window)
+        self.calls = 0
+
+    def add(self, seconds):
+        self.durations.append(seconds)
+        self.calls += 1
+
+    def bins(self):
+        counts = [0] * (len(EDGES) + 1)
+        for seconds in self.durations:
+            counts[bisect.bisect(EDGES, seconds)] += 1
+        return counts
+
+    def summary(self):
+        """Returns a dict of calls and, over the window, total, mean, median and max seconds, and bin counts"""
+        durations = sorted(self.durations)
+        if not durations:
+            return {'calls': self.calls, 'total': 0.0, 'mean': 0.0, 'median': 0.0, 'max': 0.0, 'bins': self.bins()}
+        total = sum(durations)
+        return {'calls': self.calls, 'total': total, 'mean': total / len(durations),
+                'median': durations[len(durations) // 2], 'max': durations[-1], 'bins': self.bins()}
+
+
+def record(histograms, name, seconds):
+    if name not in histograms:
+        histograms[name] = Histogram()
+    histograms[name].add(seconds)
+
+
+def timedslot(function):
+    """Returns function timed into slots[function.__name__] while enabled, keeping the Slot decorator's attributes"""
+    name = function.__name__
+
+    @functools.wraps(function)
+    def slot(*args, **kwargs):
+        if not enabled:
+            return function(*args, **kwargs)
+        start = time.time()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            record(slots, name, time.time() - start)
+    return slot
+
+
+def timeslots(cls):
+    """Wraps every on_* method of cls with timedslot(), before instances connect them by name"""
+    for (name, function) in list(vars(cls).items()):
+        if name.startswith('on_') and callable(function):
+            setattr(cls, name, timedslot(function))
+    return cls
+
+
+def timeddraw(function):
+    @functools.wraps(function)  # also copies the rasterization flags matplotlib sets on draw methods
+    def draw(self, *args, **kwargs):
+        if id(self) in drawing:
+            return function(self, *args, **kwargs)
+        drawing.add(id(self))
+        start = time.time()
+        try:
+            return function(self, *args, **kwargs)
+        finally:
+            drawing.discard(id(self))
+            record(artists, type(self).__name__, time.time() - start)
+    return draw
+
+
+def artistclasses(cls=matplotlib.artist.Artist):
+    """Returns cls and its subclasses imported so far"""
+    classes = [cls]
+    for subclass in cls.__subclasses__():
+        classes.extend(c for c in artistclasses(subclass) if c not in classes)
+    return classes
+
+
+def patchdraws(wrap):
+    """Replaces the draw method of every artist class defining one by wrap(draw), returns [(class, original draw)]"""
+    originals = []
+    for cls in artistclasses():
+        if 'draw' in vars(cls):
+            originals.append((cls, vars(cls)['draw']))
+            cls.draw = wrap(vars(cls)['draw'])
+    return originals
+
+
+def unpatchdraws(originals):
+    """Puts back the draw methods replaced by patchdraws(), emptying originals"""
+    while originals:
+        (cls, draw) = originals.pop()
+        cls.draw = draw
+
+
+def enable():
+    """Starts timing slots and draws; artist classes imported later (e.g. by a new projection) aren't timed"""
+    global enabled
+    if enabled:
+        return
+    patched.extend(patchdraws(timeddraw))
+    enabled = True
+
+
+def disable():
+    """Stops timing and restores the draw methods, the histograms are kept"""
+    global enabled
+    unpatchdraws(patched)
+    enabled = False
+
+
+def reset():
+    slots.clear()
+    artists.clear()
+
+
+def stats():
+    """Returns {'slots': {name: summary}, 'artists': {type: summary}}, see Histogram.summary()"""
+    return {'slots': dict((name, histogram.summary()) for (name, histogram) in slots.items()),
+            'artists': dict((name, histogram.summary()) for (name, histogram) in artists.items())}
+
+
+def report():
+    """Returns the histograms as a text table, slowest total first, times in milliseconds"""
+    lines = []
+    for (title, histograms) in (('slots', slots), ('artist draws (inclusive)', artists)):
+        lines.append('{:<46}{:>7}{:>9}{:>9}{:>9}  {}'.format(title, 'calls', 'mean', 'median', 'max', ' '.join(BINNAMES)))
+        summaries = sorted(((name, histogram.summary()) for (name, histogram) in histograms.items()),
+                           key=lambda item: -item[1]['total'])
+        for (name, summary) in summaries:
+            bins = ' '.join('{:>{}}'.format(count, len(binname)) for (count, binname) in zip(summary['bins'], BINNAMES))
+            lines.append('{:<46}{:>7}{:>9.2f}{:>9.2f}{:>9.2f}  {}'.format(name[:45], summary['calls'], 1000 * summary['mean'],
+                                                                        1000 * summary['median'], 1000 * summary['max'], bins))
+        lines.append('')
+    return '\n'.join(lines)
+
+
+def dump(filename=None):
+    """Prints report(), or writes stats() to filename as JSON"""
+    if filename is None:
+        print(report())
+        return
+    with open(filename, 'w') as f:
+        json.dump(stats(), f, indent=1, sort_keys=True)
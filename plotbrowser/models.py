@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+List model of matplotlib artists for the figure, axes and line list views.
+
+Labels are only fetched when a row is shown, so lists with many thousands of
+lines build and scroll quickly. The model can be filtered by label substring.
+"""
+
+from __future__ import nested_scopes, generators, division, absolute_import,\
+    with_statement, print_function, unicode_literals
+
+try:
+    import sip
+    sip.setapi('QString', 2)
+    sip.setapi('QVariant', 2)
+    from PyQt4 import QtCore
+    from PyQt4.QtCore import pyqtSignal as Signal
+except ImportError:
+    from PySide import QtCore
+    from PySide.QtCore import Signal
+
+ArtistRole = QtCore.Qt.UserRole  # data(index, ArtistRole) returns the artist of a row
+
+
+class ArtistListModel(QtCore.QAbstractListModel):
+    """Rows of artists, labelled by label(artist) and renamed by setlabel(artist, text)
+
+    artistRenamed is emitted with the artist after it is renamed in a view.
+    """
+    artistRenamed = Signal(object)
+
+    def __init__(self, label, setlabel, parent=None):
+        super(ArtistListModel, self).__init__(parent)
+        self.label = label
+        self.setlabel = setlabel
+        self.artists = []  # all artists
+        self.rows = []  # artists passing the filter
+        self.labels = {}  # id(artist) -> label, filled as rows are shown
+        self.rowindex = None  # id(artist) -> row in self.rows, built on demand
+        self.filtertext = ''
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.rows)
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.rows):
+            return None
+        artist = self.rows[index.row()]
+        if role in (QtCore.Qt.DisplayRole, QtCore.Qt.EditRole):
+            return self.cachedlabel(artist)
+        elif role == ArtistRole:
+            return artist
+        return None
+
+    def setData(self, index, value, role=QtCore.Qt.EditRole):
+        if role != QtCore.Qt.EditRole or not index.isValid():
+            return False
+        artist = self.rows[index.row()]
+        self.setlabel(artist, value)
+        self.labels[id(artist)] = self.label(artist)
+        self.dataChanged.emit(index, index)
+        self.artistRenamed.emit(artist)
+        return True
+
+    def flags(self, index):
+        if not index.isValid():
+            return QtCore.Qt.NoItemFlags
+        return QtCore.Qt.ItemIsSelectable | QtCore.Qt.ItemIsEditable | QtCore.Qt.ItemIsEnabled
+
+    def cachedlabel(self, artist):
+        if id(artist) not in self.labels:
+            self.labels[id(artist)] = self.label(artist)
+        return self.labels[id(artist)]
+
+    def artist(self, index):
+        return self.data(index, ArtistRole)
+
+    def indexof(self, artist):
+        """Returns the index of the row of artist, invalid if it isn't shown"""
+        if self.rowindex is None:
+            self.rowindex = dict((id(rowartist), row) for (row, rowartist) in enumerate(self.rows))
+        if id(artist) in self.rowindex:
+            return self.index(self.rowindex[id(artist)])
+        return QtCore.QModelIndex()
+
+    def setartists(self, artists):
+        """Shows artists, removing and inserting only the rows between the unchanged first and last rows
+
+        Rows of artists that stay keep their selection, also while a filter is
+        set. Labels are fetched again lazily, so renamed artists show their new label.
+        """
+        self.artists = list(artists)
+        self.labels = {}
+        self.rowindex = None
+        old = self.rows
+        rows = self.filtered(self.artists)
+        common = min(len(old), len(rows))
+        prefix = 0
+        while prefix < common and old[prefix] is rows[prefix]:
+            prefix += 1
+        suffix = 0
+        while suffix < common - prefix and old[-1 - suffix] is rows[-1 - suffix]:
+            suffix += 1
+        if len(old) - suffix > prefix:
+            self.beginRemoveRows(QtCore.QModelIndex(), prefix, len(old) - suffix - 1)
+            self.rows = old[:prefix] + old[len(old) - suffix:]
+            self.endRemoveRows()
+        if len(rows) - suffix > prefix:
+            self.beginInsertRows(QtCore.QModelIndex(), prefix, len(rows) - suffix - 1)
+            self.rows = rows
+            self.endInsertRows()
+        self.rows = rows
+        if len(self.rows) > 0:
+            self.dataChanged.emit(self.index(0), self.index(len(self.rows) - 1))
+
+    def filtered(self, artists):
+        """Returns the artists whose label contains the filter text"""
+        if not self.filtertext:
+            return artists
+        return [artist for artist in artists if self.filtertext in self.cachedlabel(artist).lower()]
+
+    def setfilter(self, text):
+        """Shows only the artists whose label contains text, case insensitive"""
+        self.filtertext = text.lower()
+        self.applyfilter()
+
+    def applyfilter(self):
+        self.rowindex = None
+        self.beginResetModel()
+        self.rows = self.filtered(self.artists)
+        self.endResetModel()
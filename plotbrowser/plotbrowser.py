@@ -6,49 +6,131 @@ plotbrowser
 A GUI to change the appearance of matplotlib plots, useful for quick tweaks of
 plots and for those unfamiliar with matplotlib syntax. Uses the object-oriented
 interface of matplotlib when possible.
+
+The window shows up before the figures are read; the lists are filled after
+the first paint, and a FigureWatcher then picks up figures made or closed from
+the shell within half a second. Shift- or ctrl-click selects several axes or
+lines, and the "apply to" boxes extend edits to every axes or line of the
+figure or of all figures, with one redraw per figure. Edits go through
+plotbrowser.engine and are recorded for undo (Ctrl+Z, Ctrl+Shift+Z, see
+plotbrowser.history) and as a script (plotbrowser.editlog). Slots don't draw,
+they schedule redraws with browser.redraw, see plotbrowser.redraw.
 """
 
 from __future__ import nested_scopes, generators, division, absolute_import,\
     with_statement, print_function, unicode_literals
 
+import contextlib
+import os
+import weakref
 try:
     import sip
     sip.setapi('QString', 2)
     sip.setapi('QVariant', 2)
     from PyQt4 import QtCore, QtGui
     from PyQt4.QtCore import pyqtSlot as Slot
+    from PyQt4.QtCore import pyqtSignal as Signal
 except ImportError:
     from PySide import QtCore, QtGui
-    from PySide.QtCore import Slot
+    from PySide.QtCore import Slot, Signal
 import numpy as np
 import matplotlib as mpl
 import matplotlib.pyplot as plt
-from IPython.lib import guisupport
 if __name__ == '__main__':
     from plotbrowser_ui import Ui_PlotBrowser  # can't do relative import if run directly (for testing before packaging)
     # only works if working directory contains plotbrowser_ui.py
+    from redraw import RedrawScheduler
+    import decimate
+    from watcher import FigureWatcher
+    from models import ArtistListModel
+    from colors import colorname, commonname
+    from styles import linestyletable, markertable
+    import engine
+    import history
+    from editlog import EditLog
+    import session
+    import instrument
+    import drawprofile
+    from expressions import timed, usernamespace, ExpressionError
+    from snapshot import figurestyle, numticks
+    from rcstyle import changedrcparams, applyrc, writerc
+    from export import dumpfigure, savefigure, savepickledfigure, exporttasks, runtasks, pyplotfigures, windowtitle, setwindowtitle
 else:
     from .plotbrowser_ui import Ui_PlotBrowser  # for when plotbrowser is imported
+    from .redraw import RedrawScheduler
+    from . import decimate
+    from .watcher import FigureWatcher
+    from .models import ArtistListModel
+    from .colors import colorname, commonname
+    from .styles import linestyletable, markertable
+    from . import engine
+    from . import history
+    from .editlog import EditLog
+    from . import session
+    from . import instrument
+    from . import drawprofile
+    from .expressions import timed, usernamespace, ExpressionError
+    from .snapshot import figurestyle, numticks
+    from .rcstyle import changedrcparams, applyrc, writerc
+    from .export import dumpfigure, savefigure, savepickledfigure, exporttasks, runtasks, pyplotfigures, windowtitle, setwindowtitle
+
+
+@instrument.timeslots  # every on_* slot is timed while instrument is enabled
+class PlotBrowser(QtGui.QMainWindow, Ui_PlotBrowser):
+    """Plot browser class
 
+    The figures are read after the window is first shown, see startup(); ready
+    is emitted once the lists are filled and the browser responds to input.
+    """
+    ready = Signal()
 
-class PlotBrowser(QtGui.QMainWindow, Ui_PlotBrowser):
-    """Plot browser class"""
     def __init__(self, parent=None):
         super(PlotBrowser, self).__init__(parent)  # boilerplate
         self.setupUi(self)  # boilerplate
-        # colorconverter
-        self.to_rgb = mpl.colors.ColorConverter().to_rgb
-        cnames = mpl.colors.cnames
-        for k, v in cnames.items():
-            cnames[k] = v.lower()
-            if k.find('grey') >= 0:
-                del cnames[k]
-        self.chexes = {v: k for k, v in cnames.items()}
-        # allows editing of item names
-        self.listwidgetitemflags = QtCore.Qt.ItemIsSelectable | QtCore.Qt.ItemIsEditable | \
-            QtCore.Qt.ItemIsDragEnabled | QtCore.Qt.ItemIsUserCheckable | QtCore.Qt.ItemIsEnabled
+        # redraws are coalesced, slots call self.redraw.schedule(self.fig) instead of drawing directly
+        self.redraw = RedrawScheduler(interval=30, parent=self)
+        # widgets whose signals are blocked by self.populating()
+        self.inputwidgets = [widget for widget in self.centralwidget.findChildren(QtGui.QWidget)
+                             if isinstance(widget, (QtGui.QAbstractSpinBox, QtGui.QComboBox, QtGui.QCheckBox, QtGui.QAbstractItemView))]
+        self.populatedraws = 0  # redraws requested by the last selection, see populating()
+        self.populatedepth = 0
+        # edits go through self.edit, which records them for undo and redo, and as matplotlib calls in self.editlog
+        self.history = history.History()
+        self.editlog = EditLog()
+        self.editedfigures = weakref.WeakKeyDictionary()  # figures changed by edits, saved in sessions -> None
+        for (name, shortcut, slot) in (('Undo', QtGui.QKeySequence.Undo, self.on_pushButton_undo_clicked),
+                                       ('Redo', QtGui.QKeySequence.Redo, self.on_pushButton_redo_clicked)):
+            action = QtGui.QAction(name, self)
+            action.setShortcut(shortcut)
+            action.triggered.connect(slot)
+            self.addAction(action)
+        # list views of figures, axes and lines, editing a row changes the window title, axes title, or line label
+        self.figuremodel = ArtistListModel(windowtitle, setwindowtitle, self)
+        self.axesmodel = ArtistListModel(lambda ax: ax.get_title(),
+                                         lambda ax, text: ax.set_title(text, {'fontsize': ax.title.get_size()}), self)
+        self.linemodel = ArtistListModel(lambda line: line.get_label(), lambda line, text: line.set_label(text), self)
+        self.listView_figures.setModel(self.figuremodel)
+        self.listView_axes.setModel(self.axesmodel)
+        self.listView_lines.setModel(self.linemodel)
+        self.axesmodel.artistRenamed.connect(lambda ax: self.redraw.schedule(ax.figure))
+        self.linemodel.artistRenamed.connect(lambda line: self.redraw.schedule(line.figure))
+        self.lineEdit_linefilter.textChanged.connect(self.linemodel.setfilter)
         # figures
         self.selecteddirectory = ''
+        self.copiedstyle = None  # snapshot from plotbrowser.snapshot.figurestyle, set by copy style
+        # while checkBox_applytorcparams is checked, edits of the selected figure also go into rcParams
+        self.rcprevious = {}  # rcParam -> value before plotbrowser changed it
+        self.rctimer = QtCore.QTimer(self)
+        self.rctimer.setSingleShot(True)
+        self.rctimer.timeout.connect(self.updatercparams)
+        self.redraw.figureChanged.connect(self.rcfigurechanged)
+        self.checkBox_instrument.setChecked(instrument.enabled)
+        self.timingsdialog = None
+        self.profiledialog = None
+        # figures created or closed outside the GUI show up without clicking refresh list, polled from startup()
+        self.figurewatcher = FigureWatcher(interval=500, parent=self)
+        self.figurewatcher.figuresChanged.connect(self.refresh_listView_figures)
+        self.exportthreads = []  # ExportThreads still running, kept so they aren't garbage collected
         self.lineEdit_figwidth.editingFinished.connect(self.lineEdit_figdims_editingFinished)
         self.lineEdit_figheight.editingFinished.connect(self.lineEdit_figdims_editingFinished)
         # axes
@@ -57,98 +139,185 @@ class PlotBrowser(QtGui.QMainWindow, Ui_PlotBrowser):
         self.lineEdit_ymin.editingFinished.connect(self.lineEdit_limits_editingFinished)
         self.lineEdit_ymax.editingFinished.connect(self.lineEdit_limits_editingFinished)
         # lines
-        self.linestyles = list(mpl.lines.Line2D.lineStyles.items())
-        self.comboBox_linestyle.addItems([repr(item[0]) + " (" + item[1] + ")" for item in self.linestyles])
-        self.comboBox_gridstyle.addItems([repr(item[0]) + " (" + item[1] + ")" for item in self.linestyles])
-        self.markers = list(mpl.markers.MarkerStyle.markers.items())
-        self.comboBox_markerstyle.addItems([repr(item[0]) + " (" + item[1] + ")" for item in self.markers])
+        self.linestyles = linestyletable()  # styles not in the tables, e.g. dash tuples, show as 'custom'
+        self.comboBox_linestyle.addItems(self.linestyles.labels())
+        self.comboBox_gridstyle.addItems(self.linestyles.labels())
+        self.markers = markertable()
+        self.comboBox_markerstyle.addItems(self.markers.labels())
         # fonts
         self.selectedfont = QtGui.QFont("Arial")
-        self.on_pushButton_refreshlist_clicked()
+        # tabs are filled lazily from cached per-axes snapshots when they become visible
+        self.staletabs = set()
+        self.readfunctions = {'axes': read_axestab, 'spinesticks': read_spinestickstab, 'grid': read_gridsection}
+        self.axessnapshots = weakref.WeakKeyDictionary()  # axes -> {section: snapshot}
+        self.watchedfigures = weakref.WeakKeyDictionary()  # figure -> draw_event connection id
+        self.redraw.figureChanged.connect(self.invalidate_axessnapshots)
+        self.tabWidget.currentChanged.connect(self.populate_currenttab)
+        # reading the figures waits for the first paint, so the window shows up right away with many figures open
+        self.started = False
+        self.centralwidget.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if obj is self.centralwidget and event.type() == QtCore.QEvent.Paint and not self.started:
+            QtCore.QTimer.singleShot(0, self.startup)
+        return super(PlotBrowser, self).eventFilter(obj, event)
+
+    def showEvent(self, event):
+        super(PlotBrowser, self).showEvent(event)
+        QtCore.QTimer.singleShot(500, self.startup)  # in case the window is shown without being painted, e.g. minimized
+
+    def startup(self):
+        """Fills the lists and selects the last figure, then starts watching pyplot's figure list
+
+        Nothing is redrawn: refreshing the lists fills the tabs without requesting redraws.
+        """
+        if self.started:
+            return
+        self.started = True
+        self.centralwidget.removeEventFilter(self)
+        self.refresh_listView_figures()
+        self.figurewatcher.start()
+        self.ready.emit()
 
     def colorconverter(self, color):
         """Returns named color if found, or hexcolor, given input named color, hexcolor, or color letter"""
+        return colorname(color)
+
+    @contextlib.contextmanager
+    def populating(self):
+        """Blocks signals of the input widgets while they are filled from the selected artists
+
+        Otherwise setValue/setCurrentIndex fire the valueChanged/currentIndexChanged
+        slots, which write the value back and redraw. The selection slots run
+        entirely inside a block, so self.populatedraws is the number of redraws
+        requested by the last selection, which should stay 0.
+        """
+        blocked = [widget.blockSignals(True) for widget in self.inputwidgets]
+        requested = self.redraw.requested
+        self.populatedepth += 1
         try:
-            try:
-                color = color.replace('grey', 'gray')
-            except AttributeError:
-                pass
-            hexcolor = mpl.colors.rgb2hex(self.to_rgb(color))
-            try:
-                return self.chexes[hexcolor]
-            except KeyError:
-                return hexcolor
-        except ValueError:
-            return None
+            yield
+        finally:
+            for (widget, wasblocked) in zip(self.inputwidgets, blocked):
+                widget.blockSignals(wasblocked)
+            self.populatedepth -= 1
+            if self.populatedepth == 0:  # blocks nested in a selection slot count toward that selection
+                self.populatedraws = self.redraw.requested - requested
 
     def setcurrenttext(self, widget, text):
         """Convenience method"""
         widget.setCurrentIndex(widget.findText(text))
 
+    def edit(self, function, targets, *args, **kwargs):
+        """Calls a function of plotbrowser.engine and records it in the undo history and edit log, returns the changed artists"""
+        targets = list(targets)
+        command = self.history.push(history.edit(function, targets, *args, **kwargs))
+        self.editlog.record(function, targets, *args, tag=command, **kwargs)
+        self.editedfigures.update((fig, None) for fig in command.figures())
+        return command.artists
+
+    def selectionlost(self, view):
+        return not view.currentIndex().isValid() or not view.selectionModel().isSelected(view.currentIndex())
+
+    def selectlastrow(self, view):
+        view.setCurrentIndex(view.model().index(view.model().rowCount() - 1))
+
+    def selectedartists(self, view):
+        """Returns the artists of the selected rows of view, in row order"""
+        rows = sorted(index.row() for index in view.selectionModel().selectedRows())
+        return [view.model().artist(view.model().index(row)) for row in rows]
+
+    def targetaxes(self):
+        """Returns the axes that axes edits apply to: the selected axes, all axes of the figure, or of all figures"""
+        scope = self.comboBox_axesscope.currentText()
+        if scope == 'axes in figure':
+            return list(self.fig.axes)
+        elif scope == 'all figures':
+            return [ax for fig in pyplotfigures() for ax in fig.axes]
+        return self.selectedartists(self.listView_axes) or [self.ax]
+
+    def targetlines(self):
+        """Returns the lines that line edits apply to: the selected lines, or all lines of the axes, figure, or all figures"""
+        scope = self.comboBox_linescope.currentText()
+        if scope == 'axes':
+            return list(self.ax.lines)
+        elif scope == 'figure':
+            return [line for ax in self.fig.axes for line in ax.lines]
+        elif scope == 'all figures':
+            return [line for fig in pyplotfigures() for ax in fig.axes for line in ax.lines]
+        return self.selectedartists(self.listView_lines) or [self.line]
+
     @Slot()
     def on_pushButton_refreshlist_clicked(self):
-        """Refreshes figurelist, clicks last item in figurelist"""
-        self.listWidget_figures.clear()
-        current_row = -1
-        for i in plt.get_fignums():
-            self.listWidget_figures.addItem(plt.figure(i).canvas.get_window_title())
-            current_row = self.listWidget_figures.count() - 1
-            self.listWidget_figures.item(current_row).setData(-1, plt.figure(i))
-            self.listWidget_figures.item(current_row).setFlags(self.listwidgetitemflags)
-        if current_row != -1:
-            self.listWidget_figures.setCurrentRow(current_row)
-            self.on_listWidget_figures_itemClicked(self.listWidget_figures.selectedItems()[-1])
-
-    def refresh_listWidget_axes(self):
-        """Refreshes axeslist, clicks last item in axeslist"""
-        self.listWidget_axes.clear()
-        self.listWidget_lines.clear()
-        current_row = -1
-        for ax in self.fig.axes:
-            self.listWidget_axes.addItem(ax.get_title())
-            current_row = self.listWidget_axes.count() - 1
-            self.listWidget_axes.item(current_row).setData(-1, ax)
-            self.listWidget_axes.item(current_row).setFlags(self.listwidgetitemflags)  # changing flags also triggers name changed but I guess that's ok
-        if current_row != -1:
-            self.listWidget_axes.setCurrentRow(current_row)
-            self.on_listWidget_axes_itemClicked(self.listWidget_axes.selectedItems()[-1])
-
-    def refresh_listWidget_lines(self):
-        """Refreshes lineslist, clicks last item in lineslist"""
-        self.listWidget_lines.clear()
-        current_row = -1
-        for line in self.ax.lines:
-            self.listWidget_lines.addItem(line.get_label())
-            current_row = self.listWidget_lines.count() - 1
-            self.listWidget_lines.item(current_row).setData(-1, line)
-            self.listWidget_lines.item(current_row).setFlags(self.listwidgetitemflags)
-        if current_row != -1:
-            self.listWidget_lines.setCurrentRow(current_row)
-            self.on_listWidget_lines_itemClicked(self.listWidget_lines.selectedItems()[-1])
+        self.refresh_listView_figures()
+
+    def refresh_listView_figures(self, selectlast=False):
+        """Updates figurelist, clicks last item in figurelist if the selected figure is gone or selectlast"""
+        self.figurewatcher.acknowledge()
+        figures = pyplotfigures()
+        for fig in self.figuremodel.artists:
+            if fig not in figures:  # closed, here or from the shell
+                self.redraw.discard(fig)
+                self.history.discard(fig)
+        with self.populating():
+            self.figuremodel.setartists(figures)
+            if self.figuremodel.rowCount() == 0:
+                return
+            if selectlast or self.selectionlost(self.listView_figures):
+                self.selectlastrow(self.listView_figures)
+                self.fig = self.figuremodel.artist(self.listView_figures.currentIndex())
+                self.populate_figurestab()
+            else:
+                self.refresh_listView_axes()
+
+    def refresh_listView_axes(self, selectlast=False):
+        """Updates axeslist, clicks last item in axeslist if the selected axes is gone or selectlast"""
+        with self.populating():
+            self.axesmodel.setartists(self.fig.axes)
+            if self.axesmodel.rowCount() == 0:
+                self.linemodel.setartists([])
+                return
+            if selectlast or self.selectionlost(self.listView_axes):
+                self.selectlastrow(self.listView_axes)
+                self.on_listView_axes_clicked(self.listView_axes.currentIndex())
+            else:  # same axes, its tabs are left alone so text being typed isn't overwritten, see repopulatetabs()
+                self.refresh_listView_lines()
+
+    def refresh_listView_lines(self, selectlast=False):
+        """Updates lineslist, clicks last item in lineslist if the selected line is gone or selectlast"""
+        with self.populating():
+            self.linemodel.setartists(self.ax.lines)
+            if self.linemodel.rowCount() != 0 and (selectlast or self.selectionlost(self.listView_lines)):
+                self.selectlastrow(self.listView_lines)
+                self.on_listView_lines_clicked(self.listView_lines.currentIndex())
 
     # start methods for figures tab
-    @Slot(QtGui.QListWidgetItem)
-    def on_listWidget_figures_itemClicked(self, item):
-        """Updates figures tab, calls refresh_listWidget_axes"""
-        self.fig = item.data(-1)
-        self.fig.canvas.draw()
-        self.lineEdit_figurefacecolor.setText(self.colorconverter(self.fig.get_facecolor()))
-        if self.fig.patch.get_alpha() is None:
-            self.doubleSpinBox_figurefacealpha.setValue(1.0)
-        else:
-            self.doubleSpinBox_figurefacealpha.setValue(self.fig.patch.get_alpha())
-        self.lineEdit_figwidth.setText(str(self.fig.get_size_inches()[0]))
-        self.lineEdit_figheight.setText(str(self.fig.get_size_inches()[1]))
-        self.refresh_listWidget_axes()
-
-    @Slot(QtGui.QListWidgetItem)
-    def on_listWidget_figures_itemChanged(self, item):
-        item.data(-1).canvas.set_window_title(item.text())
+    @Slot(QtCore.QModelIndex)
+    def on_listView_figures_clicked(self, index):
+        """Updates figures tab, calls refresh_listView_axes"""
+        with self.populating():
+            self.fig = self.figuremodel.artist(index)
+            self.populate_figurestab()
+
+    def populate_figurestab(self):
+        """Fills the figures tab from self.fig and refreshes the axes list, nothing is redrawn since nothing in the figure changed"""
+        with self.populating():
+            self.watchfigure(self.fig)
+            self.lineEdit_figurefacecolor.setText(self.colorconverter(self.fig.get_facecolor()))
+            if self.fig.patch.get_alpha() is None:
+                self.doubleSpinBox_figurefacealpha.setValue(1.0)
+            else:
+                self.doubleSpinBox_figurefacealpha.setValue(self.fig.patch.get_alpha())
+            self.lineEdit_figwidth.setText(str(self.fig.get_size_inches()[0]))
+            self.lineEdit_figheight.setText(str(self.fig.get_size_inches()[1]))
+            self.checkBox_decimate.setChecked(decimate.isenabled(self.fig))
+            self.showreductionratio()
+            self.refresh_listView_axes()
 
     @Slot()
     def on_pushButton_makefigure_clicked(self):
         plt.figure()
-        self.on_pushButton_refreshlist_clicked()
+        self.refresh_listView_figures(selectlast=True)
 
     @Slot()
     def on_pushButton_bringtofront_clicked(self):
@@ -157,74 +326,311 @@ class PlotBrowser(QtGui.QMainWindow, Ui_PlotBrowser):
 
     @Slot()
     def on_pushButton_closefigure_clicked(self):
-        self.fig.canvas.manager.window.close()  # frees up memory
+        self.fig.canvas.manager.window.close()  # frees up memory, refreshing the list discards its redraws and edits
         self.on_pushButton_refreshlist_clicked()
 
     @Slot()
     def on_lineEdit_figurefacecolor_editingFinished(self):
         color = self.colorconverter(self.lineEdit_figurefacecolor.text())
         if color is not None:
-            self.fig.set_facecolor(color)
-            self.fig.canvas.draw()
+            self.redraw.schedule_artists(self.edit(engine.setfacecolor, [self.fig], color))
         self.lineEdit_figurefacecolor.setText(self.colorconverter(self.fig.get_facecolor()))
 
     @Slot(float)
     def on_doubleSpinBox_figurefacealpha_valueChanged(self, value):
-        self.fig.patch.set_alpha(value)
-        self.fig.canvas.draw()
+        self.redraw.schedule_artists(self.edit(engine.setfacealpha, [self.fig], value))
 
     def lineEdit_figdims_editingFinished(self):
         # self.fig.canvas.manager.window.geometry().getCoords()[0]
         self.fig.set_size_inches(float(self.lineEdit_figwidth.text()), float(self.lineEdit_figheight.text()), forward=True)
 
+    @Slot(bool)
+    def on_checkBox_decimate_clicked(self, value):
+        """Toggles min/max-per-pixel decimation of the long lines in the figure, exports still use the full data"""
+        if value:
+            decimate.enable(self.fig)
+        else:
+            decimate.disable(self.fig)
+        self.showreductionratio()
+        self.redraw.schedule(self.fig)
+
+    def showreductionratio(self):
+        if decimate.isenabled(self.fig):
+            self.label_decimation.setText('{:.0f} x fewer points drawn'.format(decimate.reductionratio(self.fig)))
+        else:
+            self.label_decimation.setText('')
+
+    @Slot()
+    def on_pushButton_copystyle_clicked(self):
+        self.copiedstyle = figurestyle(self.fig)
+
+    @Slot()
+    def on_pushButton_pastestyle_clicked(self):
+        """Applies the copied style to the selected figures, one redraw each"""
+        if self.copiedstyle is None:
+            return
+        command = self.history.push(history.restyle(self.copiedstyle, self.selectedartists(self.listView_figures) or [self.fig]))
+        self.editedfigures.update((fig, None) for fig in command.figures())
+        self.redraw.schedule_artists(command.artists)
+        self.populate_figurestab()
+        self.repopulatetabs()
+
+    def selectionrcparams(self):
+        """Returns the rcParams for the edits of the selected figure and axes, see plotbrowser.rcstyle"""
+        axes = self.fig.axes.index(self.ax) if getattr(self, 'ax', None) in self.fig.axes else 0
+        return changedrcparams(figurestyle(self.fig), axes)
+
+    @Slot(bool)
+    def on_checkBox_applytorcparams_clicked(self, value):
+        """Makes the edits of the selected figure the defaults for new figures, unchecking restores the old defaults"""
+        if value:
+            self.updatercparams()
+        else:
+            applyrc(self.rcprevious)
+            self.rcprevious = {}
+
+    def rcfigurechanged(self, fig):
+        if self.checkBox_applytorcparams.isChecked() and fig is self.fig:
+            self.rctimer.start(0)  # once per batch of edits
+
+    def updatercparams(self):
+        params = self.selectionrcparams()
+        for key in list(self.rcprevious):
+            if key not in params:  # edit was undone
+                mpl.rcParams[key] = self.rcprevious.pop(key)
+        for (key, value) in applyrc(params).items():
+            self.rcprevious.setdefault(key, value)
+
+    @Slot()
+    def on_pushButton_saverc_clicked(self):
+        """Writes the rcParams for the edits of the selected figure to a matplotlibrc or style sheet file"""
+        filename = QtGui.QFileDialog.getSaveFileName(None, 'Choose matplotlibrc or style sheet to save to:',
+                                                     os.path.join(self.selecteddirectory, 'plotbrowser.mplstyle'))[0]
+        if len(filename) != 0:
+            self.selecteddirectory = QtCore.QFileInfo(filename).absolutePath()
+            writerc(self.selectionrcparams(), filename)
+
+    @Slot()
+    def on_pushButton_undo_clicked(self):
+        command = self.history.undo()
+        self.editlog.undo(command)
+        self.historychanged(command)
+
+    @Slot()
+    def on_pushButton_redo_clicked(self):
+        command = self.history.redo()
+        self.editlog.redo(command)
+        self.historychanged(command)
+
+    def historychanged(self, command):
+        """Redraws what an undone or redone command changed and refreshes the lists and tabs"""
+        if command is None:
+            return
+        self.redraw.schedule_artists(command.artists, partial=command.partial)
+        self.pushButton_undo.setToolTip(self.history.undotext())
+        self.pushButton_redo.setToolTip(self.history.redotext())
+        self.refresh_listView_figures()
+        self.repopulatetabs()
+
+    @Slot()
+    def on_pushButton_savescript_clicked(self):
+        """Writes the edits made so far as a script of matplotlib calls, see plotbrowser.editlog"""
+        filename = QtGui.QFileDialog.getSaveFileName(None, 'Choose script to save to:',
+                                                     os.path.join(self.selecteddirectory, 'plotbrowser_edits.py'))[0]
+        if len(filename) != 0:
+            self.selecteddirectory = QtCore.QFileInfo(filename).absolutePath()
+            self.editlog.write(filename)
+
+    @Slot()
+    def on_pushButton_savesession_clicked(self):
+        """Saves the styling of the edited figures (all figures if none was edited) without their data"""
+        filename = QtGui.QFileDialog.getSaveFileName(None, 'Choose session file to save to:',
+                                                     os.path.join(self.selecteddirectory, 'plotbrowser_session.json'))[0]
+        if len(filename) != 0:
+            self.selecteddirectory = QtCore.QFileInfo(filename).absolutePath()
+            session.save(filename, [fig for fig in pyplotfigures() if fig in self.editedfigures] or pyplotfigures())
+
+    @Slot()
+    def on_pushButton_loadsession_clicked(self):
+        """Re-applies a saved session onto the open figures with the same window titles or numbers"""
+        filename = QtGui.QFileDialog.getOpenFileName(None, 'Choose session file to load:', self.selecteddirectory)[0]
+        if len(filename) != 0:
+            self.selecteddirectory = QtCore.QFileInfo(filename).absolutePath()
+            for fig in session.restore(session.load(filename), pyplotfigures()):
+                self.editedfigures[fig] = None
+                self.redraw.schedule(fig)
+            self.refresh_listView_figures()
+            self.repopulatetabs()
+
+    @Slot(bool)
+    def on_checkBox_instrument_clicked(self, value):
+        """Starts or stops timing slots and draws, see plotbrowser.instrument"""
+        if value:
+            instrument.enable()
+        else:
+            instrument.disable()
+
+    @Slot()
+    def on_pushButton_timings_clicked(self):
+        if self.timingsdialog is None:
+            self.timingsdialog = TimingsDialog(self)
+        self.timingsdialog.refresh()
+        self.timingsdialog.show()
+        self.timingsdialog.raise_()
+
+    @Slot()
+    def on_pushButton_profiledraw_clicked(self):
+        """Draws the selected figure once timing every artist, and lists the slowest"""
+        self.redraw.discard(self.fig)  # draws without a blit cache, which would skip its animated artists
+        timings = drawprofile.profile(self.fig)
+        if self.profiledialog is None:
+            self.profiledialog = ProfileDialog(self)
+            self.profiledialog.artistActivated.connect(self.showartist)
+        self.profiledialog.settimings(self.fig, timings)
+        self.profiledialog.show()
+        self.profiledialog.raise_()
+
+    def showartist(self, fig, ax, line, tab):
+        """Selects fig, ax and line in the lists, where ax and line may be None, and shows tab"""
+        index = self.figuremodel.indexof(fig)
+        if not index.isValid():
+            return
+        if fig is not getattr(self, 'fig', None):
+            self.listView_figures.setCurrentIndex(index)
+            self.on_listView_figures_clicked(index)
+        index = self.axesmodel.indexof(ax)
+        if ax is not None and index.isValid():
+            self.listView_axes.setCurrentIndex(index)
+            self.on_listView_axes_clicked(index)
+            index = self.linemodel.indexof(line)
+            if line is not None and index.isValid():  # hidden lines are left unselected, e.g. by the line filter
+                self.listView_lines.setCurrentIndex(index)
+                self.on_listView_lines_clicked(index)
+        self.tabWidget.setCurrentWidget(getattr(self, tab))
+
     @Slot()
     def on_pushButton_tightlayout_clicked(self):
         self.fig.tight_layout()
-        self.fig.canvas.draw()
+        self.redraw.schedule(self.fig)
 
     @Slot()
     def on_pushButton_savefigure_clicked(self):
         filename = QtGui.QFileDialog.getSaveFileName(None, 'Choose filename to save to:', self.selecteddirectory)[0]
         if len(filename) != 0:
             self.selecteddirectory = QtCore.QFileInfo(filename).absolutePath()
-            plt.savefig(filename, dpi=self.spinBox_dpi.value())
+            try:
+                data = dumpfigure(self.fig)
+            except Exception:  # unpicklable figure, e.g. with a draggable legend, is saved on the GUI thread
+                savefigure(self.fig, filename, dpi=self.spinBox_dpi.value())
+                return
+            thread = ExportThread(savepickledfigure, (data, filename), {'dpi': self.spinBox_dpi.value()}, parent=self)
+            self.startexport(thread, 'Saving ' + os.path.basename(filename))
 
-    # start methods for axes tab
-    @Slot(QtGui.QListWidgetItem)
-    def on_listWidget_axes_itemClicked(self, item):
-        """Updates axes, grid, and spines/ticks tabs, calls refresh_listWidget_lines"""
-        self.ax = item.data(-1)
-        # updates axes tab
-        if self.ax.xaxis.get_label_position() == 'bottom':
-            self.checkBox_labeltop.setChecked(False)
-        else:
-            self.checkBox_labeltop.setChecked(True)
-        if self.ax.yaxis.get_label_position() == 'left':
-            self.checkBox_labelright.setChecked(False)
-        else:
-            self.checkBox_labelright.setChecked(True)
-        self.lineEdit_xlabel.setText(self.ax.get_xlabel())
-        self.lineEdit_ylabel.setText(self.ax.get_ylabel())
-        self.lineEdit_axisfacecolor.setText(self.colorconverter(self.ax.patch.get_facecolor()))
-        if self.ax.patch.get_alpha() is None:
-            self.doubleSpinBox_axisfacealpha.setValue(1.0)
+    @Slot()
+    def on_pushButton_exportall_clicked(self):
+        """Saves the selected figures, or all figures if at most one is selected, in each format entered"""
+        directory = QtGui.QFileDialog.getExistingDirectory(None, 'Choose directory to export to:', self.selecteddirectory)
+        if len(directory) == 0:
+            return
+        (formats, ok) = QtGui.QInputDialog.getText(self, 'Export all', 'Formats (comma separated):', QtGui.QLineEdit.Normal, 'png, pdf')
+        formats = [fmt.strip(' .') for fmt in formats.split(',') if len(fmt.strip(' .')) != 0]
+        if not ok or len(formats) == 0:
+            return
+        self.selecteddirectory = directory
+        if len(self.listView_figures.selectedIndexes()) > 1:
+            figures = [self.figuremodel.artist(index) for index in self.listView_figures.selectedIndexes()]
         else:
-            self.doubleSpinBox_axisfacealpha.setValue(self.ax.patch.get_alpha())
-        self.setcurrenttext(self.comboBox_xscale, self.ax.get_xscale())
-        self.setcurrenttext(self.comboBox_yscale, self.ax.get_yscale())
-        self.lineEdit_xmin.setText(str(self.ax.get_xlim()[0]))
-        self.lineEdit_xmax.setText(str(self.ax.get_xlim()[1]))
-        self.lineEdit_ymin.setText(str(self.ax.get_ylim()[0]))
-        self.lineEdit_ymax.setText(str(self.ax.get_ylim()[1]))
+            figures = pyplotfigures()
+        try:
+            tasks = exporttasks(figures, formats, [self.spinBox_dpi.value()], directory)
+        except Exception as e:
+            QtGui.QMessageBox.warning(self, 'Export all', str(e))
+            return
+        thread = ExportThread(runtasks, (tasks,), reportprogress=True, parent=self)
+        self.startexport(thread, 'Exporting {} figures to {}'.format(len(tasks), directory), len(tasks))
+
+    def startexport(self, thread, text, maximum=0):
+        """Starts an ExportThread behind a non-modal progress dialog, maximum=0 shows a busy indicator"""
+        progress = QtGui.QProgressDialog(text, 'Cancel', 0, maximum, self)
+        progress.setWindowModality(QtCore.Qt.NonModal)
+        progress.canceled.connect(thread.cancel)
+        thread.progressed.connect(lambda done, total: progress.setValue(done))
+        thread.failed.connect(lambda message: QtGui.QMessageBox.warning(self, 'Export', message))
+        thread.finished.connect(progress.reset)
+        thread.finished.connect(lambda: self.exportthreads.remove(thread))
+        self.exportthreads.append(thread)
+        thread.start()
+        progress.show()
+
+    # start methods for axes tab
+    @Slot(QtCore.QModelIndex)
+    def on_listView_axes_clicked(self, index):
+        """Marks axes, grid, and spines/ticks tabs stale, fills the visible one, calls refresh_listView_lines"""
+        with self.populating():
+            self.ax = self.axesmodel.artist(index)
+            self.repopulatetabs()
+            self.refresh_listView_lines()
+
+    def repopulatetabs(self):
+        """Marks axes, grid, and spines/ticks tabs stale and fills the visible one, e.g. after undo changed the axes"""
+        self.staletabs = set([self.axestab, self.spinestickstab, self.linestab])
+        self.populate_currenttab()
+
+    @Slot(int)
+    def populate_currenttab(self, index=None):
+        """Fills the widgets of the visible tab if the selected axes changed since they were last filled"""
+        tab = self.tabWidget.currentWidget()
+        if tab not in self.staletabs or not hasattr(self, 'ax'):
+            return
+        self.staletabs.discard(tab)
+        with self.populating():
+            if tab is self.axestab:
+                self.populate_axestab()
+            elif tab is self.spinestickstab:
+                self.populate_spinestickstab()
+            elif tab is self.linestab:
+                self.populate_gridsection()
+
+    def axessnapshot(self, section):
+        """Returns properties of the selected axes read by self.readfunctions[section], cached until the axes changes"""
+        snapshots = self.axessnapshots.setdefault(self.ax, {})
+        if section not in snapshots:
+            snapshots[section] = self.readfunctions[section](self.ax)
+        return snapshots[section]
+
+    def invalidate_axessnapshots(self, fig):
+        """Forgets snapshots of the axes in fig, connected to redraw requests and draw events"""
+        for ax in fig.axes:
+            self.axessnapshots.pop(ax, None)
+
+    def watchfigure(self, fig):
+        """Invalidates snapshots whenever fig is drawn, to catch changes made from the shell"""
+        if fig not in self.watchedfigures:
+            self.watchedfigures[fig] = fig.canvas.mpl_connect('draw_event', lambda event: self.invalidate_axessnapshots(fig))
+
+    def populate_axestab(self):
+        snapshot = self.axessnapshot('axes')
+        self.checkBox_labeltop.setChecked(snapshot['labeltop'])
+        self.checkBox_labelright.setChecked(snapshot['labelright'])
+        self.lineEdit_xlabel.setText(snapshot['xlabel'])
+        self.lineEdit_ylabel.setText(snapshot['ylabel'])
+        self.lineEdit_axisfacecolor.setText(self.colorconverter(snapshot['facecolor']))
+        self.doubleSpinBox_axisfacealpha.setValue(snapshot['facealpha'])
+        self.setcurrenttext(self.comboBox_xscale, snapshot['xscale'])
+        self.setcurrenttext(self.comboBox_yscale, snapshot['yscale'])
+        self.lineEdit_xmin.setText(str(snapshot['xlim'][0]))
+        self.lineEdit_xmax.setText(str(snapshot['xlim'][1]))
+        self.lineEdit_ymin.setText(str(snapshot['ylim'][0]))
+        self.lineEdit_ymax.setText(str(snapshot['ylim'][1]))
         self.lineEdit_xmin.setCursorPosition(0)
         self.lineEdit_xmax.setCursorPosition(0)
         self.lineEdit_ymin.setCursorPosition(0)
         self.lineEdit_ymax.setCursorPosition(0)
-        # updates spines/ticks tab
-        for (labelon, tickon, widget) in ((self.ax.xaxis.majorTicks[0].label1On, self.ax.xaxis.majorTicks[0].tick1On, self.comboBox_ticksdrawbottom),
-                                          (self.ax.xaxis.majorTicks[0].label2On, self.ax.xaxis.majorTicks[0].tick2On, self.comboBox_ticksdrawtop),
-                                          (self.ax.yaxis.majorTicks[0].label1On, self.ax.yaxis.majorTicks[0].tick1On, self.comboBox_ticksdrawleft),
-                                          (self.ax.yaxis.majorTicks[0].label2On, self.ax.yaxis.majorTicks[0].tick2On, self.comboBox_ticksdrawright)):
+
+    def populate_spinestickstab(self):
+        snapshot = self.axessnapshot('spinesticks')
+        for ((labelon, tickon), widget) in zip(snapshot['tickdraw'], (self.comboBox_ticksdrawbottom, self.comboBox_ticksdrawtop,
+                                                                      self.comboBox_ticksdrawleft, self.comboBox_ticksdrawright)):
             if labelon:
                 if tickon:
                     self.setcurrenttext(widget, 'both')
@@ -235,367 +641,217 @@ class PlotBrowser(QtGui.QMainWindow, Ui_PlotBrowser):
                     self.setcurrenttext(widget, 'ticks only')
                 else:
                     self.setcurrenttext(widget, 'none')
-        if hasattr(self.ax.xaxis.get_major_locator(), 'numticks'):  # LogLocator and others
-            self.spinBox_numxmajorticks.setValue(self.ax.xaxis.get_major_locator().numticks)
-        elif hasattr(self.ax.xaxis.get_major_locator(), '_nbins'):  # MaxNLocator, AutoLocator
-            self.spinBox_numxmajorticks.setValue(self.ax.xaxis.get_major_locator()._nbins)
-        if hasattr(self.ax.yaxis.get_major_locator(), 'numticks'):
-            self.spinBox_numymajorticks.setValue(self.ax.yaxis.get_major_locator().numticks)
-        elif hasattr(self.ax.yaxis.get_major_locator(), '_nbins'):
-            self.spinBox_numymajorticks.setValue(self.ax.yaxis.get_major_locator()._nbins)
-        if isinstance(self.ax.xaxis.get_minor_locator(), mpl.ticker.LogLocator) and self.ax.xaxis.get_minor_locator()._subs is not None:
-            self.spinBox_numxminorticks.setValue(len(self.ax.xaxis.get_minor_locator()._subs))  # LogLocator
-        elif hasattr(self.ax.xaxis.get_major_locator(), 'ndivs'):  # AutoMinorLocator
-            self.spinBox_numxminorticks.setValue(self.ax.xaxis.get_minor_locator().ndivs - 1)
-        elif isinstance(self.ax.xaxis.get_minor_locator(), mpl.ticker.NullLocator):  # NullLocator
-            self.spinBox_numxminorticks.setValue(0)
-        if isinstance(self.ax.yaxis.get_minor_locator(), mpl.ticker.LogLocator) and self.ax.yaxis.get_minor_locator()._subs is not None:
-            self.spinBox_numyminorticks.setValue(len(self.ax.yaxis.get_minor_locator()._subs))
-        elif hasattr(self.ax.yaxis.get_major_locator(), 'ndivs'):
-            self.spinBox_numyminorticks.setValue(self.ax.yaxis.get_minor_locator().ndivs - 1)
-        elif isinstance(self.ax.yaxis.get_minor_locator(), mpl.ticker.NullLocator):
-            self.spinBox_numyminorticks.setValue(0)
-        self.checkBox_xminorlabels.setChecked(not isinstance(self.ax.xaxis.get_minor_formatter(), mpl.ticker.NullFormatter))
-        self.checkBox_yminorlabels.setChecked(not isinstance(self.ax.yaxis.get_minor_formatter(), mpl.ticker.NullFormatter))
-        self.setcurrenttext(self.comboBox_ticksdirection, self.ax.xaxis.majorTicks[0]._tickdir)
-        self.doubleSpinBox_ticksmajorlength.setValue(self.ax.xaxis.majorTicks[0].tick1line.get_markersize())
-        self.doubleSpinBox_ticksmajorwidth.setValue(self.ax.xaxis.majorTicks[0].tick1line.get_markeredgewidth())
-        self.doubleSpinBox_ticksminorlength.setValue(self.ax.xaxis.minorTicks[0].tick1line.get_markersize())
-        self.doubleSpinBox_ticksminorwidth.setValue(self.ax.xaxis.minorTicks[0].tick1line.get_markeredgewidth())
+        for (key, widget) in (('numxmajorticks', self.spinBox_numxmajorticks), ('numymajorticks', self.spinBox_numymajorticks),
+                              ('numxminorticks', self.spinBox_numxminorticks), ('numyminorticks', self.spinBox_numyminorticks)):
+            if snapshot[key] is not None:
+                widget.setValue(snapshot[key])
+        self.checkBox_xminorlabels.setChecked(snapshot['xminorlabels'])
+        self.checkBox_yminorlabels.setChecked(snapshot['yminorlabels'])
+        self.setcurrenttext(self.comboBox_ticksdirection, snapshot['tickdirection'])
+        self.doubleSpinBox_ticksmajorlength.setValue(snapshot['majorlength'])
+        self.doubleSpinBox_ticksmajorwidth.setValue(snapshot['majorwidth'])
+        self.doubleSpinBox_ticksminorlength.setValue(snapshot['minorlength'])
+        self.doubleSpinBox_ticksminorwidth.setValue(snapshot['minorwidth'])
         for (spineloc, spinewidget) in (('bottom', self.comboBox_bottomspine),
                                         ('top', self.comboBox_topspine),
                                         ('left', self.comboBox_leftspine),
                                         ('right', self.comboBox_rightspine)):
-            if not self.ax.spines[spineloc].get_visible():
-                spinetext = 'off'
-            elif isinstance(self.ax.spines[spineloc].get_position(), str):
-                spinetext = self.ax.spines[spineloc].get_position()
-            else:
-                spinetext = self.ax.spines[spineloc].get_position()[0]
-            self.setcurrenttext(spinewidget, spinetext)
-        self.doubleSpinBox_spinewidth.setValue(self.ax.spines['bottom'].get_linewidth())
-        # updates grid section in lines tab
-        self.checkBox_xgrid.setChecked(self.ax.xaxis.majorTicks[0].gridOn)
-        self.checkBox_ygrid.setChecked(self.ax.yaxis.majorTicks[0].gridOn)
-        index = [i[0] for i in self.linestyles].index(self.ax.xaxis.majorTicks[0].gridline.get_linestyle())
-        self.comboBox_gridstyle.setCurrentIndex(index)
-        self.doubleSpinBox_gridwidth.setValue(self.ax.xaxis.majorTicks[0].gridline.get_linewidth())
-        self.lineEdit_gridcolor.setText(self.colorconverter(self.ax.xaxis.majorTicks[0].gridline.get_color()))
-        self.refresh_listWidget_lines()
-
-    @Slot(QtGui.QListWidgetItem)
-    def on_listWidget_axes_itemChanged(self, item):
-        item.data(-1).set_title(item.text(), {'fontsize': item.data(-1).title.get_size()})
-        self.fig.canvas.draw()
+            self.setcurrenttext(spinewidget, snapshot['spines'][spineloc])
+        self.doubleSpinBox_spinewidth.setValue(snapshot['spinewidth'])
+
+    def populate_gridsection(self):
+        """Updates grid section in lines tab"""
+        snapshot = self.axessnapshot('grid')
+        self.checkBox_xgrid.setChecked(snapshot['xgrid'])
+        self.checkBox_ygrid.setChecked(snapshot['ygrid'])
+        self.comboBox_gridstyle.setCurrentIndex(self.linestyles.indexof(snapshot['gridstyle']))
+        self.doubleSpinBox_gridwidth.setValue(snapshot['gridwidth'])
+        self.lineEdit_gridcolor.setText(self.colorconverter(snapshot['gridcolor']))
 
     @Slot()
     def on_pushButton_makesubplot_clicked(self):
-        if self.checkBox_sharex.isChecked() and len(self.listWidget_axes.selectedIndexes()) > 0:
+        if self.checkBox_sharex.isChecked() and self.listView_axes.selectionModel().hasSelection():
             sharex = self.ax
         else:
             sharex = None
-        if self.checkBox_sharey.isChecked() and len(self.listWidget_axes.selectedIndexes()) > 0:
+        if self.checkBox_sharey.isChecked() and self.listView_axes.selectionModel().hasSelection():
             sharey = self.ax
         else:
             sharey = None
-        self.fig.add_subplot(self.spinBox_subplotrows.value(), self.spinBox_subplotcolumns.value(),
-                             self.spinBox_subplotindex.value(), sharex=sharex, sharey=sharey)
-        self.refresh_listWidget_axes()
+        ax = self.fig.add_subplot(self.spinBox_subplotrows.value(), self.spinBox_subplotcolumns.value(),
+                                  self.spinBox_subplotindex.value(), sharex=sharex, sharey=sharey)
+        self.history.push(history.addedaxes(ax))
+        self.refresh_listView_axes(selectlast=True)
 
     @Slot()
     def on_pushButton_makeaxes_clicked(self):
-        if self.checkBox_sharex.isChecked() and len(self.listWidget_axes.selectedIndexes()) > 0:
+        if self.checkBox_sharex.isChecked() and self.listView_axes.selectionModel().hasSelection():
             sharex = self.ax
         else:
             sharex = None
-        if self.checkBox_sharey.isChecked() and len(self.listWidget_axes.selectedIndexes()) > 0:
+        if self.checkBox_sharey.isChecked() and self.listView_axes.selectionModel().hasSelection():
             sharey = self.ax
         else:
             sharey = None
-        self.fig.add_axes([self.doubleSpinBox_axesleft.value(), self.doubleSpinBox_axesbottom.value(),
-                           self.doubleSpinBox_axeswidth.value(), self.doubleSpinBox_axesheight.value()],
-                          sharex=sharex, sharey=sharey)
-        self.refresh_listWidget_axes()
+        ax = self.fig.add_axes([self.doubleSpinBox_axesleft.value(), self.doubleSpinBox_axesbottom.value(),
+                                self.doubleSpinBox_axeswidth.value(), self.doubleSpinBox_axesheight.value()],
+                               sharex=sharex, sharey=sharey)
+        self.history.push(history.addedaxes(ax))
+        self.refresh_listView_axes(selectlast=True)
 
     @Slot()
     def on_pushButton_twinx_clicked(self):
-        plt.twinx(self.ax)
-        self.refresh_listWidget_axes()
+        self.history.push(history.addedaxes(plt.twinx(self.ax)))
+        self.refresh_listView_axes(selectlast=True)
 
     @Slot()
     def on_pushButton_twiny_clicked(self):
-        plt.twiny(self.ax)
-        self.refresh_listWidget_axes()
+        self.history.push(history.addedaxes(plt.twiny(self.ax)))
+        self.refresh_listView_axes(selectlast=True)
 
     @Slot()
     def on_pushButton_deleteaxes_clicked(self):
         if self.ax in self.fig.axes:
-            self.fig.delaxes(self.ax)
-            self.listWidget_axes.takeItem(self.listWidget_axes.selectedIndexes()[-1].row())
-            self.fig.canvas.draw()
-            if self.listWidget_axes.count() > 0:
-                self.on_listWidget_axes_itemClicked(self.listWidget_axes.selectedItems()[-1])
+            self.history.push(history.removeaxes(self.ax))  # undo puts the same axes back
+            self.redraw.schedule(self.fig)
+            self.refresh_listView_axes()
 
     @Slot(bool)
     def on_checkBox_labeltop_clicked(self, value):
-        if value:
-            self.ax.xaxis.set_label_position('top')
-        else:
-            self.ax.xaxis.set_label_position('bottom')
-        self.fig.canvas.draw()
+        self.redraw.schedule_artists(self.edit(engine.setlabelposition, self.targetaxes(), 'x', 'top' if value else 'bottom'))
 
     @Slot(bool)
     def on_checkBox_labelright_clicked(self, value):
-        if value:
-            self.ax.yaxis.set_label_position('right')
-        else:
-            self.ax.yaxis.set_label_position('left')
-        self.fig.canvas.draw()
+        self.redraw.schedule_artists(self.edit(engine.setlabelposition, self.targetaxes(), 'y', 'right' if value else 'left'))
 
     @Slot()
     def on_lineEdit_xlabel_editingFinished(self):
-        self.ax.set_xlabel(self.lineEdit_xlabel.text())
-        self.fig.canvas.draw()
+        self.redraw.schedule_artists(self.edit(engine.setlabel, self.targetaxes(), 'x', self.lineEdit_xlabel.text()))
 
     @Slot()
     def on_lineEdit_ylabel_editingFinished(self):
-        self.ax.set_ylabel(self.lineEdit_ylabel.text())
-        self.fig.canvas.draw()
+        self.redraw.schedule_artists(self.edit(engine.setlabel, self.targetaxes(), 'y', self.lineEdit_ylabel.text()))
 
     @Slot()
     def on_lineEdit_axisfacecolor_editingFinished(self):
         color = self.colorconverter(self.lineEdit_axisfacecolor.text())
         if color is not None:
-            self.ax.patch.set_facecolor(color)
-            self.fig.canvas.draw()
+            self.redraw.schedule_artists(self.edit(engine.setfacecolor, self.targetaxes(), color))
         self.lineEdit_axisfacecolor.setText(self.colorconverter(self.ax.patch.get_facecolor()))
 
     @Slot(float)
     def on_doubleSpinBox_axisfacealpha_valueChanged(self, value):
-        self.ax.patch.set_alpha(value)
-        self.fig.canvas.draw()
+        self.redraw.schedule_artists(self.edit(engine.setfacealpha, self.targetaxes(), value))
 
     @Slot(str)
     def on_comboBox_xscale_currentIndexChanged(self, value):
-        self.ax.set_xscale(value)
-        self.fig.canvas.draw()
-        self.on_listWidget_axes_itemClicked(self.listWidget_axes.selectedItems()[-1])
+        self.redraw.schedule_artists(self.edit(engine.setscale, self.targetaxes(), 'x', value))
+        self.on_listView_axes_clicked(self.listView_axes.currentIndex())
 
     @Slot(str)
     def on_comboBox_yscale_currentIndexChanged(self, value):
-        self.ax.set_yscale(value)
-        self.fig.canvas.draw()
-        self.on_listWidget_axes_itemClicked(self.listWidget_axes.selectedItems()[-1])
+        self.redraw.schedule_artists(self.edit(engine.setscale, self.targetaxes(), 'y', value))
+        self.on_listView_axes_clicked(self.listView_axes.currentIndex())
 
     def lineEdit_limits_editingFinished(self):
-        self.ax.axis([float(self.lineEdit_xmin.text()), float(self.lineEdit_xmax.text()),
-                      float(self.lineEdit_ymin.text()), float(self.lineEdit_ymax.text())])
-        self.fig.canvas.draw()
+        limits = [float(self.lineEdit_xmin.text()), float(self.lineEdit_xmax.text()),
+                  float(self.lineEdit_ymin.text()), float(self.lineEdit_ymax.text())]
+        self.redraw.schedule_artists(self.edit(engine.setlimits, self.targetaxes(), limits))
+        self.showreductionratio()  # decimated lines were recomputed for the new limits
 
     @Slot(str)
     def on_comboBox_autoscale_currentIndexChanged(self, value):
-        self.ax.axis(value)  # get setting using axes.py line 1315, not implemented yet
-        self.fig.canvas.draw()
-        self.on_listWidget_axes_itemClicked(self.listWidget_axes.selectedItems()[-1])
+        self.redraw.schedule_artists(self.edit(engine.setlimits, self.targetaxes(), value))  # get setting using axes.py line 1315, not implemented yet
+        self.on_listView_axes_clicked(self.listView_axes.currentIndex())
 
     # start methods for spines/ticks tab
     @Slot(str)
     def on_comboBox_ticksdrawbottom_currentIndexChanged(self, value):
-        if value == 'ticks only':
-            self.ax.tick_params(which='both', bottom=True, labelbottom=False)
-        elif value == 'tick labels only':
-            self.ax.tick_params(which='both', bottom=False, labelbottom=True)
-        elif value == 'both':
-            self.ax.tick_params(which='both', bottom=True, labelbottom=True)
-        else:
-            self.ax.tick_params(which='both', bottom=False, labelbottom=False)
-        self.fig.canvas.draw()
+        self.redraw.schedule_artists(self.edit(engine.setticksdraw, self.targetaxes(), 'bottom', value))
 
     @Slot(str)
     def on_comboBox_ticksdrawtop_currentIndexChanged(self, value):
-        if value == 'ticks only':
-            self.ax.tick_params(which='both', top=True, labeltop=False)
-        elif value == 'tick labels only':
-            self.ax.tick_params(which='both', top=False, labeltop=True)
-        elif value == 'both':
-            self.ax.tick_params(which='both', top=True, labeltop=True)
-        else:
-            self.ax.tick_params(which='both', top=False, labeltop=False)
-        self.fig.canvas.draw()
+        self.redraw.schedule_artists(self.edit(engine.setticksdraw, self.targetaxes(), 'top', value))
 
     @Slot(str)
     def on_comboBox_ticksdrawleft_currentIndexChanged(self, value):
-        if value == 'ticks only':
-            self.ax.tick_params(which='both', left=True, labelleft=False)
-        elif value == 'tick labels only':
-            self.ax.tick_params(which='both', left=False, labelleft=True)
-        elif value == 'both':
-            self.ax.tick_params(which='both', left=True, labelleft=True)
-        else:
-            self.ax.tick_params(which='both', left=False, labelleft=False)
-        self.fig.canvas.draw()
+        self.redraw.schedule_artists(self.edit(engine.setticksdraw, self.targetaxes(), 'left', value))
 
     @Slot(str)
     def on_comboBox_ticksdrawright_currentIndexChanged(self, value):
-        if value == 'ticks only':
-            self.ax.tick_params(which='both', right=True, labelright=False)
-        elif value == 'tick labels only':
-            self.ax.tick_params(which='both', right=False, labelright=True)
-        elif value == 'both':
-            self.ax.tick_params(which='both', right=True, labelright=True)
-        else:
-            self.ax.tick_params(which='both', right=False, labelright=False)
-        self.fig.canvas.draw()
+        self.redraw.schedule_artists(self.edit(engine.setticksdraw, self.targetaxes(), 'right', value))
 
     @Slot(int)
     def on_spinBox_numxmajorticks_valueChanged(self, value):
-        if hasattr(self.ax.xaxis.get_major_locator(), 'numticks'):
-            self.ax.xaxis.get_major_locator().numticks = value
-        elif hasattr(self.ax.xaxis.get_major_locator(), '_nbins'):
-            self.ax.xaxis.get_major_locator()._nbins = value
-        self.fig.canvas.draw()
+        self.redraw.schedule_artists(self.edit(engine.setnumticks, self.targetaxes(), 'x', 'major', value))
 
     @Slot(int)
     def on_spinBox_numymajorticks_valueChanged(self, value):
-        if hasattr(self.ax.yaxis.get_major_locator(), 'numticks'):
-            self.ax.yaxis.get_major_locator().numticks = value
-        elif hasattr(self.ax.yaxis.get_major_locator(), '_nbins'):
-            self.ax.yaxis.get_major_locator()._nbins = value
-        self.fig.canvas.draw()
+        self.redraw.schedule_artists(self.edit(engine.setnumticks, self.targetaxes(), 'y', 'major', value))
 
     @Slot(int)
     def on_spinBox_numxminorticks_valueChanged(self, value):
-        if isinstance(self.ax.xaxis.get_minor_locator(), mpl.ticker.LogLocator):
-            if value >= 8:
-                subs = list(range(2, 10))
-            else:
-                # evenly distributed minor ticks for LogLocator
-                subs = np.floor(1 + np.arange(1, value + 1) * 9 / (value + 1))
-            self.ax.xaxis.set_minor_locator(mpl.ticker.LogLocator(numticks=99, subs=subs))
-        else:
-            self.ax.xaxis.set_minor_locator(mpl.ticker.AutoMinorLocator(value + 1))
-        self.fig.canvas.draw()
+        self.redraw.schedule_artists(self.edit(engine.setnumticks, self.targetaxes(), 'x', 'minor', value))
 
     @Slot(int)
     def on_spinBox_numyminorticks_valueChanged(self, value):
-        if isinstance(self.ax.yaxis.get_minor_locator(), mpl.ticker.LogLocator):
-            if value >= 8:
-                subs = range(2, 10)
-            else:
-                subs = np.floor(1 + np.arange(1, value + 1) * 9 / (value + 1))
-            self.ax.yaxis.set_minor_locator(mpl.ticker.LogLocator(numticks=99, subs=subs))
-        else:
-            self.ax.yaxis.set_minor_locator(mpl.ticker.AutoMinorLocator(value + 1))
-        self.fig.canvas.draw()
+        self.redraw.schedule_artists(self.edit(engine.setnumticks, self.targetaxes(), 'y', 'minor', value))
 
     @Slot(bool)
     def on_checkBox_xminorlabels_clicked(self, value):
-        if value:
-            if self.ax.get_xscale() == 'linear':
-                self.ax.xaxis.set_minor_formatter(mpl.ticker.ScalarFormatter())
-            else:
-                self.ax.xaxis.set_minor_formatter(mpl.ticker.FuncFormatter(myminortickformatter))
-        else:
-            self.ax.xaxis.set_minor_formatter(mpl.ticker.NullFormatter())
-        self.fig.canvas.draw()
+        self.redraw.schedule_artists(self.edit(engine.setminorticklabels, self.targetaxes(), 'x', value))
 
     @Slot(bool)
     def on_checkBox_yminorlabels_clicked(self, value):
-        if value:
-            if self.ax.get_yscale() == 'linear':
-                self.ax.yaxis.set_minor_formatter(mpl.ticker.ScalarFormatter())
-            else:
-                self.ax.yaxis.set_minor_formatter(mpl.ticker.FuncFormatter(myminortickformatter))
-        else:
-            self.ax.yaxis.set_minor_formatter(mpl.ticker.NullFormatter())
-        self.fig.canvas.draw()
+        self.redraw.schedule_artists(self.edit(engine.setminorticklabels, self.targetaxes(), 'y', value))
 
     @Slot(str)
     def on_comboBox_ticksdirection_currentIndexChanged(self, value):
-        self.ax.tick_params(which='both', direction=value)
-        self.fig.canvas.draw()
+        self.redraw.schedule_artists(self.edit(engine.settickdirection, self.targetaxes(), value))
 
     @Slot(float)
     def on_doubleSpinBox_ticksmajorlength_valueChanged(self, value):
-        self.ax.tick_params(which='major', length=value)
-#        if self.checkBox_applytorcparams.isChecked():
-#            plt.rcParams['xtick.major.size'] = value
-#            plt.rcParams['ytick.major.size'] = value
-        self.fig.canvas.draw()
+        self.redraw.schedule_artists(self.edit(engine.setticklength, self.targetaxes(), 'major', value))
 
     @Slot(float)
     def on_doubleSpinBox_ticksmajorwidth_valueChanged(self, value):
-        self.ax.tick_params(which='major', width=value)
-#        if self.checkBox_applytorcparams.isChecked():
-#            plt.rcParams['xtick.major.width'] = value
-#            plt.rcParams['ytick.major.width'] = value
-        self.fig.canvas.draw()
+        self.redraw.schedule_artists(self.edit(engine.settickwidth, self.targetaxes(), 'major', value))
 
     @Slot(float)
     def on_doubleSpinBox_ticksminorlength_valueChanged(self, value):
-        self.ax.tick_params(which='minor', length=value)
-#        if self.checkBox_applytorcparams.isChecked():
-#            plt.rcParams['xtick.minor.size'] = value
-#            plt.rcParams['ytick.minor.size'] = value
-        self.fig.canvas.draw()
+        self.redraw.schedule_artists(self.edit(engine.setticklength, self.targetaxes(), 'minor', value))
 
     @Slot(float)
     def on_doubleSpinBox_ticksminorwidth_valueChanged(self, value):
-        self.ax.tick_params(which='minor', width=value)
-#        if self.checkBox_applytorcparams.isChecked():
-#            plt.rcParams['xtick.minor.width'] = value
-#            plt.rcParams['ytick.minor.width'] = value
-        self.fig.canvas.draw()
+        self.redraw.schedule_artists(self.edit(engine.settickwidth, self.targetaxes(), 'minor', value))
+
+    def setspine(self, loc, value):
+        axes = self.targetaxes()
+        spines = self.edit(engine.setspine, axes, loc, value)
+        if value == 'off':
+            self.redraw.schedule_artists(spines, partial=True)  # hiding a spine doesn't change layout
+        else:
+            self.redraw.schedule_artists(axes)
 
     @Slot(str)
     def on_comboBox_bottomspine_currentIndexChanged(self, value):
-        self.ax.spines['bottom'].set_visible(True)
-        if value == 'center' or value == 'zero':
-            self.ax.spines['bottom'].set_position(value)
-        elif value == 'outward':
-            self.ax.spines['bottom'].set_position(('outward', 0))
-        else:
-            self.ax.spines['bottom'].set_visible(False)
-        self.fig.canvas.draw()
+        self.setspine('bottom', value)
 
     @Slot(str)
     def on_comboBox_topspine_currentIndexChanged(self, value):
-        self.ax.spines['top'].set_visible(True)
-        if value == 'center' or value == 'zero':
-            self.ax.spines['top'].set_position(value)
-        elif value == 'outward':
-            self.ax.spines['top'].set_position(('outward', 0))
-        else:
-            self.ax.spines['top'].set_visible(False)
-        self.fig.canvas.draw()
+        self.setspine('top', value)
 
     @Slot(str)
     def on_comboBox_leftspine_currentIndexChanged(self, value):
-        self.ax.spines['left'].set_visible(True)
-        if value == 'center' or value == 'zero':
-            self.ax.spines['left'].set_position(value)
-        elif value == 'outward':
-            self.ax.spines['left'].set_position(('outward', 0))
-        else:
-            self.ax.spines['left'].set_visible(False)
-        self.fig.canvas.draw()
+        self.setspine('left', value)
 
     @Slot(str)
     def on_comboBox_rightspine_currentIndexChanged(self, value):
-        self.ax.spines['right'].set_visible(True)
-        if value == 'center' or value == 'zero':
-            self.ax.spines['right'].set_position(value)
-        elif value == 'outward':
-            self.ax.spines['right'].set_position(('outward', 0))
-        else:
-            self.ax.spines['right'].set_visible(False)
-        self.fig.canvas.draw()
+        self.setspine('right', value)
 
     @Slot(float)
     def on_doubleSpinBox_spinewidth_valueChanged(self, value):
-        for spine in self.ax.spines.values():
-            spine.set_linewidth(value)
-        self.fig.canvas.draw()
+        self.redraw.schedule_artists(self.edit(engine.setspinewidth, self.targetaxes(), value), partial=True)
 
     # start methods for legend tab
     @Slot()
@@ -605,145 +861,138 @@ class PlotBrowser(QtGui.QMainWindow, Ui_PlotBrowser):
     @Slot()
     def on_pushButton_legendapply_clicked(self):
         """Updates legend"""
-        if self.checkBox_legendon.isChecked():
-            self.ax.legend(frameon=self.checkBox_legendframe.isChecked(), fancybox=self.checkBox_legendfancybox.isChecked(),
-                           shadow=self.checkBox_legendshadow.isChecked(), framealpha=self.doubleSpinBox_legendalpha.value(),
-                           ncol=self.spinBox_legendcolumns.value(), title=self.lineEdit_legendtitle.text(),
-                           loc='best')
-            if self.ax.legend_ is not None:
-                self.ax.legend_.draggable(True)
-                color = self.colorconverter(self.lineEdit_legendfacecolor.text())
-                if color is not None:
-                    self.ax.legend_.get_frame().set_facecolor(color)
-        elif self.ax.legend_ is not None:
-            self.ax.legend_.set_visible(False)
-        self.fig.canvas.draw()
+        axes = self.edit(engine.setlegend, self.targetaxes(), visible=self.checkBox_legendon.isChecked(),
+                         frameon=self.checkBox_legendframe.isChecked(), fancybox=self.checkBox_legendfancybox.isChecked(),
+                         shadow=self.checkBox_legendshadow.isChecked(), framealpha=self.doubleSpinBox_legendalpha.value(),
+                         ncol=self.spinBox_legendcolumns.value(), title=self.lineEdit_legendtitle.text(),
+                         facecolor=self.colorconverter(self.lineEdit_legendfacecolor.text()), draggable=True)
+        self.redraw.schedule_artists(axes)
 
     # start methods for lines tab
-    @Slot(QtGui.QListWidgetItem)
-    def on_listWidget_lines_itemClicked(self, item):
+    @Slot(QtCore.QModelIndex)
+    def on_listView_lines_clicked(self, index):
         """Updates lines tab"""
-        self.line = item.data(-1)
-        index = [i[0] for i in self.linestyles].index(self.line.get_linestyle())
-        self.comboBox_linestyle.setCurrentIndex(index)
-        self.doubleSpinBox_linewidth.setValue(self.line.get_linewidth())
-        self.lineEdit_linecolor.setText(self.colorconverter(self.line.get_color()))
-        index = [i[0] for i in self.markers].index(self.line.get_marker())
-        self.comboBox_markerstyle.setCurrentIndex(index)
-        self.spinBox_markersize.setValue(self.line.get_markersize())
-        self.lineEdit_markercolor.setText(self.colorconverter(self.line.get_markerfacecolor()))
-        # self.on_pushButton_legendapply_clicked()
-
-    @Slot(QtGui.QListWidgetItem)
-    def on_listWidget_lines_itemChanged(self, item):
-        item.data(-1).set_label(item.text())
-        self.fig.canvas.draw()
+        with self.populating():
+            self.line = self.linemodel.artist(index)
+            self.comboBox_linestyle.setCurrentIndex(self.linestyles.indexof(self.line.get_linestyle()))
+            self.doubleSpinBox_linewidth.setValue(self.line.get_linewidth())
+            lines = self.selectedartists(self.listView_lines) or [self.line]
+            self.lineEdit_linecolor.setText(commonname([line.get_color() for line in lines]))  # '' if the selected lines differ
+            self.comboBox_markerstyle.setCurrentIndex(self.markers.indexof(self.line.get_marker()))
+            self.spinBox_markersize.setValue(self.line.get_markersize())
+            self.lineEdit_markercolor.setText(commonname([line.get_markerfacecolor() for line in lines]))
+            # self.on_pushButton_legendapply_clicked()
 
     @Slot()
     def on_pushButton_makeline_clicked(self):
-        x = eval(self.lineEdit_x.text())
-        self.ax.plot(eval(self.lineEdit_x.text()), eval(self.lineEdit_y.text()))
-        self.fig.canvas.draw()
-        self.on_listWidget_axes_itemClicked(self.listWidget_axes.selectedItems()[-1])
+        namespace = usernamespace()  # arrays made in IPython can be plotted by name, they aren't copied
+        try:
+            (x, xtime) = timed(self.lineEdit_x.text(), namespace)
+            (y, ytime) = timed(self.lineEdit_y.text(), {'x': x}, namespace)
+        except ExpressionError as error:
+            self.label_makeline.setText(str(error))
+            self.label_makeline.setToolTip(str(error))
+            return
+        try:
+            lines = self.ax.plot(x, y)
+        except ValueError as error:  # e.g. x and y of different lengths
+            self.label_makeline.setText(str(error))
+            self.label_makeline.setToolTip(str(error))
+            return
+        self.label_makeline.setText('{} points, {:.1f} ms'.format(np.size(y), 1000 * (xtime + ytime)))
+        self.label_makeline.setToolTip('')
+        for line in lines:
+            self.history.push(history.addedline(line))
+        self.redraw.schedule(self.fig)
+        self.on_listView_axes_clicked(self.listView_axes.currentIndex())
+        self.refresh_listView_lines(selectlast=True)
 
     @Slot()
     def on_pushButton_deleteline_clicked(self):
         if self.line in self.ax.lines:
-            self.line.remove()
-            self.refresh_listWidget_lines()
+            self.history.push(history.removeline(self.line))
+            self.redraw.schedule(self.fig)
+            self.refresh_listView_lines()
 
     @Slot(int)
     def on_comboBox_linestyle_currentIndexChanged(self, value):
+        if self.linestyles.iscustom(value):
+            return  # keeps the custom styles of the lines
         try:
-            self.line.set_linestyle(self.linestyles[value][0])
-            self.fig.canvas.draw()
+            lines = self.edit(engine.setlinestyle, self.targetlines(), self.linestyles.spec(value))
+            self.redraw.schedule_artists(lines, partial=True)  # only the lines changed, can be blitted
         except AttributeError:
             pass
 
     @Slot(float)
     def on_doubleSpinBox_linewidth_valueChanged(self, value):
-        self.line.set_linewidth(value)
-        self.fig.canvas.draw()
+        self.redraw.schedule_artists(self.edit(engine.setlinewidth, self.targetlines(), value), partial=True)
 
     @Slot()
     def on_lineEdit_linecolor_editingFinished(self):
         color = self.colorconverter(self.lineEdit_linecolor.text())
         if color is not None:
-            self.line.set_color(color)
-            self.fig.canvas.draw()
+            self.redraw.schedule_artists(self.edit(engine.setlinecolor, self.targetlines(), color), partial=True)
         self.lineEdit_linecolor.setText(self.colorconverter(self.line.get_color()))
 
     @Slot(int)
     def on_comboBox_markerstyle_currentIndexChanged(self, value):
+        if self.markers.iscustom(value):
+            return  # keeps the custom markers of the lines
         try:
-            self.line.set_marker(self.markers[value][0])
-            self.fig.canvas.draw()
+            self.redraw.schedule_artists(self.edit(engine.setmarker, self.targetlines(), self.markers.spec(value)), partial=True)
         except AttributeError:
             pass
 
     @Slot(int)
     def on_spinBox_markersize_valueChanged(self, value):
-        self.line.set_markersize(value)
-        self.fig.canvas.draw()
+        self.redraw.schedule_artists(self.edit(engine.setmarkersize, self.targetlines(), value), partial=True)
 
     @Slot()
     def on_lineEdit_markercolor_editingFinished(self):
         color = self.colorconverter(self.lineEdit_markercolor.text())
         if color is not None:
-            self.line.set_markerfacecolor(color)
-            self.line.set_markeredgecolor(color)
-            self.fig.canvas.draw()
+            self.redraw.schedule_artists(self.edit(engine.setmarkercolor, self.targetlines(), color), partial=True)
         self.lineEdit_markercolor.setText(self.colorconverter(self.line.get_markerfacecolor()))
 
     @Slot()
     def on_pushButton_hline_clicked(self):
-        self.ax.axhline()
-        self.fig.canvas.draw()
-        self.refresh_listWidget_lines()
+        self.history.push(history.addedline(self.ax.axhline()))
+        self.redraw.schedule(self.fig)
+        self.refresh_listView_lines(selectlast=True)
 
     @Slot()
     def on_pushButton_vline_clicked(self):
-        self.ax.axvline()
-        self.fig.canvas.draw()
-        self.refresh_listWidget_lines()
+        self.history.push(history.addedline(self.ax.axvline()))
+        self.redraw.schedule(self.fig)
+        self.refresh_listView_lines(selectlast=True)
 
     @Slot(bool)
     def on_checkBox_xgrid_clicked(self, value):
-        self.ax.xaxis.grid(value)
-        self.ax.set_axisbelow(True)
-        self.fig.canvas.draw()
+        self.redraw.schedule_artists(self.edit(engine.setgrid, self.targetaxes(), x=value))
 
     @Slot(bool)
     def on_checkBox_ygrid_clicked(self, value):
-        self.ax.yaxis.grid(value)
-        self.ax.set_axisbelow(True)
-        self.fig.canvas.draw()
+        self.redraw.schedule_artists(self.edit(engine.setgrid, self.targetaxes(), y=value))
 
     @Slot(int)
     def on_comboBox_gridstyle_currentIndexChanged(self, value):
+        if self.linestyles.iscustom(value):
+            return  # keeps custom grid line styles
         try:
-            self.ax.grid(linestyle=self.linestyles[value][0])  # side effect of turning on x and y grids
-            self.ax.xaxis.grid(self.checkBox_xgrid.isChecked())
-            self.ax.yaxis.grid(self.checkBox_ygrid.isChecked())
-            self.fig.canvas.draw()
+            self.redraw.schedule_artists(self.edit(engine.setgrid, self.targetaxes(), linestyle=self.linestyles.spec(value)))
         except AttributeError:
             pass
 
     @Slot(float)
     def on_doubleSpinBox_gridwidth_valueChanged(self, value):
-        self.ax.grid(linewidth=value)
-        self.ax.xaxis.grid(self.checkBox_xgrid.isChecked())
-        self.ax.yaxis.grid(self.checkBox_ygrid.isChecked())
-        self.fig.canvas.draw()
+        self.redraw.schedule_artists(self.edit(engine.setgrid, self.targetaxes(), linewidth=value))
 
     @Slot()
     def on_lineEdit_gridcolor_editingFinished(self):
         color = self.colorconverter(self.lineEdit_gridcolor.text())
         if color is not None:
-            self.ax.grid(color=color)
-            self.ax.xaxis.grid(self.checkBox_xgrid.isChecked())
-            self.ax.yaxis.grid(self.checkBox_ygrid.isChecked())
-            self.fig.canvas.draw()
+            self.redraw.schedule_artists(self.edit(engine.setgrid, self.targetaxes(), color=color))
         self.lineEdit_gridcolor.setText(self.colorconverter(self.ax.xaxis.majorTicks[0].gridline.get_color()))
 
     # start methods for fonts tab
@@ -758,50 +1007,198 @@ class PlotBrowser(QtGui.QMainWindow, Ui_PlotBrowser):
     @Slot()
     def on_pushButton_fontapply_clicked(self):  # ignores strikeout and underline options
         """Updates fonts in the figure"""
-        items = []
-        if self.checkBox_fontapplytotitle.isChecked():
-            items.append(self.ax.title)
-        if self.checkBox_fontapplytoxlabel.isChecked():
-            items.append(self.ax.xaxis.label)
-        if self.checkBox_fontapplytoylabel.isChecked():
-            items.append(self.ax.yaxis.label)
-        if self.checkBox_fontapplytoxmajorticklabels.isChecked():
-            items += self.ax.get_xmajorticklabels()
-        if self.checkBox_fontapplytoymajorticklabels.isChecked():
-            items += self.ax.get_ymajorticklabels()
-        if self.checkBox_fontapplytoxminorticklabels.isChecked():
-            items += self.ax.get_xminorticklabels()
-        if self.checkBox_fontapplytoyminorticklabels.isChecked():
-            items += self.ax.get_yminorticklabels()
-        if self.checkBox_fontapplytolegend.isChecked() and self.ax.legend_ is not None:
-            items += self.ax.legend_.get_texts()
-        for item in items:
-            item.set_name(self.selectedfont.family())
-            item.set_size(self.selectedfont.pointSize())
-            color = self.colorconverter(self.lineEdit_fontcolor.text())
-            if color is not None:
-                item.set_color(color)
-            if self.selectedfont.bold():
-                item.set_weight('bold')
-            else:
-                item.set_weight('normal')
-            if self.selectedfont.italic():
-                item.set_style('italic')
-            else:
-                item.set_style('normal')
-        self.fig.canvas.draw()
+        targets = [target for target in engine.FONTTARGETS
+                   if getattr(self, 'checkBox_fontapplyto' + target).isChecked()]
+        axes = self.edit(engine.setfont, self.targetaxes(), targets, family=self.selectedfont.family(),
+                         size=self.selectedfont.pointSize(), weight='bold' if self.selectedfont.bold() else 'normal',
+                         style='italic' if self.selectedfont.italic() else 'normal',
+                         color=self.colorconverter(self.lineEdit_fontcolor.text()))
+        self.redraw.schedule_artists(axes)
 
 
-def myminortickformatter(number, pos):
-    """Labels the minor ticks with their first digit"""
-    numstr = str(format(number, 'e'))
-    if numstr[0] == '-':
-        return str(numstr)[1]
-    else:
-        return str(numstr)[0]
+class TimingsDialog(QtGui.QDialog):
+    """Shows the slot and draw histograms of plotbrowser.instrument"""
+    def __init__(self, parent=None):
+        super(TimingsDialog, self).__init__(parent)
+        self.setWindowTitle('Timings')
+        self.resize(760, 400)
+        self.text = QtGui.QPlainTextEdit(self)
+        self.text.setReadOnly(True)
+        self.text.setLineWrapMode(QtGui.QPlainTextEdit.NoWrap)
+        font = QtGui.QFont('Monospace')
+        font.setStyleHint(QtGui.QFont.TypeWriter)
+        self.text.setFont(font)
+        buttons = QtGui.QHBoxLayout()
+        for (text, slot) in (('Refresh', self.refresh), ('Reset', self.reset), ('Save', self.save)):
+            button = QtGui.QPushButton(text, self)
+            button.clicked.connect(slot)
+            buttons.addWidget(button)
+        layout = QtGui.QVBoxLayout(self)
+        layout.addWidget(self.text)
+        layout.addLayout(buttons)
+
+    def refresh(self):
+        if instrument.enabled or instrument.slots or instrument.artists:
+            self.text.setPlainText(instrument.report())
+        else:
+            self.text.setPlainText('Check "time slots and draws" in the figures tab to start timing.')
+
+    def reset(self):
+        instrument.reset()
+        self.refresh()
+
+    def save(self):
+        """Writes the histograms as JSON"""
+        filename = QtGui.QFileDialog.getSaveFileName(None, 'Choose filename to save timings to:', 'plotbrowser_timings.json')[0]
+        if len(filename) != 0:
+            instrument.dump(filename)
+
+
+class ProfileDialog(QtGui.QDialog):
+    """Lists the drawprofile.TOPN slowest artists of a figure; activating one emits artistActivated
+
+    artistActivated is emitted with the figure, the axes and line of the artist
+    (either may be None), and the name of the tab to show them in.
+    """
+    artistActivated = Signal(object, object, object, str)
+
+    def __init__(self, parent=None):
+        super(ProfileDialog, self).__init__(parent)
+        self.resize(560, 400)
+        self.tree = QtGui.QTreeWidget(self)
+        self.tree.setRootIsDecorated(False)
+        self.tree.setHeaderLabels(['own ms', 'total ms', 'artist', 'axes', 'line'])
+        self.tree.setColumnWidth(2, 300)
+        self.tree.itemActivated.connect(self.activated)
+        self.label = QtGui.QLabel('Double-click an artist to select it in the browser.', self)
+        layout = QtGui.QVBoxLayout(self)
+        layout.addWidget(self.tree)
+        layout.addWidget(self.label)
+        self.rows = []  # (axes, line, tab) of each row
+
+    def settimings(self, fig, timings):
+        total = sum(timing.seconds for timing in timings)
+        self.setWindowTitle('Draw profile of {}: {:.1f} ms'.format(windowtitle(fig), 1000 * total))
+        self.fig = fig
+        self.tree.clear()
+        self.rows = []
+        for timing in timings[:drawprofile.TOPN]:
+            (ax, line) = drawprofile.owner(timing)
+            axesrow = str(fig.axes.index(ax)) if ax in fig.axes else ''
+            linerow = str(ax.lines.index(line)) if line is not None else ''
+            self.tree.addTopLevelItem(QtGui.QTreeWidgetItem(['{:.2f}'.format(1000 * timing.seconds),
+                                                              '{:.2f}'.format(1000 * timing.inclusive),
+                                                              drawprofile.describe(timing.artist), axesrow, linerow]))
+            self.rows.append((ax, line, profiletab(timing.artist, ax, line)))
+
+    def activated(self, item, column):
+        (ax, line, tab) = self.rows[self.tree.indexOfTopLevelItem(item)]
+        self.artistActivated.emit(self.fig, ax, line, tab)
+
+
+class ExportThread(QtCore.QThread):
+    """Runs an export function from plotbrowser.export, so rendering doesn't block the GUI
+
+    function is called with args, kwargs and a cancelled callable. If
+    reportprogress is True it also gets a progress callable, which emits progressed.
+    """
+    exported = Signal(object)
+    failed = Signal(str)
+    progressed = Signal(int, int)
+
+    def __init__(self, function, args, kwargs=None, reportprogress=False, parent=None):
+        super(ExportThread, self).__init__(parent)
+        self.function = function
+        self.args = args
+        self.kwargs = dict(kwargs or {})
+        if reportprogress:
+            self.kwargs['progress'] = self.progressed.emit
+        self.cancelled = False
+
+    @Slot()
+    def cancel(self):
+        """A render can't be interrupted, but its result is discarded"""
+        self.cancelled = True
+
+    def run(self):
+        try:
+            result = self.function(*self.args, cancelled=lambda: self.cancelled, **self.kwargs)
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        if result is not None:
+            self.exported.emit(result)
+
+
+def profiletab(artist, ax, line):
+    """Returns the name of the tab with the settings of an artist listed by ProfileDialog"""
+    if line is not None:
+        return 'linestab'
+    elif hasattr(artist, 'get_ticklocs') or hasattr(artist, 'tick1line'):  # axis or tick
+        return 'spinestickstab'
+    elif ax is not None:
+        return 'axestab'
+    return 'figurestab'
+
+
+def read_axestab(ax):
+    """Returns the axes properties shown in the axes tab"""
+    return {'labeltop': ax.xaxis.get_label_position() != 'bottom',
+            'labelright': ax.yaxis.get_label_position() != 'left',
+            'xlabel': ax.get_xlabel(),
+            'ylabel': ax.get_ylabel(),
+            'facecolor': ax.patch.get_facecolor(),
+            'facealpha': 1.0 if ax.patch.get_alpha() is None else ax.patch.get_alpha(),
+            'xscale': ax.get_xscale(),
+            'yscale': ax.get_yscale(),
+            'xlim': ax.get_xlim(),
+            'ylim': ax.get_ylim()}
+
+
+def read_spinestickstab(ax):
+    """Returns the tick and spine properties shown in the spines/ticks tab"""
+    xtick = ax.xaxis.majorTicks[0]
+    ytick = ax.yaxis.majorTicks[0]
+    (numxmajorticks, numxminorticks) = numticks(ax.xaxis)
+    (numymajorticks, numyminorticks) = numticks(ax.yaxis)
+    spines = {}
+    for spineloc in ('bottom', 'top', 'left', 'right'):
+        if not ax.spines[spineloc].get_visible():
+            spines[spineloc] = 'off'
+        elif isinstance(ax.spines[spineloc].get_position(), str):
+            spines[spineloc] = ax.spines[spineloc].get_position()
+        else:
+            spines[spineloc] = ax.spines[spineloc].get_position()[0]
+    flag = engine.tickflag  # the tick1On etc. attributes are gone in matplotlib >= 3.1
+    return {'tickdraw': ((flag(xtick, 'label1On'), flag(xtick, 'tick1On')), (flag(xtick, 'label2On'), flag(xtick, 'tick2On')),
+                         (flag(ytick, 'label1On'), flag(ytick, 'tick1On')), (flag(ytick, 'label2On'), flag(ytick, 'tick2On'))),
+            'numxmajorticks': numxmajorticks,
+            'numymajorticks': numymajorticks,
+            'numxminorticks': numxminorticks,
+            'numyminorticks': numyminorticks,
+            'xminorlabels': not isinstance(ax.xaxis.get_minor_formatter(), mpl.ticker.NullFormatter),
+            'yminorlabels': not isinstance(ax.yaxis.get_minor_formatter(), mpl.ticker.NullFormatter),
+            'tickdirection': xtick._tickdir,
+            'majorlength': xtick.tick1line.get_markersize(),
+            'majorwidth': xtick.tick1line.get_markeredgewidth(),
+            'minorlength': ax.xaxis.minorTicks[0].tick1line.get_markersize(),
+            'minorwidth': ax.xaxis.minorTicks[0].tick1line.get_markeredgewidth(),
+            'spines': spines,
+            'spinewidth': ax.spines['bottom'].get_linewidth()}
+
+
+def read_gridsection(ax):
+    """Returns the grid properties shown in the grid section of the lines tab"""
+    gridline = ax.xaxis.majorTicks[0].gridline
+    return {'xgrid': engine.tickflag(ax.xaxis.majorTicks[0], 'gridOn'),
+            'ygrid': engine.tickflag(ax.yaxis.majorTicks[0], 'gridOn'),
+            'gridstyle': gridline.get_linestyle(),
+            'gridwidth': gridline.get_linewidth(),
+            'gridcolor': gridline.get_color()}
 
 
 def run():
+    from IPython.lib import guisupport  # imported here, it takes longer to import than the rest of plotbrowser
     # app = QtGui.QApplication.instance()  # checks if QApplication already exists
     # if not app:  # create QApplication if it doesnt exist
     #     app = QtGui.QApplication(sys.argv)
@@ -26,10 +26,11 @@ class Ui_PlotBrowser(object):
         self.tabWidget.setObjectName("tabWidget")
         self.figurestab = QtGui.QWidget()
         self.figurestab.setObjectName("figurestab")
-        self.listWidget_figures = QtGui.QListWidget(self.figurestab)
-        self.listWidget_figures.setGeometry(QtCore.QRect(10, 10, 261, 111))
-        self.listWidget_figures.setDragDropMode(QtGui.QAbstractItemView.InternalMove)
-        self.listWidget_figures.setObjectName("listWidget_figures")
+        self.listView_figures = QtGui.QListView(self.figurestab)
+        self.listView_figures.setGeometry(QtCore.QRect(10, 10, 261, 111))
+        self.listView_figures.setSelectionMode(QtGui.QAbstractItemView.ExtendedSelection)
+        self.listView_figures.setUniformItemSizes(True)
+        self.listView_figures.setObjectName("listView_figures")
         self.label_30 = QtGui.QLabel(self.figurestab)
         self.label_30.setGeometry(QtCore.QRect(10, 130, 91, 16))
         self.label_30.setObjectName("label_30")
@@ -60,12 +61,54 @@ class Ui_PlotBrowser(object):
         self.pushButton_savefigure = QtGui.QPushButton(self.figurestab)
         self.pushButton_savefigure.setGeometry(QtCore.QRect(280, 340, 75, 23))
         self.pushButton_savefigure.setObjectName("pushButton_savefigure")
+        self.pushButton_exportall = QtGui.QPushButton(self.figurestab)
+        self.pushButton_exportall.setGeometry(QtCore.QRect(280, 310, 75, 23))
+        self.pushButton_exportall.setObjectName("pushButton_exportall")
         self.checkBox_applytorcparams = QtGui.QCheckBox(self.figurestab)
         self.checkBox_applytorcparams.setGeometry(QtCore.QRect(10, 340, 111, 17))
         self.checkBox_applytorcparams.setObjectName("checkBox_applytorcparams")
         self.pushButton_tightlayout = QtGui.QPushButton(self.figurestab)
         self.pushButton_tightlayout.setGeometry(QtCore.QRect(240, 160, 71, 23))
         self.pushButton_tightlayout.setObjectName("pushButton_tightlayout")
+        self.checkBox_decimate = QtGui.QCheckBox(self.figurestab)
+        self.checkBox_decimate.setGeometry(QtCore.QRect(10, 190, 101, 17))
+        self.checkBox_decimate.setObjectName("checkBox_decimate")
+        self.label_decimation = QtGui.QLabel(self.figurestab)
+        self.label_decimation.setGeometry(QtCore.QRect(120, 190, 191, 16))
+        self.label_decimation.setObjectName("label_decimation")
+        self.pushButton_copystyle = QtGui.QPushButton(self.figurestab)
+        self.pushButton_copystyle.setGeometry(QtCore.QRect(10, 220, 91, 23))
+        self.pushButton_copystyle.setObjectName("pushButton_copystyle")
+        self.pushButton_pastestyle = QtGui.QPushButton(self.figurestab)
+        self.pushButton_pastestyle.setGeometry(QtCore.QRect(110, 220, 91, 23))
+        self.pushButton_pastestyle.setObjectName("pushButton_pastestyle")
+        self.pushButton_saverc = QtGui.QPushButton(self.figurestab)
+        self.pushButton_saverc.setGeometry(QtCore.QRect(10, 310, 111, 23))
+        self.pushButton_saverc.setObjectName("pushButton_saverc")
+        self.pushButton_undo = QtGui.QPushButton(self.figurestab)
+        self.pushButton_undo.setGeometry(QtCore.QRect(10, 250, 91, 23))
+        self.pushButton_undo.setObjectName("pushButton_undo")
+        self.pushButton_redo = QtGui.QPushButton(self.figurestab)
+        self.pushButton_redo.setGeometry(QtCore.QRect(110, 250, 91, 23))
+        self.pushButton_redo.setObjectName("pushButton_redo")
+        self.pushButton_savescript = QtGui.QPushButton(self.figurestab)
+        self.pushButton_savescript.setGeometry(QtCore.QRect(130, 310, 111, 23))
+        self.pushButton_savescript.setObjectName("pushButton_savescript")
+        self.pushButton_savesession = QtGui.QPushButton(self.figurestab)
+        self.pushButton_savesession.setGeometry(QtCore.QRect(10, 280, 91, 23))
+        self.pushButton_savesession.setObjectName("pushButton_savesession")
+        self.pushButton_loadsession = QtGui.QPushButton(self.figurestab)
+        self.pushButton_loadsession.setGeometry(QtCore.QRect(110, 280, 91, 23))
+        self.pushButton_loadsession.setObjectName("pushButton_loadsession")
+        self.checkBox_instrument = QtGui.QCheckBox(self.figurestab)
+        self.checkBox_instrument.setGeometry(QtCore.QRect(210, 222, 151, 17))
+        self.checkBox_instrument.setObjectName("checkBox_instrument")
+        self.pushButton_timings = QtGui.QPushButton(self.figurestab)
+        self.pushButton_timings.setGeometry(QtCore.QRect(280, 250, 81, 23))
+        self.pushButton_timings.setObjectName("pushButton_timings")
+        self.pushButton_profiledraw = QtGui.QPushButton(self.figurestab)
+        self.pushButton_profiledraw.setGeometry(QtCore.QRect(280, 280, 81, 23))
+        self.pushButton_profiledraw.setObjectName("pushButton_profiledraw")
         self.label_49 = QtGui.QLabel(self.figurestab)
         self.label_49.setGeometry(QtCore.QRect(170, 130, 41, 16))
         self.label_49.setObjectName("label_49")
@@ -92,10 +135,11 @@ class Ui_PlotBrowser(object):
         self.tabWidget.addTab(self.figurestab, "")
         self.axestab = QtGui.QWidget()
         self.axestab.setObjectName("axestab")
-        self.listWidget_axes = QtGui.QListWidget(self.axestab)
-        self.listWidget_axes.setGeometry(QtCore.QRect(10, 180, 181, 101))
-        self.listWidget_axes.setDragDropMode(QtGui.QAbstractItemView.InternalMove)
-        self.listWidget_axes.setObjectName("listWidget_axes")
+        self.listView_axes = QtGui.QListView(self.axestab)
+        self.listView_axes.setGeometry(QtCore.QRect(10, 180, 181, 101))
+        self.listView_axes.setSelectionMode(QtGui.QAbstractItemView.ExtendedSelection)
+        self.listView_axes.setUniformItemSizes(True)
+        self.listView_axes.setObjectName("listView_axes")
         self.checkBox_labelright = QtGui.QCheckBox(self.axestab)
         self.checkBox_labelright.setGeometry(QtCore.QRect(270, 210, 70, 17))
         self.checkBox_labelright.setObjectName("checkBox_labelright")
@@ -271,6 +315,12 @@ class Ui_PlotBrowser(object):
         self.lineEdit_axisfacecolor = QtGui.QLineEdit(self.axestab)
         self.lineEdit_axisfacecolor.setGeometry(QtCore.QRect(70, 290, 61, 20))
         self.lineEdit_axisfacecolor.setObjectName("lineEdit_axisfacecolor")
+        self.comboBox_axesscope = QtGui.QComboBox(self.axestab)
+        self.comboBox_axesscope.setGeometry(QtCore.QRect(240, 290, 121, 22))
+        self.comboBox_axesscope.setObjectName("comboBox_axesscope")
+        self.comboBox_axesscope.addItem("")
+        self.comboBox_axesscope.addItem("")
+        self.comboBox_axesscope.addItem("")
         self.tabWidget.addTab(self.axestab, "")
         self.linestab = QtGui.QWidget()
         self.linestab.setObjectName("linestab")
@@ -283,10 +333,14 @@ class Ui_PlotBrowser(object):
         self.label_3 = QtGui.QLabel(self.linestab)
         self.label_3.setGeometry(QtCore.QRect(10, 40, 21, 16))
         self.label_3.setObjectName("label_3")
-        self.listWidget_lines = QtGui.QListWidget(self.linestab)
-        self.listWidget_lines.setGeometry(QtCore.QRect(10, 70, 131, 141))
-        self.listWidget_lines.setDragDropMode(QtGui.QAbstractItemView.InternalMove)
-        self.listWidget_lines.setObjectName("listWidget_lines")
+        self.listView_lines = QtGui.QListView(self.linestab)
+        self.listView_lines.setGeometry(QtCore.QRect(10, 70, 131, 115))
+        self.listView_lines.setSelectionMode(QtGui.QAbstractItemView.ExtendedSelection)
+        self.listView_lines.setUniformItemSizes(True)
+        self.listView_lines.setObjectName("listView_lines")
+        self.lineEdit_linefilter = QtGui.QLineEdit(self.linestab)
+        self.lineEdit_linefilter.setGeometry(QtCore.QRect(10, 190, 131, 20))
+        self.lineEdit_linefilter.setObjectName("lineEdit_linefilter")
         self.pushButton_deleteline = QtGui.QPushButton(self.linestab)
         self.pushButton_deleteline.setGeometry(QtCore.QRect(260, 70, 101, 23))
         self.pushButton_deleteline.setObjectName("pushButton_deleteline")
@@ -378,6 +432,20 @@ class Ui_PlotBrowser(object):
         self.lineEdit_gridcolor = QtGui.QLineEdit(self.groupBox_5)
         self.lineEdit_gridcolor.setGeometry(QtCore.QRect(190, 50, 61, 20))
         self.lineEdit_gridcolor.setObjectName("lineEdit_gridcolor")
+        self.label_linescope = QtGui.QLabel(self.linestab)
+        self.label_linescope.setGeometry(QtCore.QRect(280, 290, 81, 16))
+        self.label_linescope.setObjectName("label_linescope")
+        self.comboBox_linescope = QtGui.QComboBox(self.linestab)
+        self.comboBox_linescope.setGeometry(QtCore.QRect(280, 310, 81, 22))
+        self.comboBox_linescope.setObjectName("comboBox_linescope")
+        self.comboBox_linescope.addItem("")
+        self.comboBox_linescope.addItem("")
+        self.comboBox_linescope.addItem("")
+        self.comboBox_linescope.addItem("")
+        self.label_makeline = QtGui.QLabel(self.linestab)
+        self.label_makeline.setGeometry(QtCore.QRect(280, 340, 81, 31))
+        self.label_makeline.setWordWrap(True)
+        self.label_makeline.setObjectName("label_makeline")
         self.tabWidget.addTab(self.linestab, "")
         self.spinestickstab = QtGui.QWidget()
         self.spinestickstab.setObjectName("spinestickstab")
@@ -660,10 +728,23 @@ class Ui_PlotBrowser(object):
         self.pushButton_bringtofront.setText(QtGui.QApplication.translate("PlotBrowser", "Bring to front", None, QtGui.QApplication.UnicodeUTF8))
         self.pushButton_refreshlist.setText(QtGui.QApplication.translate("PlotBrowser", "Refresh list", None, QtGui.QApplication.UnicodeUTF8))
         self.pushButton_savefigure.setText(QtGui.QApplication.translate("PlotBrowser", "Save figure", None, QtGui.QApplication.UnicodeUTF8))
+        self.pushButton_exportall.setText(QtGui.QApplication.translate("PlotBrowser", "Export all", None, QtGui.QApplication.UnicodeUTF8))
         self.checkBox_applytorcparams.setText(QtGui.QApplication.translate("PlotBrowser", "apply to rcParams", None, QtGui.QApplication.UnicodeUTF8))
         self.pushButton_tightlayout.setText(QtGui.QApplication.translate("PlotBrowser", "Tight layout", None, QtGui.QApplication.UnicodeUTF8))
+        self.checkBox_decimate.setText(QtGui.QApplication.translate("PlotBrowser", "decimate lines", None, QtGui.QApplication.UnicodeUTF8))
         self.label_49.setText(QtGui.QApplication.translate("PlotBrowser", "alpha:", None, QtGui.QApplication.UnicodeUTF8))
         self.label_60.setText(QtGui.QApplication.translate("PlotBrowser", "dpi:", None, QtGui.QApplication.UnicodeUTF8))
+        self.pushButton_copystyle.setText(QtGui.QApplication.translate("PlotBrowser", "Copy style", None, QtGui.QApplication.UnicodeUTF8))
+        self.pushButton_pastestyle.setText(QtGui.QApplication.translate("PlotBrowser", "Paste style", None, QtGui.QApplication.UnicodeUTF8))
+        self.pushButton_saverc.setText(QtGui.QApplication.translate("PlotBrowser", "Save style sheet", None, QtGui.QApplication.UnicodeUTF8))
+        self.pushButton_undo.setText(QtGui.QApplication.translate("PlotBrowser", "Undo", None, QtGui.QApplication.UnicodeUTF8))
+        self.pushButton_redo.setText(QtGui.QApplication.translate("PlotBrowser", "Redo", None, QtGui.QApplication.UnicodeUTF8))
+        self.pushButton_savescript.setText(QtGui.QApplication.translate("PlotBrowser", "Save edits as script", None, QtGui.QApplication.UnicodeUTF8))
+        self.pushButton_savesession.setText(QtGui.QApplication.translate("PlotBrowser", "Save session", None, QtGui.QApplication.UnicodeUTF8))
+        self.pushButton_loadsession.setText(QtGui.QApplication.translate("PlotBrowser", "Load session", None, QtGui.QApplication.UnicodeUTF8))
+        self.checkBox_instrument.setText(QtGui.QApplication.translate("PlotBrowser", "time slots and draws", None, QtGui.QApplication.UnicodeUTF8))
+        self.pushButton_timings.setText(QtGui.QApplication.translate("PlotBrowser", "Timings", None, QtGui.QApplication.UnicodeUTF8))
+        self.pushButton_profiledraw.setText(QtGui.QApplication.translate("PlotBrowser", "Profile draw", None, QtGui.QApplication.UnicodeUTF8))
         self.tabWidget.setTabText(self.tabWidget.indexOf(self.figurestab), QtGui.QApplication.translate("PlotBrowser", "Figures", None, QtGui.QApplication.UnicodeUTF8))
         self.checkBox_labelright.setText(QtGui.QApplication.translate("PlotBrowser", "label right", None, QtGui.QApplication.UnicodeUTF8))
         self.label_14.setText(QtGui.QApplication.translate("PlotBrowser", "y scale:", None, QtGui.QApplication.UnicodeUTF8))
@@ -705,10 +786,14 @@ class Ui_PlotBrowser(object):
         self.label_52.setText(QtGui.QApplication.translate("PlotBrowser", "bottom margin:", None, QtGui.QApplication.UnicodeUTF8))
         self.label_51.setText(QtGui.QApplication.translate("PlotBrowser", "left margin:", None, QtGui.QApplication.UnicodeUTF8))
         self.pushButton_makeaxes.setText(QtGui.QApplication.translate("PlotBrowser", "Add", None, QtGui.QApplication.UnicodeUTF8))
+        self.comboBox_axesscope.setItemText(0, QtGui.QApplication.translate("PlotBrowser", "selected axes", None, QtGui.QApplication.UnicodeUTF8))
+        self.comboBox_axesscope.setItemText(1, QtGui.QApplication.translate("PlotBrowser", "axes in figure", None, QtGui.QApplication.UnicodeUTF8))
+        self.comboBox_axesscope.setItemText(2, QtGui.QApplication.translate("PlotBrowser", "all figures", None, QtGui.QApplication.UnicodeUTF8))
         self.tabWidget.setTabText(self.tabWidget.indexOf(self.axestab), QtGui.QApplication.translate("PlotBrowser", "Axes", None, QtGui.QApplication.UnicodeUTF8))
         self.pushButton_makeline.setText(QtGui.QApplication.translate("PlotBrowser", "Make line", None, QtGui.QApplication.UnicodeUTF8))
         self.label.setText(QtGui.QApplication.translate("PlotBrowser", "x:", None, QtGui.QApplication.UnicodeUTF8))
         self.label_3.setText(QtGui.QApplication.translate("PlotBrowser", "y:", None, QtGui.QApplication.UnicodeUTF8))
+        self.lineEdit_linefilter.setPlaceholderText(QtGui.QApplication.translate("PlotBrowser", "filter", None, QtGui.QApplication.UnicodeUTF8))
         self.pushButton_deleteline.setText(QtGui.QApplication.translate("PlotBrowser", "Delete line", None, QtGui.QApplication.UnicodeUTF8))
         self.lineEdit_x.setText(QtGui.QApplication.translate("PlotBrowser", "np.linspace(-np.pi,np.pi,100)", None, QtGui.QApplication.UnicodeUTF8))
         self.lineEdit_y.setText(QtGui.QApplication.translate("PlotBrowser", "2*np.sin(x)", None, QtGui.QApplication.UnicodeUTF8))
@@ -722,6 +807,11 @@ class Ui_PlotBrowser(object):
         self.label_26.setText(QtGui.QApplication.translate("PlotBrowser", "style:", None, QtGui.QApplication.UnicodeUTF8))
         self.label_27.setText(QtGui.QApplication.translate("PlotBrowser", "size:", None, QtGui.QApplication.UnicodeUTF8))
         self.label_28.setText(QtGui.QApplication.translate("PlotBrowser", "color:", None, QtGui.QApplication.UnicodeUTF8))
+        self.label_linescope.setText(QtGui.QApplication.translate("PlotBrowser", "apply to:", None, QtGui.QApplication.UnicodeUTF8))
+        self.comboBox_linescope.setItemText(0, QtGui.QApplication.translate("PlotBrowser", "selected", None, QtGui.QApplication.UnicodeUTF8))
+        self.comboBox_linescope.setItemText(1, QtGui.QApplication.translate("PlotBrowser", "axes", None, QtGui.QApplication.UnicodeUTF8))
+        self.comboBox_linescope.setItemText(2, QtGui.QApplication.translate("PlotBrowser", "figure", None, QtGui.QApplication.UnicodeUTF8))
+        self.comboBox_linescope.setItemText(3, QtGui.QApplication.translate("PlotBrowser", "all figures", None, QtGui.QApplication.UnicodeUTF8))
         self.groupBox_5.setTitle(QtGui.QApplication.translate("PlotBrowser", "Grid:", None, QtGui.QApplication.UnicodeUTF8))
         self.label_29.setText(QtGui.QApplication.translate("PlotBrowser", "style:", None, QtGui.QApplication.UnicodeUTF8))
         self.label_57.setText(QtGui.QApplication.translate("PlotBrowser", "width:", None, QtGui.QApplication.UnicodeUTF8))
@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+"""
+rcParams equivalents of the styles made in plotbrowser.
+
+rcparams(style) turns a snapshot from plotbrowser.snapshot.figurestyle into
+the rcParams that give new figures the same look, and changedrcparams keeps
+only those that differ from matplotlib's defaults, i.e. the edited ones.
+Setting them in mpl.rcParams, or writing them to a matplotlibrc/style sheet
+with writerc and loading it with plt.style.use, styles figures as they are
+created instead of restyling each one afterwards. Properties without an
+rcParam (e.g. the number of major ticks) are left out, as are rcParams this
+version of matplotlib doesn't have. Nothing here imports Qt.
+"""
+
+from __future__ import nested_scopes, generators, division, absolute_import,\
+    with_statement, print_function, unicode_literals
+
+import matplotlib as mpl
+import matplotlib.rcsetup
+from matplotlib.figure import Figure
+try:
+    from .snapshot import figurestyle, colorvalue, stringtypes
+except (ImportError, ValueError):  # imported as a top-level module when plotbrowser.py is run as a script
+    from snapshot import figurestyle, colorvalue, stringtypes
+
+CYCLE = 'axes.prop_cycle' if 'axes.prop_cycle' in mpl.rcParams else 'axes.color_cycle'  # 'axes.color_cycle' before matplotlib 1.5
+
+_defaults = None  # (rcparams of a figure made with matplotlib's defaults, default line colors)
+
+
+def rcparams(style, axes=0):
+    """Returns {rcParam: value} for a snapshot, taking axes, tick, font and line settings from style['axes'][axes]"""
+    params = {}
+    if 'facecolor' in style.get('figure', {}):
+        params['figure.facecolor'] = style['figure']['facecolor']
+    if not style.get('axes'):
+        return existing(params)
+    ax = style['axes'][axes]
+    params['axes.facecolor'] = ax['facecolor']
+    for (loc, spine) in ax['spines'].items():
+        params['axes.spines.' + loc] = spine['position'] != 'off'
+    params['axes.linewidth'] = ax['spines']['bottom']['linewidth']
+    ticks = ax['ticks']
+    for (axis, locs) in (('xtick', ('bottom', 'top')), ('ytick', ('left', 'right'))):
+        for loc in locs:
+            (params[axis + '.' + loc], params[axis + '.label' + loc]) = ticks[loc]
+        params[axis + '.direction'] = ticks['direction']
+        for which in ('major', 'minor'):
+            params[axis + '.' + which + '.size'] = ticks[which + 'length']
+            params[axis + '.' + which + '.width'] = ticks[which + 'width']
+    for axis in ('x', 'y'):
+        numminor = ax['numticks'][axis + 'minor']
+        if numminor is not None:
+            params[axis + 'tick.minor.visible'] = numminor > 0
+            if numminor > 0:
+                params[axis + 'tick.minor.ndivs'] = numminor + 1
+    grid = ax['grid']
+    params['axes.grid'] = grid['x'] or grid['y']
+    if grid['x'] != grid['y']:
+        params['axes.grid.axis'] = 'x' if grid['x'] else 'y'
+    params['grid.linestyle'] = grid['linestyle']
+    params['grid.linewidth'] = grid['linewidth']
+    params['grid.color'] = grid['color']
+    fonts = ax['fonts']
+    params['font.family'] = fonts['title']['family']
+    params['axes.titlesize'] = fonts['title']['size']
+    params['axes.titleweight'] = fonts['title']['weight']
+    params['axes.titlecolor'] = fonts['title']['color']
+    params['axes.labelsize'] = fonts['xlabel']['size']
+    params['axes.labelweight'] = fonts['xlabel']['weight']
+    params['axes.labelcolor'] = fonts['xlabel']['color']
+    for axis in ('x', 'y'):
+        params[axis + 'tick.labelsize'] = fonts[axis + 'ticklabels']['size']
+        params[axis + 'tick.labelcolor'] = fonts[axis + 'ticklabels']['color']
+    if ax['legend'] is not None:
+        for key in ('frameon', 'fancybox', 'shadow', 'framealpha', 'facecolor'):
+            params['legend.' + key] = ax['legend'][key]
+    if ax['lines']:
+        line = ax['lines'][0]
+        params['lines.linestyle'] = line['linestyle']
+        params['lines.linewidth'] = line['linewidth']
+        params['lines.markersize'] = line['markersize']
+        if 'marker' in line:
+            params['lines.marker'] = 'None' if line['marker'] is None else line['marker']
+        params[CYCLE] = linecolors([line['color'] for line in ax['lines']])
+    return existing(params)
+
+
+def changedrcparams(style, axes=0):
+    """Returns the part of rcparams(style, axes) that differs from a figure made with matplotlib's defaults"""
+    (default, defaultcolors) = defaults()
+    changed = {}
+    for (key, value) in rcparams(style, axes).items():
+        if key == CYCLE:
+            colors = cyclecolors(value)
+            if colors != defaultcolors[:len(colors)]:
+                changed[key] = value
+        elif default.get(key) != value:
+            changed[key] = value
+    return changed
+
+
+def defaults():
+    """Returns rcparams of a figure with one line and a legend made with matplotlib's defaults, and the default line colors"""
+    global _defaults
+    if _defaults is None:
+        with mpl.rc_context():
+            mpl.rcdefaults()
+            fig = Figure()
+            ax = fig.add_subplot(111)
+            ax.plot([0, 1], label='line')
+            ax.legend()
+            colors = cyclecolors(mpl.rcParams[CYCLE])
+            _defaults = (rcparams(figurestyle(fig)), colors)
+    return _defaults
+
+
+def existing(params):
+    """Drops rcParams this version of matplotlib doesn't have"""
+    return dict((key, value) for (key, value) in params.items() if key in mpl.rcParams)
+
+
+def linecolors(colors):
+    """Returns the value of CYCLE with each of colors once, in order of first use"""
+    unique = []
+    for color in colors:
+        if color not in unique:
+            unique.append(color)
+    if CYCLE == 'axes.prop_cycle':
+        return mpl.rcsetup.cycler(color=unique)
+    return unique
+
+
+def cyclecolors(cycle):
+    """Returns the hex colors of an axes.prop_cycle, or of an old axes.color_cycle list"""
+    if hasattr(cycle, 'by_key'):
+        colors = cycle.by_key().get('color', [])
+    else:
+        colors = cycle
+    return [colorvalue(color) for color in colors]
+
+
+def applyrc(params):
+    """Sets params in mpl.rcParams, returns the previous values of the changed rcParams"""
+    previous = dict((key, mpl.rcParams[key]) for key in params)
+    mpl.rcParams.update(params)
+    return previous
+
+
+def writerc(params, filename):
+    """Writes params as a matplotlibrc file, which also works as a style sheet for plt.style.use(filename)"""
+    with open(filename, 'w') as f:
+        f.write('# matplotlibrc written by plotbrowser\n')
+        for key in sorted(params):
+            f.write('{}: {}\n'.format(key, rcvalue(key, params[key])))
+
+
+def rcvalue(key, value):
+    """Returns value as it is written in a matplotlibrc file"""
+    if key == CYCLE:
+        colors = ', '.join("'" + color.lstrip('#') + "'" for color in cyclecolors(value))
+        if key == 'axes.prop_cycle':
+            return "cycler('color', [{}])".format(colors)
+        return colors
+    if isinstance(value, (list, tuple)):
+        return ', '.join(str(item) for item in value)
+    if key.endswith('color') and isinstance(value, stringtypes) and value.startswith('#'):
+        return value[1:]  # '#' starts a comment in matplotlibrc files
+    return str(value)
@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+"""
+Redraw scheduling for plotbrowser.
+
+Slots mark figures dirty instead of calling fig.canvas.draw() directly. The
+scheduler flushes at most one redraw per dirty figure per event-loop tick, so
+dragging a spin box across many steps only redraws once the events settle.
+
+Edits that only touch a few artists (a line color, a spine) can pass those
+artists to schedule(). The first such edit does a full draw with the artists
+marked animated and caches the background of each axes holding one of them;
+later edits of the same artists restore those backgrounds and blit only those
+axes. Animated artists are drawn above the rest of their axes, so once no
+partial edit came for settle milliseconds the figure gets a normal full draw,
+which puts them back in their z-order place.
+"""
+
+from __future__ import nested_scopes, generators, division, absolute_import,\
+    with_statement, print_function, unicode_literals
+
+import time
+
+from matplotlib.transforms import Bbox
+try:
+    from .engine import figureof
+except (ImportError, ValueError):  # imported as a top-level module when plotbrowser.py is run as a script
+    from engine import figureof
+try:
+    import sip
+    sip.setapi('QString', 2)
+    sip.setapi('QVariant', 2)
+    from PyQt4 import QtCore
+    from PyQt4.QtCore import pyqtSignal as Signal
+except ImportError:
+    from PySide import QtCore
+    from PySide.QtCore import Signal
+
+
+class RedrawScheduler(QtCore.QObject):
+    """Coalesces redraw requests into one draw per figure per event-loop tick
+
+    interval is the minimum time in milliseconds between two draws of the same
+    figure; requests arriving sooner are held until the interval has passed.
+    blit enables partial redraws of single artists on canvases that support it,
+    and settle is the time in milliseconds after the last of them until the
+    figure is drawn normally again, see release().
+    figureChanged is emitted with the figure on every redraw request.
+    """
+    figureChanged = Signal(object)
+
+    def __init__(self, interval=0, blit=True, settle=500, parent=None):
+        super(RedrawScheduler, self).__init__(parent)
+        self.interval = interval
+        self.blit = blit
+        self.settle = settle
+        self.requested = 0  # number of schedule() calls
+        self.drawn = 0  # number of actual canvas draws, full or blitted
+        self.blitted = 0  # number of draws that only redrew edited artists
+        self.coalesced = 0  # number of requests absorbed by a redraw already pending for the same figure
+        self._dirty = []  # figures waiting for a redraw, in request order
+        self._partial = {}  # id(figure) -> artists, for dirty figures that only need those artists redrawn
+        self._blitcache = {}  # id(figure) -> BlitCache
+        self._lastdraw = {}  # id(figure) -> time of last draw
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.flush)
+        self._settletimer = QtCore.QTimer(self)
+        self._settletimer.setSingleShot(True)
+        self._settletimer.timeout.connect(self.release)
+
+    def schedule(self, fig, artists=None):
+        """Marks fig dirty, a redraw happens when control returns to the event loop
+
+        artists lists the only artists changed by the edit; None (the default)
+        means the edit may affect layout and the whole figure is redrawn.
+        """
+        self.requested += 1
+        self.figureChanged.emit(fig)
+        if fig not in self._dirty:
+            self._dirty.append(fig)
+            if artists is not None:
+                self._partial[id(fig)] = list(artists)
+        else:
+            self.coalesced += 1
+            if id(fig) in self._partial:
+                if artists is None:
+                    del self._partial[id(fig)]
+                else:
+                    pending = self._partial[id(fig)]
+                    pending.extend(a for a in artists if a not in pending)
+        if not self._timer.isActive():
+            self._timer.start(self._delay(fig))
+
+    def schedule_artists(self, artists, partial=False):
+        """Schedules one redraw of each figure containing one of artists, e.g. after a bulk edit
+
+        With partial=True only the artists are redrawn, see schedule().
+        """
+        figures = []
+        byfigure = {}  # id(figure) -> artists in that figure
+        for artist in artists:
+            fig = figureof(artist)
+            if fig is None:
+                continue
+            if id(fig) not in byfigure:
+                figures.append(fig)
+                byfigure[id(fig)] = []
+            byfigure[id(fig)].append(artist)
+        for fig in figures:
+            self.schedule(fig, byfigure[id(fig)] if partial else None)
+
+    def flush(self):
+        """Draws every dirty figure whose minimum interval has elapsed"""
+        now = time.time()
+        waiting = []
+        for fig in self._dirty:
+            if self._delay(fig, now) > 0:
+                waiting.append(fig)
+            else:
+                self._draw(fig, now)
+        self._dirty = waiting
+        if waiting:
+            self._timer.start(min(self._delay(fig) for fig in waiting))
+
+    def draw_now(self, fig):
+        """Draws fig immediately, absorbing any pending request for it"""
+        if fig in self._dirty:
+            self._dirty.remove(fig)
+            self.coalesced += 1
+        self._partial.pop(id(fig), None)
+        self._draw(fig, time.time())
+
+    def discard(self, fig):
+        """Forgets pending requests for fig, e.g. when its window is closed"""
+        if fig in self._dirty:
+            self._dirty.remove(fig)
+        self._partial.pop(id(fig), None)
+        self._release(fig)
+        self._lastdraw.pop(id(fig), None)
+
+    def release(self):
+        """Drops all blit caches and redraws their figures, restoring the animated state and z-order of the artists"""
+        self._settletimer.stop()
+        for cache in list(self._blitcache.values()):
+            self._release(cache.fig)
+            self._draw(cache.fig, time.time())
+
+    def stats(self):
+        """Returns a dict with request, draw and coalesced counts"""
+        return {'requested': self.requested, 'drawn': self.drawn, 'blitted': self.blitted,
+                'coalesced': self.coalesced, 'pending': len(self._dirty)}
+
+    def reset_stats(self):
+        self.requested = 0
+        self.drawn = 0
+        self.blitted = 0
+        self.coalesced = 0
+
+    def _draw(self, fig, now):
+        artists = self._partial.pop(id(fig), None)
+        if artists is not None and self.blit and supports_blit(fig.canvas) and all(a.axes is not None for a in artists):
+            cache = self._blitcache.get(id(fig))
+            if cache is not None and cache.matches(artists):
+                cache.blit()
+                self.blitted += 1
+            else:
+                self._release(fig)
+                self._blitcache[id(fig)] = BlitCache(fig, artists)
+                fig.canvas.draw()  # the draw_event handler of the cache grabs the backgrounds
+            self._settletimer.start(self.settle)
+        else:
+            self._release(fig)
+            fig.canvas.draw()
+        self.drawn += 1
+        self._lastdraw[id(fig)] = now
+
+    def _release(self, fig):
+        """Drops the blit cache of fig so its artists are drawn normally again"""
+        cache = self._blitcache.pop(id(fig), None)
+        if cache is not None:
+            cache.release()
+
+    def _delay(self, fig, now=None):
+        """Milliseconds until fig may be drawn again"""
+        if now is None:
+            now = time.time()
+        elapsed = (now - self._lastdraw.get(id(fig), 0)) * 1000
+        return max(0, int(self.interval - elapsed))
+
+
+class BlitCache(object):
+    """Backgrounds of the axes holding a few animated artists, rendered without them
+
+    The artists are marked animated so that full draws skip them; after every
+    full draw the region of each of their axes is copied and the artists are
+    drawn on top of it. blit() restores and redraws only those regions, padded
+    by PAD points for the half of a spine that lies outside its axes.
+    """
+    PAD = 5
+
+    def __init__(self, fig, artists):
+        self.fig = fig
+        self.artists = list(artists)
+        self.animated = [artist.get_animated() for artist in self.artists]
+        self.axes = []  # axes holding the artists, in first-seen order
+        for artist in self.artists:
+            if artist.axes not in self.axes:
+                self.axes.append(artist.axes)
+        self.backgrounds = []  # (region, copied pixels) per axes
+        for artist in self.artists:
+            artist.set_animated(True)
+        self._cid = fig.canvas.mpl_connect('draw_event', self.on_draw)
+
+    def matches(self, artists):
+        return bool(self.backgrounds) and all(a in self.artists for a in artists)
+
+    def region(self, ax):
+        """Display box of ax with room for its spines, within the figure"""
+        return Bbox.intersection(ax.bbox.frozen().padded(self.PAD * self.fig.dpi / 72), self.fig.bbox) or ax.bbox.frozen()
+
+    def on_draw(self, event):
+        canvas = self.fig.canvas
+        self.backgrounds = []
+        for ax in self.axes:
+            region = self.region(ax)
+            self.backgrounds.append((region, canvas.copy_from_bbox(region)))
+        self.draw_artists()
+
+    def draw_artists(self):
+        for artist in self.artists:
+            if artist.figure is self.fig and artist.axes is not None:
+                artist.axes.draw_artist(artist)
+
+    def blit(self):
+        canvas = self.fig.canvas
+        for (region, background) in self.backgrounds:
+            canvas.restore_region(background)
+        self.draw_artists()
+        for (region, background) in self.backgrounds:
+            canvas.blit(region)
+
+    def release(self):
+        self.fig.canvas.mpl_disconnect(self._cid)
+        for (artist, animated) in zip(self.artists, self.animated):
+            artist.set_animated(animated)
+
+
+def supports_blit(canvas):
+    """True for Agg based canvases, which can copy and restore regions"""
+    return hasattr(canvas, 'copy_from_bbox') and hasattr(canvas, 'restore_region') and hasattr(canvas, 'blit')
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""
+Sessions: the styling made with plotbrowser, saved apart from the data.
+
+A session holds, for each figure, its window title and number, and a snapshot
+from plotbrowser.snapshot of each axes together with the axes' title, labels,
+scales and fixed limits. Lines are stored by label. No data is saved, so a
+session file is a few kilobytes however large the plotted arrays, and
+restore(session, figures) re-applies it onto freshly generated figures:
+
+    from plotbrowser import session
+    session.save('styling.json', figures)
+    ...  # later, after running the plotting script again
+    session.restore(session.load('styling.json'), figures)
+
+Figures are matched by window title, then by number; axes by their position in
+fig.axes; lines by label, or by position for unlabelled lines. Nothing here
+imports Qt.
+"""
+
+from __future__ import nested_scopes, generators, division, absolute_import,\
+    with_statement, print_function, unicode_literals
+
+import json
+
+try:
+    from . import engine
+    from .snapshot import figurestyle, applyfigure, applyaxes, applyline
+    from .export import windowtitle
+except (ImportError, ValueError):  # imported as a top-level module when plotbrowser.py is run as a script
+    import engine
+    from snapshot import figurestyle, applyfigure, applyaxes, applyline
+    from export import windowtitle
+
+VERSION = 1
+
+
+def session(figures):
+    """Returns the session of figures, a dict that json can save"""
+    return {'version': VERSION, 'figures': [figuresession(fig) for fig in figures]}
+
+
+def figuresession(fig):
+    style = figurestyle(fig)
+    axes = []
+    for (ax, axesstyle) in zip(fig.axes, style['axes']):
+        axesstyle['lines'] = [[line.get_label(), linestyle] for (line, linestyle) in zip(ax.lines, axesstyle['lines'])]
+        axesstyle['texts'] = {'title': ax.get_title(), 'xlabel': ax.get_xlabel(), 'ylabel': ax.get_ylabel()}
+        axesstyle['scales'] = {'x': ax.get_xscale(), 'y': ax.get_yscale()}
+        axesstyle['limits'] = {}
+        if not ax.get_autoscalex_on():  # set by hand, not by the data
+            axesstyle['limits']['x'] = [float(limit) for limit in ax.get_xlim()]
+        if not ax.get_autoscaley_on():
+            axesstyle['limits']['y'] = [float(limit) for limit in ax.get_ylim()]
+        axes.append(axesstyle)
+    return {'title': windowtitle(fig), 'number': getattr(fig, 'number', None), 'figure': style['figure'], 'axes': axes}
+
+
+def save(filename, figures):
+    with open(filename, 'w') as f:
+        json.dump(session(figures), f, indent=1, sort_keys=True)
+
+
+def load(filename):
+    with open(filename) as f:
+        return json.load(f)
+
+
+def restore(session, figures):
+    """Applies the figures of session onto the matching figures, returns the figures that matched
+
+    Nothing is drawn; redraw the returned figures (or save them) afterwards.
+    """
+    figures = list(figures)
+    titles = [windowtitle(fig) for fig in figures]
+    restored = []
+    for figsession in session.get('figures', []):
+        fig = matchfigure(figsession, figures, titles)
+        if fig is None or fig in restored:
+            continue
+        applyfigure(figsession['figure'], fig)
+        for (ax, axsession) in zip(fig.axes, figsession['axes']):
+            restoreaxes(axsession, ax)
+        restored.append(fig)
+    return restored
+
+
+def matchfigure(figsession, figures, titles):
+    if figsession['title'] and titles.count(figsession['title']) == 1:
+        return figures[titles.index(figsession['title'])]
+    for fig in figures:
+        if figsession['number'] is not None and getattr(fig, 'number', None) == figsession['number']:
+            return fig
+    return None
+
+
+def restoreaxes(axsession, ax):
+    """Scales go first, setting them replaces the tick locators the snapshot sets"""
+    axes = [ax]
+    for (name, scale) in axsession.get('scales', {}).items():
+        engine.setscale(axes, name, scale)
+    for (name, limits) in axsession.get('limits', {}).items():
+        getattr(ax, 'set_' + name + 'lim')(limits)
+    texts = axsession.get('texts', {})
+    if 'title' in texts:
+        ax.set_title(texts['title'])
+    for name in ('x', 'y'):
+        if name + 'label' in texts:
+            engine.setlabel(axes, name, texts[name + 'label'])
+    applyaxes(dict(axsession, lines=[]), ax)
+    for (line, linestyle) in matchlines(axsession.get('lines', []), ax.lines):
+        applyline(linestyle, line)
+
+
+def matchlines(linesessions, lines):
+    """Returns [(line, style)], matching lines by label, and unlabelled ones (label '_...') by position"""
+    labels = [line.get_label() for line in lines]
+    matches = []
+    for (index, (label, linestyle)) in enumerate(linesessions):
+        if not label.startswith('_') and labels.count(label) == 1:
+            matches.append((lines[labels.index(label)], linestyle))
+        elif index < len(lines) and labels[index].startswith('_'):
+            matches.append((lines[index], linestyle))
+    return matches
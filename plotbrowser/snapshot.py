@@ -0,0 +1,264 @@
+# -*- coding: utf-8 -*-
+"""
+Style snapshots of figures, to copy the look of one figure onto others.
+
+figurestyle(fig) reads the properties the browser edits (face colors, spines,
+tick params, locator counts, grid, fonts, legend and line styles) into nested
+dicts and lists of plain values, which json can save. applystyle(style,
+figures) sets them on other figures with plotbrowser.engine, without drawing, so
+it also runs in batch scripts with the Agg backend. stylediff(old, new) keeps
+only what changed between two snapshots; applying a diff leaves all other
+properties alone.
+
+Axes are matched by their position in fig.axes and lines by their position in
+ax.lines. Extra axes get the style of the last axes in the snapshot, and extra
+lines cycle through the line styles. Nothing here imports Qt.
+"""
+
+from __future__ import nested_scopes, generators, division, absolute_import,\
+    with_statement, print_function, unicode_literals
+
+import matplotlib as mpl
+import matplotlib.colors
+import matplotlib.ticker
+try:
+    from . import engine
+    from .engine import SPINES, tickflag, stringtypes
+except (ImportError, ValueError):  # imported as a top-level module when plotbrowser.py is run as a script
+    import engine
+    from engine import SPINES, tickflag, stringtypes
+
+FONTNAMES = {'xticklabels': 'xmajorticklabels', 'yticklabels': 'ymajorticklabels'}  # snapshot -> engine font targets
+
+
+def figurestyle(fig):
+    """Returns a snapshot of the style of fig"""
+    return {'figure': {'facecolor': colorvalue(fig.patch.get_facecolor()), 'facealpha': alphavalue(fig.patch)},
+            'axes': [axesstyle(ax) for ax in fig.axes]}
+
+
+def axesstyle(ax):
+    xtick = ax.xaxis.majorTicks[0]
+    ytick = ax.yaxis.majorTicks[0]
+    (xmajor, xminor) = numticks(ax.xaxis)
+    (ymajor, yminor) = numticks(ax.yaxis)
+    return {'facecolor': colorvalue(ax.patch.get_facecolor()),
+            'facealpha': alphavalue(ax.patch),
+            'labeltop': ax.xaxis.get_label_position() == 'top',
+            'labelright': ax.yaxis.get_label_position() == 'right',
+            'spines': dict((loc, {'position': spineposition(ax.spines[loc]), 'linewidth': ax.spines[loc].get_linewidth()})
+                           for loc in SPINES),
+            'ticks': tickstyle(ax),
+            'numticks': {'xmajor': xmajor, 'xminor': xminor, 'ymajor': ymajor, 'yminor': yminor},
+            'minorlabels': {'x': not isinstance(ax.xaxis.get_minor_formatter(), mpl.ticker.NullFormatter),
+                            'y': not isinstance(ax.yaxis.get_minor_formatter(), mpl.ticker.NullFormatter)},
+            'grid': {'x': tickflag(xtick, 'gridOn'),
+                     'y': tickflag(ytick, 'gridOn'),
+                     'linestyle': xtick.gridline.get_linestyle(),
+                     'linewidth': xtick.gridline.get_linewidth(),
+                     'color': colorvalue(xtick.gridline.get_color())},
+            'fonts': {'title': fontstyle(ax.title),
+                      'xlabel': fontstyle(ax.xaxis.label),
+                      'ylabel': fontstyle(ax.yaxis.label),
+                      'xticklabels': fontstyle(xtick.label1),
+                      'yticklabels': fontstyle(ytick.label1)},
+            'legend': legendstyle(ax.legend_),
+            'lines': [linestyle(line) for line in ax.lines]}
+
+
+def tickstyle(ax):
+    xtick = ax.xaxis.majorTicks[0]
+    ytick = ax.yaxis.majorTicks[0]
+    return {'bottom': [tickflag(xtick, 'tick1On'), tickflag(xtick, 'label1On')],
+            'top': [tickflag(xtick, 'tick2On'), tickflag(xtick, 'label2On')],
+            'left': [tickflag(ytick, 'tick1On'), tickflag(ytick, 'label1On')],
+            'right': [tickflag(ytick, 'tick2On'), tickflag(ytick, 'label2On')],
+            'direction': getattr(xtick, '_tickdir', mpl.rcParams['xtick.direction']),
+            'majorlength': xtick.tick1line.get_markersize(),
+            'majorwidth': xtick.tick1line.get_markeredgewidth(),
+            'minorlength': ax.xaxis.minorTicks[0].tick1line.get_markersize(),
+            'minorwidth': ax.xaxis.minorTicks[0].tick1line.get_markeredgewidth()}
+
+
+def fontstyle(text):
+    return {'family': text.get_name(), 'size': text.get_size(), 'weight': text.get_weight(),
+            'style': text.get_style(), 'color': colorvalue(text.get_color())}
+
+
+def legendstyle(legend):
+    """Returns the legend settings of the legend tab, None if the axes has no legend"""
+    if legend is None:
+        return None
+    frame = legend.get_frame()
+    return {'visible': legend.get_visible(),
+            'frameon': legend.get_frame_on(),
+            'fancybox': type(frame.get_boxstyle()).__name__.lower().startswith('round'),
+            'shadow': bool(legend.shadow),
+            'framealpha': alphavalue(frame),
+            'ncol': getattr(legend, '_ncols', getattr(legend, '_ncol', 1)),
+            'title': legend.get_title().get_text(),
+            'facecolor': colorvalue(frame.get_facecolor())}
+
+
+def linestyle(line):
+    style = {'linestyle': line.get_linestyle(), 'linewidth': line.get_linewidth(), 'color': colorvalue(line.get_color()),
+             'markersize': line.get_markersize(), 'markerfacecolor': colorvalue(line.get_markerfacecolor()),
+             'markeredgecolor': colorvalue(line.get_markeredgecolor())}
+    if line.get_marker() is None or isinstance(line.get_marker(), stringtypes + (int,)):
+        style['marker'] = line.get_marker()  # Path and vertex markers are left out, they can't be saved as json
+    return style
+
+
+def colorvalue(color):
+    """Returns color as a hex string, or the string itself for 'none', 'auto' and other non-colors"""
+    try:
+        return mpl.colors.rgb2hex(mpl.colors.colorConverter.to_rgb(color))
+    except ValueError:
+        return color if isinstance(color, stringtypes) else None
+
+
+def alphavalue(patch):
+    return 1.0 if patch.get_alpha() is None else patch.get_alpha()
+
+
+def spineposition(spine):
+    """Returns 'off' for hidden spines, else the spine position as a string or [type, amount]"""
+    if not spine.get_visible():
+        return 'off'
+    position = spine.get_position()
+    if isinstance(position, stringtypes):
+        return position
+    return [position[0], position[1]]
+
+
+def numticks(axis):
+    """Returns (number of major ticks, number of minor ticks) set in the locators of axis, None if unknown"""
+    major = axis.get_major_locator()
+    minor = axis.get_minor_locator()
+    if hasattr(major, 'numticks'):  # LogLocator and others, 'auto' in newer matplotlib
+        nummajor = major.numticks if not isinstance(major.numticks, stringtypes) else None
+    elif hasattr(major, '_nbins') and major._nbins != 'auto':  # MaxNLocator, AutoLocator
+        nummajor = major._nbins
+    else:
+        nummajor = None
+    if isinstance(minor, mpl.ticker.LogLocator) and minor._subs is not None and not isinstance(minor._subs, stringtypes):
+        numminor = len(minor._subs)  # LogLocator
+    elif hasattr(minor, 'ndivs'):  # AutoMinorLocator
+        numminor = minor.ndivs - 1 if isinstance(minor.ndivs, int) else None
+    elif isinstance(minor, mpl.ticker.NullLocator):
+        numminor = 0
+    else:
+        numminor = None
+    return (nummajor, numminor)
+
+
+def stylediff(old, new):
+    """Returns the parts of snapshot new that differ from snapshot old, in the same structure, for applystyle"""
+    changed = diffvalue(old, new)
+    if changed is UNCHANGED:
+        return {}
+    return changed
+
+
+UNCHANGED = object()
+
+
+def diffvalue(old, new):
+    if isinstance(old, dict) and isinstance(new, dict):
+        changed = {}
+        for (key, value) in new.items():
+            itemdiff = diffvalue(old[key], value) if key in old else value
+            if itemdiff is not UNCHANGED:
+                changed[key] = itemdiff
+        return changed or UNCHANGED
+    if isinstance(old, list) and isinstance(new, list) and any(isinstance(item, dict) for item in new):
+        items = [diffvalue(olditem, newitem) for (olditem, newitem) in zip(old, new)] + new[len(old):]
+        if all(item is UNCHANGED for item in items):
+            return UNCHANGED
+        return [{} if item is UNCHANGED else item for item in items]
+    if old == new:
+        return UNCHANGED
+    return new
+
+
+def applystyle(style, figures):
+    """Sets a snapshot or diff from figurestyle/stylediff on each of figures, returns the figures
+
+    Nothing is drawn; redraw the returned figures (or save them) afterwards.
+    """
+    figures = list(figures)
+    for fig in figures:
+        if 'figure' in style:
+            applyfigure(style['figure'], fig)
+        axesstyles = style.get('axes') or []
+        if axesstyles:
+            for (index, ax) in enumerate(fig.axes):
+                applyaxes(axesstyles[min(index, len(axesstyles) - 1)], ax)
+    return figures
+
+
+def applyfigure(style, fig):
+    if 'facecolor' in style:
+        engine.setfacecolor([fig], style['facecolor'])
+    if 'facealpha' in style:
+        engine.setfacealpha([fig], style['facealpha'])
+
+
+def applyaxes(style, ax):
+    axes = [ax]
+    if 'facecolor' in style:
+        engine.setfacecolor(axes, style['facecolor'])
+    if 'facealpha' in style:
+        engine.setfacealpha(axes, style['facealpha'])
+    if 'labeltop' in style:
+        engine.setlabelposition(axes, 'x', 'top' if style['labeltop'] else 'bottom')
+    if 'labelright' in style:
+        engine.setlabelposition(axes, 'y', 'right' if style['labelright'] else 'left')
+    for (loc, spinestyle) in style.get('spines', {}).items():
+        if 'position' in spinestyle:
+            engine.setspine(axes, loc, spinestyle['position'])
+        if 'linewidth' in spinestyle:
+            engine.setspinewidth(axes, spinestyle['linewidth'], [loc])
+    applyticks(style.get('ticks', {}), ax)
+    for (key, value) in style.get('numticks', {}).items():
+        if value is not None:  # key is e.g. 'xmajor'
+            engine.setnumticks(axes, key[0], key[1:], value)
+    for (name, value) in style.get('minorlabels', {}).items():
+        engine.setminorticklabels(axes, name, value)
+    if style.get('grid'):
+        engine.setgrid(axes, **style['grid'])
+    for (name, fontstyle) in style.get('fonts', {}).items():
+        engine.setfont(axes, [FONTNAMES.get(name, name)], **fontstyle)
+    if style.get('legend'):
+        applylegend(style['legend'], ax)
+    linestyles = style.get('lines') or []
+    if linestyles:
+        for (index, line) in enumerate(ax.lines):
+            applyline(linestyles[index % len(linestyles)], line)
+
+
+def applyticks(style, ax):
+    """Sets the tick params in style with as few tick_params calls as possible, each one updates every tick"""
+    both = {}
+    for loc in SPINES:
+        if loc in style:
+            (both[loc], both['label' + loc]) = style[loc]
+    if 'direction' in style:
+        both['direction'] = style['direction']
+    if both:
+        engine.settickparams([ax], 'both', **both)
+    for which in ('major', 'minor'):
+        sizes = dict((key, style[which + key]) for key in ('length', 'width') if which + key in style)
+        if sizes:
+            engine.settickparams([ax], which, **sizes)
+
+
+def applylegend(style, ax):
+    """Remakes the legend of ax with the settings in style, filled in from the current legend for a diff"""
+    engine.setlegend([ax], **dict(legendstyle(ax.legend_) or {}, **style))
+
+
+def applyline(style, line):
+    for key in ('linestyle', 'linewidth', 'color', 'marker', 'markersize', 'markerfacecolor', 'markeredgecolor'):
+        if key in style:
+            getattr(line, 'set_' + key)(style[key])
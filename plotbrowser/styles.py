@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""
+Line style and marker tables for the style combo boxes of plotbrowser.
+
+Each table maps a normalized style spec to its combo box index with a dict
+built once, so selecting a line doesn't search the list of styles. Specs that
+aren't in the table, such as dash tuples or Path markers, map to a final
+"custom" entry. Nothing here imports Qt.
+"""
+
+from __future__ import nested_scopes, generators, division, absolute_import,\
+    with_statement, print_function, unicode_literals
+
+import matplotlib as mpl
+import matplotlib.lines
+import matplotlib.markers
+
+LINESTYLEALIASES = {'solid': '-', 'dashed': '--', 'dashdot': '-.', 'dotted': ':', 'none': 'None'}
+MARKERALIASES = {'none': 'None'}
+
+
+class StyleTable(object):
+    """Combo box entries for the specs in styles, a {spec: description} dict like Line2D.lineStyles
+
+    aliases maps other spellings to specs in styles. The last entry, at index
+    self.custom, stands for every spec that isn't in the table.
+    """
+    def __init__(self, styles, aliases=None):
+        self.styles = list(styles.items())  # [(spec, description)] in combo box order
+        self.custom = len(self.styles)
+        self.index = {}
+        for (index, (spec, description)) in enumerate(self.styles):
+            self.index.setdefault(spec, index)
+        for (alias, spec) in (aliases or {}).items():
+            if spec in self.index:
+                self.index.setdefault(alias, self.index[spec])
+
+    def labels(self):
+        return [repr(spec) + " (" + description + ")" for (spec, description) in self.styles] + ['custom']
+
+    def indexof(self, spec):
+        """Returns the combo box index of spec, self.custom if it isn't in the table"""
+        try:
+            return self.index.get(spec, self.custom)
+        except TypeError:  # unhashable, e.g. a list of dashes or an array of vertices
+            return self.custom
+
+    def iscustom(self, index):
+        return index == self.custom
+
+    def spec(self, index):
+        """Returns the spec at a combo box index, raises IndexError for the custom entry"""
+        return self.styles[index][0]
+
+
+def linestyletable():
+    return StyleTable(mpl.lines.Line2D.lineStyles, LINESTYLEALIASES)
+
+
+def markertable():
+    return StyleTable(mpl.markers.MarkerStyle.markers, MARKERALIASES)
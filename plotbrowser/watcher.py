@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""
+Watches pyplot's figure list so the figure list widget follows figures created
+and closed from the shell or a script.
+"""
+
+from __future__ import nested_scopes, generators, division, absolute_import,\
+    with_statement, print_function, unicode_literals
+
+try:
+    import sip
+    sip.setapi('QString', 2)
+    sip.setapi('QVariant', 2)
+    from PyQt4 import QtCore
+    from PyQt4.QtCore import pyqtSlot as Slot
+    from PyQt4.QtCore import pyqtSignal as Signal
+except ImportError:
+    from PySide import QtCore
+    from PySide.QtCore import Slot, Signal
+from matplotlib._pylab_helpers import Gcf
+
+
+def figurekey():
+    """Returns a cheap fingerprint of pyplot's figure list, changes when a figure is created or closed"""
+    return frozenset((num, id(manager)) for (num, manager) in Gcf.figs.items())
+
+
+class FigureWatcher(QtCore.QObject):
+    """Polls pyplot's figure list every interval milliseconds, emits figuresChanged when it changed
+
+    Figures created or closed in bursts between two polls give a single
+    figuresChanged, so scripts making many figures don't flood the GUI.
+    Polling begins with start().
+    """
+    figuresChanged = Signal()
+
+    def __init__(self, interval=500, parent=None):
+        super(FigureWatcher, self).__init__(parent)
+        self.key = figurekey()
+        self.timer = QtCore.QTimer(self)
+        self.timer.setInterval(interval)
+        self.timer.timeout.connect(self.poll)
+
+    def start(self):
+        """Starts polling, figures created or closed before don't emit figuresChanged"""
+        self.acknowledge()
+        self.timer.start()
+
+    @Slot()
+    def poll(self):
+        key = figurekey()
+        if key != self.key:
+            self.key = key
+            self.figuresChanged.emit()
+
+    def acknowledge(self):
+        """Call after refreshing the figure list by other means, so that refresh isn't repeated"""
+        self.key = figurekey()
+
+    def setinterval(self, interval):
+        self.timer.setInterval(interval)
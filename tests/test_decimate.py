@@ -0,0 +1,40 @@
+from __future__ import division, absolute_import, print_function, unicode_literals
+
+import numpy as np
+from plotbrowser import decimate
+
+
+def columns(x, edges):
+    """Indices of the points in each column, brute force"""
+    for (i, (left, right)) in enumerate(zip(edges[:-1], edges[1:])):
+        last = i == len(edges) - 2
+        yield np.flatnonzero((x >= left) & ((x <= right) if last else (x < right)))
+
+
+def test_minmax_per_column():
+    for seed in range(300):
+        checkcolumns(np.random.RandomState(seed), nans=seed % 3 == 0)
+
+
+def checkcolumns(random, nans):
+    n = random.randint(50, 2000)
+    x = np.sort(random.uniform(0, 1, n))
+    y = random.uniform(0, 1, n)
+    if nans:
+        y[random.randint(0, n, n // 10)] = np.nan
+    (left, right) = np.sort(random.uniform(-0.1, 1.1, 2))
+    edges = np.linspace(left, right, random.randint(2, 40))
+    keep = decimate.minmaxindices(x, y, edges)
+    assert np.all(np.diff(keep) > 0)
+    for column in columns(x, edges):
+        if len(column) == 0:
+            continue
+        kept = np.intersect1d(column, keep)
+        assert column[0] in kept and column[-1] in kept
+        if np.any(np.isfinite(y[column])):
+            assert np.nanmin(y[kept]) == np.nanmin(y[column])
+            assert np.nanmax(y[kept]) == np.nanmax(y[column])
+    (first, last) = (np.searchsorted(x, edges[0], 'left'), np.searchsorted(x, edges[-1], 'right'))
+    for neighbour in (first - 1, last):
+        if 0 <= neighbour < n:
+            assert neighbour in keep
@@ -0,0 +1,27 @@
+from __future__ import division, absolute_import, print_function, unicode_literals
+
+import matplotlib
+matplotlib.use('Agg')
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from plotbrowser import drawprofile, instrument
+
+
+def drawmethods():
+    return dict((cls, vars(cls)['draw']) for cls in instrument.artistclasses() if 'draw' in vars(cls))
+
+
+def test_profile_and_instrument_restore_draws():
+    fig = Figure()
+    FigureCanvasAgg(fig)
+    (line,) = fig.add_subplot(1, 1, 1).plot([0, 1])
+    draws = drawmethods()
+    instrument.enable()
+    try:
+        timings = drawprofile.profile(fig)
+    finally:
+        instrument.disable()
+    assert drawmethods() == draws
+    assert line in [timing.artist for timing in timings]
+    assert drawprofile.owner(timings[0])[0] in (None, fig.axes[0])
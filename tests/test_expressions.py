@@ -0,0 +1,58 @@
+from __future__ import division, absolute_import, print_function, unicode_literals
+
+import functools
+
+import numpy as np
+import pytest
+
+from plotbrowser import expressions
+from plotbrowser.expressions import evaluate, ExpressionError, MAXSIZE
+
+x = np.linspace(0, 1, 20000)
+
+
+@pytest.mark.parametrize('expression', ['np.linspace(0, 1, 10**9)', 'np.linspace(np.zeros(10**4), 1, 10**5)', 'np.repeat(x, 10**5)', 'np.tile(x, (100, 100))',
+                                        'x[:, None] + x', 'np.sin(x[:, None] * x)', 'np.add(x[:, None], x)',
+                                        'np.where(x[:, None] > x, x, 0)', 'x[:, None] < x', 'np.random.normal(size=10**9)',
+                                        'np.random.rand(10**5, 10**4)', '10**10**10', "'a' * 10**9", '[0] * 10**9'])
+def test_too_big(expression):
+    with pytest.raises(ExpressionError):
+        evaluate(expression, {'x': x})
+
+
+def test_small():
+    assert evaluate('np.repeat(x, 3)', {'x': x}).size == 3 * x.size
+    assert evaluate('2**10') == 1024
+    assert evaluate('np.sum(x[:100, None] * x[:100])', {'x': x}) == pytest.approx(x[:100].sum() ** 2)
+
+
+def test_names_are_not_checked():
+    big = np.zeros(MAXSIZE + 1, dtype=np.uint8)
+    assert evaluate('big', {'big': big}) is big
+
+
+@pytest.mark.parametrize(('module', 'name', 'expression'), [
+    (np, 'linspace', 'np.linspace(np.zeros(100), 1, 100)'),
+    (np, 'logspace', 'np.logspace(0, np.ones(100), 100)'),
+    (np, 'geomspace', 'np.geomspace(1, np.ones((100, 1)) * 2, 100)'),
+    (np.random, 'normal', 'np.random.normal(np.zeros((100, 1)), np.ones(100))'),
+    (np.random, 'uniform', 'np.random.uniform(np.zeros((100, 1)), np.ones(100))'),
+    (np.random, 'poisson', 'np.random.poisson(np.ones((100, 100)))'),
+    (np.random, 'exponential', 'np.random.exponential(np.ones((100, 100)))'),
+    (np, 'zeros_like', 'np.zeros_like(x, shape=(100, 100))'),
+    (np, 'ones_like', 'np.ones_like(x, shape=(100, 100))'),
+    (np, 'full_like', 'np.full_like(x, 1, shape=(100, 100))'),
+    (np, 'concatenate', 'np.concatenate([x, x, x])')])
+def test_refused_before_running(monkeypatch, module, name, expression):
+    calls = []
+    function = getattr(module, name)
+
+    @functools.wraps(function)
+    def recorded(*args, **kwargs):
+        calls.append(args)
+        return function(*args, **kwargs)
+    monkeypatch.setattr(module, name, recorded)
+    monkeypatch.setattr(expressions, 'MAXSIZE', 1000)
+    with pytest.raises(ExpressionError):
+        evaluate(expression, {'x': np.zeros(500)})
+    assert calls == []
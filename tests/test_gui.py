@@ -0,0 +1,160 @@
+from __future__ import division, absolute_import, print_function, unicode_literals
+
+import os
+import time
+
+import pytest
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+gui = pytest.importorskip('plotbrowser.plotbrowser', reason='needs PyQt4 or PySide')
+
+
+@pytest.fixture
+def browser():
+    app = gui.QtGui.QApplication.instance() or gui.QtGui.QApplication([])
+    for i in range(3):
+        fig = plt.figure()
+        for j in range(2):
+            fig.add_subplot(1, 2, j + 1).plot([0, 1], [i, j], label='line')
+    browser = gui.PlotBrowser()
+    browser.show()
+    start = time.time()
+    while not browser.started and time.time() - start < 10:
+        app.processEvents()
+    draws = []
+    for number in plt.get_fignums():
+        plt.figure(number).canvas.mpl_connect('draw_event', draws.append)
+    browser.draws = draws
+    yield browser
+    browser.close()
+    app.processEvents()
+    plt.close('all')
+
+
+def flush(browser):
+    browser.redraw.flush()
+    gui.QtGui.QApplication.instance().processEvents()
+
+
+def test_selection_draws_nothing(browser):
+    requested = browser.redraw.requested
+    for (view, slot) in ((browser.listView_figures, browser.on_listView_figures_clicked),
+                         (browser.listView_axes, browser.on_listView_axes_clicked),
+                         (browser.listView_lines, browser.on_listView_lines_clicked)):
+        for row in range(view.model().rowCount()):
+            index = view.model().index(row, 0)
+            view.setCurrentIndex(index)
+            slot(index)
+            assert browser.populatedraws == 0
+    flush(browser)
+    assert browser.redraw.requested == requested
+    assert browser.draws == []
+
+
+def test_refresh_draws_nothing(browser):
+    requested = browser.redraw.requested
+    plt.close(browser.fig)  # the selection is lost, the last figure gets selected
+    browser.on_pushButton_refreshlist_clicked()
+    assert browser.fig is plt.figure(plt.get_fignums()[-1])
+    fig = plt.figure()
+    fig.add_subplot(1, 1, 1).plot([0, 1])
+    fig.canvas.mpl_connect('draw_event', browser.draws.append)
+    browser.refresh_listView_figures(selectlast=True)
+    assert browser.fig is fig
+    assert browser.ax is fig.axes[0]
+    flush(browser)
+    assert browser.redraw.requested == requested
+    assert browser.draws == []
+
+
+def test_makeline_reports_shape_mismatch(browser):
+    lines = len(browser.ax.lines)
+    browser.lineEdit_x.setText('np.linspace(0, 1, 10)')
+    browser.lineEdit_y.setText('np.linspace(0, 1, 11)')
+    browser.on_pushButton_makeline_clicked()
+    assert len(browser.ax.lines) == lines
+    assert 'shape' in browser.label_makeline.text()
+
+
+def test_startup_draws_nothing():
+    app = gui.QtGui.QApplication.instance() or gui.QtGui.QApplication([])
+    draws = []
+    for i in range(3):
+        fig = plt.figure()
+        fig.add_subplot(1, 1, 1).plot([0, i])
+        fig.canvas.mpl_connect('draw_event', draws.append)
+    browser = gui.PlotBrowser()
+    try:
+        plt.figure()  # before startup, shows up in the lists without the watcher
+        app.processEvents()
+        assert not browser.figurewatcher.timer.isActive()
+        browser.startup()
+        assert browser.figurewatcher.timer.isActive()
+        assert browser.fig is plt.figure(plt.get_fignums()[-1])
+        flush(browser)
+        assert browser.redraw.requested == 0
+        assert draws == []
+    finally:
+        browser.close()
+        plt.close('all')
+
+
+def test_fill_spinesticks_and_grid(browser):
+    browser.ax.grid(True)
+    browser.ax.tick_params(top=True, labeltop=True)
+    for tab in (browser.spinestickstab, browser.linestab):
+        browser.on_listView_axes_clicked(browser.listView_axes.currentIndex())
+        browser.tabWidget.setCurrentWidget(tab)
+        assert tab not in browser.staletabs
+    assert browser.checkBox_xgrid.isChecked()
+    assert browser.comboBox_ticksdrawtop.currentText() == 'both'
+    assert browser.comboBox_ticksdrawbottom.currentText() == 'both'
+
+
+def test_closed_figures_are_discarded(browser):
+    fig = browser.fig
+    browser.doubleSpinBox_linewidth.setValue(browser.doubleSpinBox_linewidth.value() + 1)
+    assert fig in browser.history.undostack[-1].figures()
+    assert fig in browser.redraw._dirty
+    plt.close(fig)  # from the shell, the watcher refreshes the list
+    browser.figurewatcher.poll()
+    assert browser.fig is not fig
+    assert not any(fig in command.figures() for command in browser.history.undostack)
+    assert fig not in browser.redraw._dirty
+
+
+def test_watcher_keeps_text_being_typed(browser):
+    browser.tabWidget.setCurrentWidget(browser.axestab)
+    browser.lineEdit_xlabel.setText('time (s')  # not finished yet
+    plt.figure()  # from the shell
+    browser.figurewatcher.poll()
+    assert browser.lineEdit_xlabel.text() == 'time (s'
+
+
+def test_undo_fills_tab_again(browser):
+    browser.tabWidget.setCurrentWidget(browser.axestab)
+    browser.lineEdit_xlabel.setText('time (s)')
+    browser.on_lineEdit_xlabel_editingFinished()
+    assert browser.ax.get_xlabel() == 'time (s)'
+    flush(browser)
+    browser.on_pushButton_undo_clicked()
+    assert browser.lineEdit_xlabel.text() == ''
+
+
+def test_refresh_keeps_filtered_selection(browser):
+    browser.ax.plot([0, 1], label='other')
+    browser.ax.plot([1, 0], label='line 2')
+    browser.refresh_listView_lines()
+    browser.lineEdit_linefilter.setText('line')
+    view = browser.listView_lines
+    assert view.model().rowCount() == len(browser.ax.lines) - 1
+    view.setCurrentIndex(view.model().index(0, 0))
+    browser.on_listView_lines_clicked(view.currentIndex())
+    line = browser.line
+    browser.refresh_listView_figures()
+    assert not browser.selectionlost(view)
+    assert browser.selectedartists(view) == [line]
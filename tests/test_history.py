@@ -0,0 +1,76 @@
+from __future__ import division, absolute_import, print_function, unicode_literals
+
+import matplotlib
+matplotlib.use('Agg')
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from plotbrowser import engine, history
+
+
+def makefigure():
+    fig = Figure()
+    FigureCanvasAgg(fig)
+    for i in range(4):
+        ax = fig.add_subplot(2, 2, i + 1)
+        for j in range(3):
+            ax.plot([0, 1], [j, i], label='line {}'.format(j))
+    return fig
+
+
+def test_undo_delete_axes_keeps_order():
+    fig = makefigure()
+    axes = list(fig.axes)
+    for index in (0, 2, 3):
+        command = history.removeaxes(fig.axes[index])
+        command.undo()
+        assert fig.axes == axes
+        command.redo()
+        command.undo()
+        assert fig.axes == axes
+
+
+def test_undo_delete_line_keeps_order():
+    fig = makefigure()
+    ax = fig.axes[1]
+    lines = list(ax.lines)
+    for index in (0, 1, 2):
+        command = history.removeline(ax.lines[index])
+        command.undo()
+        assert list(ax.lines) == lines
+        command.redo()
+        command.undo()
+        assert list(ax.lines) == lines
+
+
+def test_undo_legend_removes_new_legend():
+    fig = makefigure()
+    ax = fig.axes[0]
+    command = history.edit(engine.setlegend, [ax], draggable=True)
+    legend = ax.legend_
+    assert legend is not None and engine.isdraggable(legend)
+    command.undo()
+    assert ax.legend_ is None
+    assert legend not in ax.get_children()
+    assert not engine.isdraggable(legend)
+
+
+def test_undo_legend_puts_back_old_legend():
+    fig = makefigure()
+    ax = fig.axes[0]
+    old = ax.legend(title='old')
+    command = history.edit(engine.setlegend, [ax], title='new')
+    assert ax.legend_ is not old
+    command.undo()
+    assert ax.legend_ is old
+
+
+def test_undo_paste_style_removes_pasted_legend():
+    source = makefigure()
+    source.axes[0].legend()
+    style = history.figurestyle(source)
+    fig = makefigure()
+    command = history.restyle(style, [fig])
+    assert fig.axes[0].legend_ is not None
+    command.undo()
+    assert fig.axes[0].legend_ is None
@@ -0,0 +1,16 @@
+from __future__ import division, absolute_import, print_function, unicode_literals
+
+import pytest
+
+from plotbrowser import benchmark
+
+
+def test_import_loads_no_ipython():
+    result = benchmark.importtime(repeat=1)
+    print('import plotbrowser took {:.1f} ms'.format(1000 * result['seconds']))
+    assert 'IPython' not in result['loaded']
+
+
+def test_importtime_needs_a_run():
+    with pytest.raises(ValueError):
+        benchmark.importtime(repeat=0)
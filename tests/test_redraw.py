@@ -0,0 +1,80 @@
+from __future__ import division, absolute_import, print_function, unicode_literals
+
+import pytest
+
+import matplotlib
+matplotlib.use('Agg')
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+redraw = pytest.importorskip('plotbrowser.redraw', reason='needs PyQt4 or PySide')
+
+
+def makefigure():
+    fig = Figure()
+    FigureCanvasAgg(fig)
+    fig.add_subplot(1, 1, 1).plot([0, 1])
+    return fig
+
+
+def test_coalesced_counts():
+    scheduler = redraw.RedrawScheduler()
+    fig = makefigure()
+    scheduler.draw_now(fig)  # no request, nothing coalesced
+    assert scheduler.stats()['coalesced'] == 0
+    for i in range(3):
+        scheduler.schedule(fig)
+    scheduler.flush()
+    assert (scheduler.requested, scheduler.drawn, scheduler.coalesced) == (3, 2, 2)
+    scheduler.schedule(fig)
+    scheduler.draw_now(fig)  # absorbs the pending request
+    assert (scheduler.requested, scheduler.drawn, scheduler.coalesced) == (4, 3, 3)
+    scheduler.reset_stats()
+    assert scheduler.stats()['coalesced'] == 0
+
+
+def test_blit_only_edited_axes():
+    scheduler = redraw.RedrawScheduler()
+    fig = Figure()
+    FigureCanvasAgg(fig)
+    (ax, other) = (fig.add_subplot(2, 1, 1), fig.add_subplot(2, 1, 2))
+    (line,) = ax.plot([0, 1])
+    other.plot([1, 0])
+    blitted = []
+    fig.canvas.blit = blitted.append
+    scheduler.schedule(fig, [line])
+    scheduler.flush()  # full draw, caches the background of ax
+    assert line.get_animated()
+    line.set_color('red')
+    scheduler.schedule(fig, [line])
+    scheduler.flush()
+    assert scheduler.blitted == 1
+    assert len(blitted) == 1
+    assert not blitted[0].overlaps(other.bbox)
+    assert blitted[0].contains(*ax.bbox.min) and blitted[0].contains(*ax.bbox.max)
+
+
+def test_release_restores_animated():
+    scheduler = redraw.RedrawScheduler()
+    fig = makefigure()
+    ax = fig.axes[0]
+    ax.plot([1, 0], animated=True)
+    (line, animatedline) = ax.lines
+    draws = []
+    fig.canvas.mpl_connect('draw_event', draws.append)
+    scheduler.schedule(fig, [line, animatedline])
+    scheduler.flush()
+    scheduler.release()
+    assert not line.get_animated()
+    assert animatedline.get_animated()
+    assert len(draws) == 2  # the last one in z-order
+    scheduler.release()
+    assert len(draws) == 2
+
+
+def test_schedule_artists_of_figure():
+    scheduler = redraw.RedrawScheduler()
+    fig = makefigure()
+    scheduler.schedule_artists([fig, fig.axes[0].lines[0]])
+    assert scheduler._dirty == [fig]
+    assert scheduler.requested == 1